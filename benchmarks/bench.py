@@ -0,0 +1,620 @@
+"""Performance benchmarks for oc_healthd.
+
+Run from the repository root:
+
+    python3 benchmarks/bench.py --output logs/bench.json
+    python3 benchmarks/bench.py --quick --compare logs/bench-previous.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import (  # noqa: E402
+    CheckResult,
+    check_openclaw_health,
+    check_openclaw_status,
+    run_command,
+)
+from oc_healthd.aggregator import FleetAggregator  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.history import ROLLUPS, UPSERT, HistoryStore, connect, rollup_rows  # noqa: E402
+from oc_healthd.push import encode_batch, encode_record  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+from oc_healthd.status_map import StatusMapReader, StatusMapWriter  # noqa: E402
+
+FAKE_OPENCLAW = Path(__file__).resolve().parent / "fake_openclaw.py"
+
+Scenario = Callable[["BenchOptions"], Dict[str, Any]]
+
+
+class BenchOptions:
+    def __init__(self, cycles: int = 200, spawns: int = 20, workdir: str = "") -> None:
+        self.cycles = cycles
+        self.spawns = spawns
+        self.workdir = workdir
+
+
+def fake_command(mode: str, *extra: str, command: str = "health") -> str:
+    parts = [sys.executable, str(FAKE_OPENCLAW), command, "--mode", mode, *extra]
+    return " ".join(shlex.quote(part) for part in parts)
+
+
+class FakeRunner:
+    def __init__(self, script: Sequence[tuple], repeat_last: bool = True) -> None:
+        self.script = list(script)
+        self.repeat_last = repeat_last
+        self.calls = 0
+
+    def __call__(self, _command: str, _timeout: int) -> Any:
+        index = self.calls
+        if index >= len(self.script):
+            index = len(self.script) - 1 if self.repeat_last else index % len(self.script)
+        self.calls += 1
+        returncode, stdout, delay = self.script[index]
+        if delay:
+            time.sleep(delay)
+        return _Completed(returncode, stdout, "" if returncode == 0 else "gateway down")
+
+
+class _Completed:
+    __slots__ = ("returncode", "stdout", "stderr")
+
+    def __init__(self, returncode: int, stdout: str, stderr: str) -> None:
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages: List[str] = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+def percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def rss_kb() -> int:
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        pages = int(statm.read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _daemon(workdir: str, checks: List[Callable[[], CheckResult]], threshold: int = 3) -> HealthDaemon:
+    return HealthDaemon(
+        threshold=threshold,
+        checks=checks,
+        notifier=MemoryNotifier(),
+        state_store=StateStore(str(Path(workdir) / "state.json")),
+        log_file=str(Path(workdir) / "healthd.jsonl"),
+    )
+
+
+def _timed_cycles(daemon: HealthDaemon, cycles: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    transitions: List[str] = []
+    cpu_before = cpu_seconds()
+    for _ in range(cycles):
+        started = time.perf_counter()
+        transitions.append(daemon.run_cycle())
+        latencies.append((time.perf_counter() - started) * 1000)
+    cpu_used = cpu_seconds() - cpu_before
+    return {
+        "cycle_ms": percentiles(latencies),
+        "cpu_ms_per_cycle": round(cpu_used * 1000 / max(1, cycles), 4),
+        "rss_kb": rss_kb(),
+        "transitions": transitions,
+    }
+
+
+def bench_daemon_cycle(options: BenchOptions) -> Dict[str, Any]:
+    healthy = '{"ok": true}'
+    checks = [
+        lambda: check_openclaw_health("openclaw health --json", 5, FakeRunner([(0, healthy, 0)])),
+        lambda: check_openclaw_status("openclaw status --deep", 5, FakeRunner([(0, "ok", 0)])),
+    ]
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    result = _timed_cycles(_daemon(workdir, checks), options.cycles)
+    result.pop("transitions")
+    return result
+
+
+def bench_state_store(options: BenchOptions) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    store = StateStore(str(Path(workdir) / "state.json"))
+    payload = {"state": "HEALTHY", "counters": {"openclaw_health": 0, "openclaw_status": 0}}
+    save_ms: List[float] = []
+    load_ms: List[float] = []
+    for _ in range(options.cycles):
+        started = time.perf_counter()
+        store.save(payload)
+        save_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        store.load()
+        load_ms.append((time.perf_counter() - started) * 1000)
+    return {"save_ms": percentiles(save_ms), "load_ms": percentiles(load_ms)}
+
+
+def bench_log_writer(options: BenchOptions) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    daemon = _daemon(workdir, [])
+    results = [
+        CheckResult("openclaw_health", True, "ok", 0, 12, '{"ok": true}'),
+        CheckResult("openclaw_status", False, "x" * 300, 1, 240, "y" * 300),
+    ]
+    samples: List[float] = []
+    for _ in range(options.cycles):
+        started = time.perf_counter()
+        daemon._append_log(
+            results=results,
+            transition="steady",
+            deliveries={},
+            message="",
+            restart_attempted=False,
+            restart_ok=False,
+        )
+        samples.append((time.perf_counter() - started) * 1000)
+    size = (Path(workdir) / "healthd.jsonl").stat().st_size
+    return {"append_ms": percentiles(samples), "bytes_per_record": size // max(1, options.cycles)}
+
+
+def _bench_spawn(options: BenchOptions, mode: str, *extra: str, timeout: int = 5) -> Dict[str, Any]:
+    command = fake_command(mode, *extra)
+    latencies: List[float] = []
+    ok_count = 0
+    cpu_before = cpu_seconds()
+    started_all = time.perf_counter()
+    for _ in range(options.spawns):
+        result = check_openclaw_health(command, timeout, run_command)
+        latencies.append(float(result.latency_ms))
+        ok_count += int(result.ok)
+    elapsed = time.perf_counter() - started_all
+    cpu_used = cpu_seconds() - cpu_before
+    return {
+        "check_ms": percentiles(latencies),
+        "spawns_per_sec": round(options.spawns / elapsed, 3) if elapsed else 0.0,
+        "cpu_ms_per_spawn": round(cpu_used * 1000 / max(1, options.spawns), 3),
+        "ok_ratio": round(ok_count / max(1, options.spawns), 3),
+        "rss_kb": rss_kb(),
+    }
+
+
+def bench_spawn_ok(options: BenchOptions) -> Dict[str, Any]:
+    return _bench_spawn(options, "ok")
+
+
+def bench_spawn_slow(options: BenchOptions) -> Dict[str, Any]:
+    return _bench_spawn(options, "slow", "--sleep", "0.2")
+
+
+def bench_spawn_flood(options: BenchOptions) -> Dict[str, Any]:
+    return _bench_spawn(options, "flood", "--flood-bytes", str(8 * 1024 * 1024))
+
+
+def bench_spawn_hang(options: BenchOptions) -> Dict[str, Any]:
+    hang_options = BenchOptions(options.cycles, max(1, options.spawns // 10), options.workdir)
+    return _bench_spawn(hang_options, "hang", timeout=1)
+
+
+def bench_detect_recover(options: BenchOptions, interval_seconds: float = 30.0) -> Dict[str, Any]:
+    # Healthy for 5 cycles, a 6-cycle outage, then healthy again.
+    healthy = (0, '{"ok": true}', 0)
+    down = (1, "", 0)
+    script = [healthy] * 5 + [down] * 6 + [healthy] * 5
+    runner = FakeRunner(script)
+    checks = [lambda: check_openclaw_health("openclaw health --json", 5, runner)]
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    timed = _timed_cycles(_daemon(workdir, checks), len(script))
+    transitions = timed["transitions"]
+    fault_at = 5
+    repair_at = 11
+    detected = transitions.index("entered_unhealthy")
+    recovered = transitions.index("recovered")
+    return {
+        "interval_seconds": interval_seconds,
+        "cycles_to_detect": detected - fault_at + 1,
+        "cycles_to_recover": recovered - repair_at + 1,
+        "time_to_detect_s": (detected - fault_at + 1) * interval_seconds,
+        "time_to_recover_s": (recovered - repair_at + 1) * interval_seconds,
+        "cycle_ms": timed["cycle_ms"],
+    }
+
+
+def bench_flapping_gateway(options: BenchOptions) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    command = fake_command(
+        "flap",
+        "--flap-period",
+        "4",
+        "--state-file",
+        str(Path(workdir) / "flap.count"),
+    )
+    checks = [lambda: check_openclaw_health(command, 5, run_command)]
+    daemon = _daemon(workdir, checks)
+    timed = _timed_cycles(daemon, max(8, min(options.spawns, 24)))
+    transitions = timed.pop("transitions")
+    timed["alerts"] = len(daemon.notifier.messages)  # type: ignore[attr-defined]
+    timed["transition_counts"] = {
+        name: transitions.count(name) for name in sorted(set(transitions))
+    }
+    return timed
+
+
+def bench_aggregator_ingest(options: BenchOptions, nodes: int = 5000) -> Dict[str, Any]:
+    # One 30s round from a fleet: every node pushes a single-record batch.
+    results = [
+        CheckResult("openclaw_health", True, "ok", 0, 12, ""),
+        CheckResult("openclaw_status", True, "ok", 0, 240, ""),
+        CheckResult("system_probe", True, "ok", 0, 3, ""),
+    ]
+    bodies = [
+        encode_batch(f"node-{index:05d}", [encode_record(1, results, "HEALTHY", "steady")])
+        for index in range(nodes)
+    ]
+    aggregator = FleetAggregator()
+    started = time.perf_counter()
+    for body in bodies:
+        aggregator.ingest(json.loads(body))
+    ingest_s = time.perf_counter() - started
+    started = time.perf_counter()
+    aggregator.fleet_status()
+    status_ms = (time.perf_counter() - started) * 1000
+    return {
+        "nodes": nodes,
+        "batches_per_sec": round(nodes / ingest_s, 1) if ingest_s else 0.0,
+        "round_ingest_ms": round(ingest_s * 1000, 3),
+        "fleet_status_ms": round(status_ms, 3),
+        "bytes_per_batch": sum(len(body) for body in bodies) // nodes,
+        "rss_kb": rss_kb(),
+    }
+
+
+def bench_history_query(options: BenchOptions, days: int = 365, step_seconds: int = 60) -> Dict[str, Any]:
+    layers = ("openclaw_health", "openclaw_status", "system_probe")
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    path = str(Path(workdir) / "history.sqlite3")
+    store = HistoryStore(path, flush_seconds=3600)
+    now_ms = int(time.time() * 1000)
+    raw_from = now_ms - store.retention_ms["samples"]
+    minute_from = now_ms - store.retention_ms["rollup_1m"]
+    # Seed what the store holds after `days` of uptime: rollups for the whole span, raw rows for the last week.
+    connection = connect(path)
+    started = time.perf_counter()
+    seeded = 0
+    for day in range(days, 0, -1):
+        day_start = now_ms - day * 86_400_000
+        batch = [
+            (ts, layer, 0 if (ts // 1000) % 997 == 0 else 1, 0, 20 + (ts // 1000) % 200)
+            for ts in range(day_start, day_start + 86_400_000, step_seconds * 1000)
+            for layer in layers
+        ]
+        seeded += len(batch)
+        if day_start >= raw_from:
+            store.write(connection, batch)
+            continue
+        with connection:
+            for table, width_ms in ROLLUPS:
+                if table == "rollup_1m" and day_start < minute_from:
+                    continue
+                connection.executemany(UPSERT.format(table=table), rollup_rows(batch, width_ms))
+    seed_s = time.perf_counter() - started
+    connection.close()
+
+    cycle = [CheckResult(layer, True, "ok", 0, 25, "") for layer in layers]
+    publish_us: List[float] = []
+    for _ in range(options.cycles):
+        started = time.perf_counter()
+        store.publish(cycle, "HEALTHY", "steady", {})
+        publish_us.append((time.perf_counter() - started) * 1_000_000)
+    started = time.perf_counter()
+    store.flush()
+    flush_ms = (time.perf_counter() - started) * 1000
+    store.close()
+
+    ranges = {"1h": 3_600_000, "24h": 86_400_000, "30d": 30 * 86_400_000, "365d": days * 86_400_000}
+    query_ms: Dict[str, Any] = {}
+    aggregate_ms: Dict[str, Any] = {}
+    for name, span in ranges.items():
+        for target, call in ((query_ms, store.query), (aggregate_ms, store.aggregate)):
+            samples = []
+            for _ in range(5):
+                started = time.perf_counter()
+                call("openclaw_health", now_ms - span, now_ms)
+                samples.append((time.perf_counter() - started) * 1000)
+            target[name] = round(min(samples), 3)
+    return {
+        "days": days,
+        "seeded_samples": seeded,
+        "seed_samples_per_sec": round(seeded / seed_s, 1) if seed_s else 0.0,
+        "publish_us": percentiles(publish_us),
+        "flush_ms": round(flush_ms, 3),
+        "query_ms": query_ms,
+        "aggregate_ms": aggregate_ms,
+        "db_bytes": sum(item.stat().st_size for item in Path(workdir).glob("history.sqlite3*")),
+    }
+
+
+def bench_status_read(options: BenchOptions, reads: int = 20000) -> Dict[str, Any]:
+    # What a status widget pays per poll: state.json (open/read/parse) vs the mmap seqlock snapshot.
+    workdir = tempfile.mkdtemp(dir=options.workdir or None)
+    layers = ("openclaw_health", "openclaw_status", "system_probe", "gateway_roundtrip")
+    counters = {layer: 0 for layer in layers}
+    results = [CheckResult(layer, True, "ok", 0, 25, "") for layer in layers]
+    store = StateStore(str(Path(workdir) / "state.json"))
+    store.save({"state": "HEALTHY", "counters": counters})
+    writer = StatusMapWriter(str(Path(workdir) / "status.map"))
+    writer.publish(results, "HEALTHY", "steady", counters)
+
+    def timed(read: Callable[[], Any]) -> Dict[str, float]:
+        samples = []
+        for _ in range(reads):
+            started = time.perf_counter()
+            read()
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        return percentiles(samples)
+
+    reader = StatusMapReader(str(Path(workdir) / "status.map"))
+    try:
+        result = {"state_json_us": timed(store.load), "status_map_us": timed(reader.read)}
+        started = time.perf_counter()
+        for _ in range(reads):
+            writer.publish(results, "HEALTHY", "steady", counters)
+        result["publish_us"] = round((time.perf_counter() - started) * 1_000_000 / reads, 3)
+    finally:
+        reader.close()
+        writer.close()
+    result["speedup_p50"] = round(result["state_json_us"]["p50"] / max(result["status_map_us"]["p50"], 1e-9), 1)
+    return result
+
+
+def _src_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH", "")]))
+    return env
+
+
+def import_profile(*argv: str) -> Dict[str, int]:
+    # Cumulative import time in microseconds per module, from `python -X importtime <argv>`.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        capture_output=True,
+        text=True,
+        env=_src_env(),
+        check=False,
+    )
+    modules: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def write_once_config(workdir: str, tcp_port: int) -> Path:
+    path = Path(workdir) / "once.toml"
+    path.write_text(
+        "\n".join(
+            [
+                "[openclaw]",
+                f"health_cmd = {json.dumps(fake_command('ok'))}",
+                f"status_cmd = {json.dumps(fake_command('ok', command='status'))}",
+                "[system]",
+                'dns_host = "localhost"',
+                'tcp_host = "127.0.0.1"',
+                f"tcp_port = {tcp_port}",
+                "[paths]",
+                f"log_file = {json.dumps(str(Path(workdir) / 'once.jsonl'))}",
+                f"state_file = {json.dumps(str(Path(workdir) / 'once-state.json'))}",
+                "[control]",
+                'socket_path = ""',
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    # Age the file past the config cache's racy window so the timed runs measure the cached path.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+    return path
+
+
+def bench_cold_start(options: BenchOptions) -> Dict[str, Any]:
+    # End-to-end `--once` runs versus a bare interpreter: the gap is our startup overhead.
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+    config_path = write_once_config(options.workdir, listener.getsockname()[1])
+    runs = max(3, options.spawns // 4)
+    env = _src_env()
+
+    def timed(argv: List[str]) -> List[float]:
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(argv, env=env, check=False, capture_output=True)
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    once_argv = ["-m", "oc_healthd.main", "--config", str(config_path), "--once"]
+    try:
+        bare = timed([sys.executable, "-c", "pass"])
+        once = timed([sys.executable, *once_argv])
+        modules = import_profile(*once_argv)
+    finally:
+        listener.close()
+    record = json.loads((Path(options.workdir) / "once.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+    probe_ms = sum(value for key, value in record["spans_ms"].items() if key.startswith("check."))
+    once_p50 = percentiles(once)["p50"]
+    return {
+        "interpreter_ms": percentiles(bare),
+        "once_ms": percentiles(once),
+        "probe_ms": round(probe_ms, 3),
+        "probe_share": round(probe_ms / once_p50, 3) if once_p50 else 0.0,
+        "import_runtime_ms": round(modules.get("oc_healthd.runtime", 0) / 1000, 3),
+        "heavy_imports": sorted(name for name in HEAVY_MODULES if name in modules),
+        # A cache hit never imports the TOML parser.
+        "config_cache_hit": "tomllib" not in modules and "configparser" not in modules,
+    }
+
+
+# Modules a `--once` run should only pay for when it actually alerts, restarts or serves.
+HEAVY_MODULES = (
+    "urllib.request",
+    "http.server",
+    "http.client",
+    "ssl",
+    "socketserver",
+    "tarfile",
+    "configparser",
+    "sqlite3",
+    "oc_healthd.notifier",
+    "oc_healthd.restart",
+    "oc_healthd.metrics",
+    "oc_healthd.control",
+    "oc_healthd.diagnostics",
+    "oc_healthd.push",
+    "oc_healthd.history",
+    "oc_healthd.roundtrip",
+    "oc_healthd.status_map",
+    "oc_healthd.admission",
+)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "daemon_cycle": bench_daemon_cycle,
+    "state_store": bench_state_store,
+    "log_writer": bench_log_writer,
+    "detect_recover": bench_detect_recover,
+    "spawn_ok": bench_spawn_ok,
+    "spawn_slow": bench_spawn_slow,
+    "spawn_flood": bench_spawn_flood,
+    "spawn_hang": bench_spawn_hang,
+    "flapping_gateway": bench_flapping_gateway,
+    "aggregator_ingest": bench_aggregator_ingest,
+    "cold_start": bench_cold_start,
+    "history_query": bench_history_query,
+    "status_read": bench_status_read,
+}
+
+
+def run_suite(options: BenchOptions, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    selected = list(names) if names else list(SCENARIOS)
+    scenarios: Dict[str, Any] = {}
+    for name in selected:
+        started = time.perf_counter()
+        scenarios[name] = SCENARIOS[name](options)
+        scenarios[name]["wall_s"] = round(time.perf_counter() - started, 3)
+    return {
+        "meta": {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cycles": options.cycles,
+            "spawns": options.spawns,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _flatten(prefix: str, value: Any, out: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else str(key), item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    now: Dict[str, float] = {}
+    before: Dict[str, float] = {}
+    _flatten("", current.get("scenarios", {}), now)
+    _flatten("", baseline.get("scenarios", {}), before)
+    lines = []
+    for key in sorted(set(now) & set(before)):
+        old = before[key]
+        new = now[key]
+        change = ((new - old) / old * 100) if old else 0.0
+        lines.append(f"{key:<48} {old:>12.3f} -> {new:>12.3f} ({change:+.1f}%)")
+    return lines
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="oc_healthd benchmark suite")
+    parser.add_argument("--output", default="", help="Write JSON results to this path")
+    parser.add_argument("--compare", default="", help="Baseline JSON to diff against")
+    parser.add_argument("--cycles", type=int, default=500)
+    parser.add_argument("--spawns", type=int, default=30)
+    parser.add_argument("--quick", action="store_true", help="Small sample sizes for CI")
+    parser.add_argument("--only", action="append", choices=sorted(SCENARIOS), default=[])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    cycles, spawns = (50, 5) if args.quick else (args.cycles, args.spawns)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_suite(BenchOptions(cycles, spawns, workdir), args.only)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        target = Path(args.output)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\n".join(compare(results, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""Stand-in for the OpenClaw CLI/gateway used by the benchmark suite.
+
+Usage: fake_openclaw.py [health|status|restart] --mode MODE [options]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+
+def _flap_ok(state_file: str, period: int) -> bool:
+    path = Path(state_file)
+    try:
+        count = int(path.read_text(encoding="utf-8").strip() or "0")
+    except (OSError, ValueError):
+        count = 0
+    path.write_text(str(count + 1), encoding="utf-8")
+    return (count // max(1, period)) % 2 == 0
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", nargs="?", default="health")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--deep", action="store_true")
+    parser.add_argument(
+        "--mode",
+        default="ok",
+        choices=["ok", "fail", "slow", "hang", "flood", "flap"],
+    )
+    parser.add_argument("--sleep", type=float, default=0.5)
+    parser.add_argument("--flood-bytes", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--flap-period", type=int, default=3)
+    parser.add_argument("--state-file", default="fake_openclaw.flap")
+    args = parser.parse_args(argv)
+
+    ok = True
+    if args.mode == "fail":
+        ok = False
+    elif args.mode == "slow":
+        time.sleep(args.sleep)
+    elif args.mode == "hang":
+        while True:
+            time.sleep(3600)
+    elif args.mode == "flood":
+        chunk = "x" * 65536
+        remaining = args.flood_bytes
+        while remaining > 0:
+            sys.stdout.write(chunk[: min(len(chunk), remaining)])
+            remaining -= len(chunk)
+        sys.stdout.write("\n")
+    elif args.mode == "flap":
+        ok = _flap_ok(args.state_file, args.flap_period)
+
+    if not ok:
+        sys.stderr.write("gateway unreachable\n")
+        return 1
+    sys.stdout.write(json.dumps({"ok": True, "command": args.command}) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,212 @@
+"""Long-running soak harness: bounded-memory evidence for oc_healthd.
+
+Runs many simulated cycles in-process, takes tracemalloc snapshots along the
+way and reports heap growth, bytes allocated per cycle and RSS. Also compares
+the per-result footprint of CheckResult against the original dict-backed
+dataclass + asdict representation.
+
+    python3 benchmarks/soak.py --cycles 1000000 --output logs/soak.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+from bench import MemoryNotifier, rss_kb  # noqa: E402
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.metrics import HealthMetrics  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LegacyCheckResult:
+    layer: str
+    ok: bool
+    reason: str
+    code: int
+    latency_ms: int
+    raw_excerpt: str
+
+
+class BoundedNotifier(MemoryNotifier):
+    def send(self, message: str) -> bool:
+        if len(self.messages) >= 16:
+            self.messages.clear()
+        return super().send(message)
+
+
+def _simulated_checks() -> List[Callable[[], CheckResult]]:
+    tick = {"n": 0}
+
+    def health() -> CheckResult:
+        tick["n"] += 1
+        n = tick["n"]
+        # Every 97th..99th cycle the gateway fails with a dynamic reason, forcing transitions.
+        if n % 100 >= 97:
+            return CheckResult("openclaw_health", False, "gateway closed (1006)", 1, 5000 + n % 7, "")
+        return CheckResult("openclaw_health", True, "ok", 0, 20 + n % 13, '{"ok": true}')
+
+    def status() -> CheckResult:
+        return CheckResult("openclaw_status", True, "ok", 0, 250 + tick["n"] % 31, "Gateway: running")
+
+    def probe() -> CheckResult:
+        return CheckResult("system_probe", True, "ok", 0, 3, "dns=api.telegram.org tcp=1.1.1.1:53")
+
+    return [health, status, probe]
+
+
+def soak(
+    cycles: int,
+    snapshot_every: int,
+    workdir: str,
+    log_file: str = os.devnull,
+    warmup: int = 1000,
+) -> Dict[str, Any]:
+    daemon = HealthDaemon(
+        threshold=3,
+        checks=_simulated_checks(),
+        notifier=BoundedNotifier(),
+        state_store=StateStore(str(Path(workdir) / "state.json")),
+        log_file=log_file,
+        metrics=HealthMetrics(),
+    )
+    for _ in range(min(warmup, cycles)):
+        daemon.run_cycle()
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    samples: List[Dict[str, Any]] = []
+    remaining = max(0, cycles - warmup)
+    done = 0
+    started = time.perf_counter()
+    peak_bytes = 0
+    while done < remaining:
+        step = min(snapshot_every, remaining - done)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        for _ in range(step):
+            daemon.run_cycle()
+        done += step
+        current, peak = tracemalloc.get_traced_memory()
+        peak_bytes = max(peak_bytes, peak)
+        samples.append({"cycle": warmup + done, "traced_bytes": current, "rss_kb": rss_kb()})
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    growth = final.compare_to(baseline, "lineno")
+    growth_bytes = sum(stat.size_diff for stat in growth)
+    first = samples[0] if samples else {"traced_bytes": 0, "rss_kb": rss_kb()}
+    last = samples[-1] if samples else first
+    return {
+        "cycles": cycles,
+        "measured_cycles": done,
+        "cycles_per_sec": round(done / elapsed, 1) if elapsed else 0.0,
+        "retained_growth_bytes": growth_bytes,
+        "retained_bytes_per_cycle": round(growth_bytes / done, 4) if done else 0.0,
+        # Slope between first and last sample excludes one-off growth such as intern-table resizes.
+        "steady_bytes_per_cycle": round(
+            (last["traced_bytes"] - first["traced_bytes"]) / max(1, last.get("cycle", 0) - first.get("cycle", 0)), 4
+        ),
+        "traced_first_bytes": first["traced_bytes"],
+        "traced_last_bytes": last["traced_bytes"],
+        "traced_peak_bytes": peak_bytes,
+        "rss_first_kb": first["rss_kb"],
+        "rss_last_kb": last["rss_kb"],
+        "top_growth": [str(stat) for stat in growth[:5]],
+        "samples": samples,
+    }
+
+
+def _measure(build: Callable[[int], Any], count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return max(0, after - before)
+
+
+def compare_representations(count: int = 20000) -> Dict[str, Any]:
+    reasons = [f"gateway closed ({code})" for code in (1006, 1011, 4000)]
+
+    def legacy(n: int) -> List[Any]:
+        return [LegacyCheckResult("openclaw_health", False, reasons[i % 3][:], 1, i, "") for i in range(n)]
+
+    def current(n: int) -> List[Any]:
+        return [CheckResult("openclaw_health", False, reasons[i % 3][:], 1, i, "") for i in range(n)]
+
+    def legacy_records(n: int) -> List[Any]:
+        return [asdict(item) for item in legacy(n)]
+
+    def current_records(n: int) -> List[Any]:
+        return [item.to_dict() for item in current(n)]
+
+    timings = {}
+    for name, fn in (("legacy_asdict_us", asdict), ("current_to_dict_us", CheckResult.to_dict)):
+        item = (LegacyCheckResult if name.startswith("legacy") else CheckResult)(
+            "openclaw_health", True, "ok", 0, 1, ""
+        )
+        started = time.perf_counter()
+        for _ in range(count):
+            fn(item)
+        timings[name] = round((time.perf_counter() - started) * 1e6 / count, 4)
+
+    legacy_bytes = _measure(legacy, count)
+    current_bytes = _measure(current, count)
+    return {
+        "results": count,
+        "legacy_bytes_per_result": round(legacy_bytes / count, 1),
+        "current_bytes_per_result": round(current_bytes / count, 1),
+        "legacy_bytes_per_record": round(_measure(legacy_records, count) / count, 1),
+        "current_bytes_per_record": round(_measure(current_records, count) / count, 1),
+        **timings,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="oc_healthd soak harness")
+    parser.add_argument("--cycles", type=int, default=200000)
+    parser.add_argument("--snapshot-every", type=int, default=10000)
+    parser.add_argument("--log-file", default=os.devnull, help="JSONL log target (default: discard)")
+    parser.add_argument("--output", default="", help="Write JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as workdir:
+        report = {
+            "soak": soak(args.cycles, args.snapshot_every, workdir, args.log_file),
+            "representation": compare_representations(),
+        }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        target = Path(args.output)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from oc_healthd.checks import CheckResult
+
+LEVELS = ("normal", "elevated", "critical")
+# Tiers a pressure level still admits; everything else is deferred.
+ADMITTED_TIERS = {
+    "normal": ("cheap", "standard", "expensive"),
+    "elevated": ("cheap", "standard"),
+    "critical": ("cheap",),
+}
+DEFAULT_TIERS = {
+    "system_probe": "cheap",
+    "gateway_roundtrip": "cheap",
+    "openclaw_health": "standard",
+    "openclaw_status": "expensive",
+}
+PSI_RESOURCES = ("cpu", "memory", "io")
+# EX_TEMPFAIL: the check did not produce a verdict, try again later.
+INCONCLUSIVE_CODE = 75
+
+TimedRun = Callable[[float], CheckResult]
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadSample:
+    load_per_cpu: float
+    psi_some_avg10: Dict[str, float]
+    taken_at: float
+
+    def describe(self) -> str:
+        parts = [f"load {self.load_per_cpu:.2f}/cpu"]
+        parts.extend(f"psi {name} {value:.0f}%" for name, value in sorted(self.psi_some_avg10.items()) if value)
+        return ", ".join(parts)
+
+
+def read_psi(proc_root: Path = Path("/proc")) -> Dict[str, float]:
+    # /proc/pressure/<resource>: "some avg10=1.23 avg60=... total=..." (Linux 4.20+; absent on macOS).
+    pressure: Dict[str, float] = {}
+    for resource in PSI_RESOURCES:
+        try:
+            text = (proc_root / "pressure" / resource).read_text(encoding="ascii")
+        except OSError:
+            continue
+        for line in text.splitlines():
+            if line.startswith("some "):
+                fields = dict(item.split("=", 1) for item in line.split()[1:] if "=" in item)
+                pressure[resource] = float(fields.get("avg10", 0.0))
+    return pressure
+
+
+def read_load_per_cpu() -> float:
+    try:
+        one_minute = os.getloadavg()[0]
+    except OSError:
+        return 0.0
+    return one_minute / max(1, os.cpu_count() or 1)
+
+
+def sample_host(proc_root: Path = Path("/proc")) -> LoadSample:
+    return LoadSample(read_load_per_cpu(), read_psi(proc_root), time.monotonic())
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        load_elevated: float = 1.5,
+        load_critical: float = 3.0,
+        psi_elevated: float = 25.0,
+        psi_critical: float = 60.0,
+        timeout_factor: float = 2.0,
+        max_timeout_seconds: float = 0.0,
+        max_deferrals: int = 10,
+        tiers: Optional[Dict[str, str]] = None,
+        sample_ttl_seconds: float = 5.0,
+        queue_timeout_seconds: float = 5.0,
+        sampler: Callable[[], LoadSample] = sample_host,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.load_elevated = load_elevated
+        self.load_critical = load_critical
+        self.psi_elevated = psi_elevated
+        self.psi_critical = psi_critical
+        self.timeout_factor = max(1.0, timeout_factor)
+        self.max_timeout_seconds = max_timeout_seconds
+        self.max_deferrals = max_deferrals
+        self.tiers = {**DEFAULT_TIERS, **(tiers or {})}
+        self.sample_ttl_seconds = sample_ttl_seconds
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.sampler = sampler
+        self.clock = clock
+        # One semaphore for every check and diagnostics spawn, however many threads want to run them.
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._sample: Optional[LoadSample] = None
+        self._sampled_at = float("-inf")
+        self._deferrals: Dict[str, int] = {}
+        # Consecutive timeouts per layer excused as host pressure.
+        self._excused: Dict[str, int] = {}
+        self.level = "normal"
+        self.shed: Dict[str, int] = {}
+
+    def sample(self) -> LoadSample:
+        # Checks in one cycle share a sample so they agree on the pressure level.
+        now = self.clock()
+        if self._sample is None or now - self._sampled_at >= self.sample_ttl_seconds:
+            self._sample = self.sampler()
+            self._sampled_at = now
+        return self._sample
+
+    def classify(self, sample: LoadSample) -> str:
+        psi = max(sample.psi_some_avg10.values(), default=0.0)
+        if sample.load_per_cpu >= self.load_critical or psi >= self.psi_critical:
+            return "critical"
+        if sample.load_per_cpu >= self.load_elevated or psi >= self.psi_elevated:
+            return "elevated"
+        return "normal"
+
+    def timeout_for(self, base_seconds: float, level: str) -> float:
+        if level == "normal":
+            return base_seconds
+        widened = base_seconds * self.timeout_factor
+        if self.max_timeout_seconds > 0:
+            widened = min(widened, max(base_seconds, self.max_timeout_seconds))
+        return float(math.ceil(widened))
+
+    def decide(self, layer: str) -> Tuple[bool, str, LoadSample, bool]:
+        # (admitted, level, sample, forced): forced runs were admitted only because max_deferrals ran out.
+        sample = self.sample()
+        level = self.classify(sample)
+        self.level = level
+        tier = self.tiers.get(layer, "standard")
+        if tier in ADMITTED_TIERS[level]:
+            self._deferrals[layer] = 0
+            return True, level, sample, False
+        deferred = self._deferrals.get(layer, 0)
+        if self.max_deferrals > 0 and deferred >= self.max_deferrals:
+            # Never starve a layer forever: a host that stays loaded still gets an occasional real check.
+            self._deferrals[layer] = 0
+            return True, level, sample, True
+        self._deferrals[layer] = deferred + 1
+        return False, level, sample, False
+
+    def run(self, layer: str, run: TimedRun, base_timeout: float) -> CheckResult:
+        admitted, level, sample, forced = self.decide(layer)
+        if not admitted:
+            return self._inconclusive(layer, f"deferred: host {level} ({sample.describe()})", "deferred")
+        if not self.slots.acquire(timeout=self.queue_timeout_seconds):
+            return self._inconclusive(layer, "deferred: no free check slot", "queue_full")
+        try:
+            result = run(self.timeout_for(base_timeout, level))
+        finally:
+            self.slots.release()
+        if level != "normal" and not result.ok and result.code == 124:
+            reason = f"{result.reason} under host pressure ({sample.describe()})"
+            excused = self._excused.get(layer, 0)
+            if forced or (self.max_deferrals > 0 and excused >= self.max_deferrals):
+                # The forced run, and every run after max_deferrals excused timeouts, is a real verdict:
+                # a gateway that hangs while the host is also loaded must still reach UNHEALTHY.
+                self._excused[layer] = 0
+                return dataclasses.replace(result, reason=reason)
+            # A timeout on a starved host says more about the host than about the gateway.
+            self._excused[layer] = excused + 1
+            self.shed["timeout"] = self.shed.get("timeout", 0) + 1
+            return dataclasses.replace(result, reason=reason, inconclusive=True)
+        self._excused[layer] = 0
+        return result
+
+    def _inconclusive(self, layer: str, reason: str, kind: str) -> CheckResult:
+        self.shed[kind] = self.shed.get(kind, 0) + 1
+        return CheckResult(
+            layer=layer,
+            ok=False,
+            reason=reason,
+            code=INCONCLUSIVE_CODE,
+            latency_ms=0,
+            raw_excerpt="",
+            inconclusive=True,
+        )
+
+    def guard_runner(self, runner: Callable[[str, Any], Any]) -> Callable[[str, Any], Any]:
+        def guarded(command: str, timeout: Any) -> Any:
+            with self.slots:
+                return runner(command, timeout)
+
+        return guarded
+
+    def snapshot(self) -> Dict[str, Any]:
+        sample = self._sample
+        return {
+            "level": self.level,
+            "load_per_cpu": round(sample.load_per_cpu, 3) if sample is not None else None,
+            "psi_some_avg10": dict(sample.psi_some_avg10) if sample is not None else {},
+            # Copy first: check threads keep updating these while the control thread reads them.
+            "deferrals": {layer: count for layer, count in dict(self._deferrals).items() if count},
+            "shed": dict(self.shed),
+        }
+
+
+class AdmittedCheck:
+    def __init__(
+        self,
+        layer: str,
+        run: TimedRun,
+        timeout_seconds: float,
+        controller: AdmissionController,
+        target: Any = None,
+    ) -> None:
+        self.layer = layer
+        self.run = run
+        self.timeout_seconds = timeout_seconds
+        self.controller = controller
+        self.target = target
+
+    def __call__(self) -> CheckResult:
+        return self.controller.run(self.layer, self.run, self.timeout_seconds)
+
+    def close(self) -> None:
+        close = getattr(self.target, "close", None)
+        if callable(close):
+            close()
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from oc_healthd.alerts import AlertCoalescer, root_cause
+from oc_healthd.checks import CheckResult
+from oc_healthd.config import load_config
+from oc_healthd.push import decode_results, parse_target
+from oc_healthd.runtime import build_notifier
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class NodeState:
+    __slots__ = ("node_id", "state", "last_seen", "last_ts", "seq", "results", "records")
+
+    def __init__(self, node_id: str) -> None:
+        self.node_id = node_id
+        self.state = "UNKNOWN"
+        self.last_seen = 0.0
+        self.last_ts = 0.0
+        self.seq = 0
+        self.results: List[CheckResult] = []
+        self.records = 0
+
+
+class FleetAggregator:
+    def __init__(
+        self,
+        stale_after_seconds: float = 120.0,
+        coalesce_seconds: float = 30.0,
+        notifier: Any = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.stale_after_seconds = stale_after_seconds
+        self.notifier = notifier
+        self.clock = clock
+        self.coalescer = AlertCoalescer(coalesce_seconds, passthrough_single=False)
+        self.nodes: Dict[str, NodeState] = {}
+        self.batches = 0
+        self.rejected = 0
+        self.out_of_order = 0
+        self.duplicates = 0
+        self.alerts_sent = 0
+        self._lock = threading.Lock()
+
+    def ingest(self, payload: Dict[str, Any]) -> int:
+        node_id = payload.get("n")
+        records = payload.get("b")
+        if not isinstance(node_id, str) or not node_id or not isinstance(records, list):
+            self.rejected += 1
+            return 0
+        now = self.clock()
+        accepted = 0
+        with self._lock:
+            self.batches += 1
+            node = self.nodes.get(node_id)
+            if node is None:
+                node = NodeState(node_id)
+                self.nodes[node_id] = node
+            node.last_seen = now
+            for record in records:
+                try:
+                    ts, seq, state, transition, results = _parse_record(record)
+                except ValueError:
+                    self.rejected += 1
+                    continue
+                if (ts, seq) == (node.last_ts, node.seq):
+                    # A batch re-sent after an HTTP timeout or a duplicated datagram: its transition is
+                    # already in the coalescer.
+                    self.duplicates += 1
+                    continue
+                if (ts, seq) < (node.last_ts, node.seq):
+                    self.out_of_order += 1
+                    continue
+                node.last_ts = ts
+                node.seq = seq
+                node.state = state or node.state
+                node.results = results
+                node.records += 1
+                accepted += 1
+                if transition in {"entered_unhealthy", "recovered"}:
+                    self.coalescer.add(transition, self._cause(transition, results), "", source=node_id)
+        return accepted
+
+    @staticmethod
+    def _cause(transition: str, results: List[CheckResult]) -> str:
+        if transition != "entered_unhealthy":
+            return ""
+        primary, _suppressed = root_cause(results)
+        if primary is None:
+            return "unknown"
+        return f"{primary.layer} - {primary.reason}"
+
+    def tick(self) -> Optional[str]:
+        with self._lock:
+            digest = self.coalescer.due()
+        if not digest:
+            return None
+        digest = digest.replace("[OpenClaw Alert]", "[OpenClaw Fleet Alert]", 1)
+        if self.notifier is not None:
+            self.notifier.send(digest)
+        self.alerts_sent += 1
+        return digest
+
+    def fleet_status(self) -> Dict[str, Any]:
+        now = self.clock()
+        by_state: Dict[str, int] = {}
+        unhealthy: List[str] = []
+        stale: List[str] = []
+        causes: Dict[str, List[str]] = {}
+        with self._lock:
+            nodes = list(self.nodes.values())
+            for node in nodes:
+                if now - node.last_seen > self.stale_after_seconds:
+                    stale.append(node.node_id)
+                    state = "STALE"
+                else:
+                    state = node.state
+                by_state[state] = by_state.get(state, 0) + 1
+                if state == "UNHEALTHY":
+                    unhealthy.append(node.node_id)
+                    # Same correlation as the digest: a down system layer explains the OpenClaw failures.
+                    cause = self._cause("entered_unhealthy", node.results)
+                    causes.setdefault(cause, []).append(node.node_id)
+        return {
+            "nodes": len(nodes),
+            "by_state": by_state,
+            "unhealthy": sorted(unhealthy),
+            "stale": sorted(stale),
+            "causes": {cause: sorted(ids) for cause, ids in causes.items()},
+            "batches": self.batches,
+            "rejected": self.rejected,
+            "out_of_order": self.out_of_order,
+            "duplicates": self.duplicates,
+            "pending_alerts": self.coalescer.pending(),
+        }
+
+    def node_status(self, node_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            node = self.nodes.get(node_id)
+            if node is None:
+                return None
+            return {
+                "node": node.node_id,
+                "state": node.state,
+                "last_seen": node.last_seen,
+                "seq": node.seq,
+                "records": node.records,
+                "results": [
+                    {
+                        "layer": result.layer,
+                        "ok": result.ok,
+                        "code": result.code,
+                        "latency_ms": result.latency_ms,
+                        "reason": result.reason,
+                        "inconclusive": result.inconclusive,
+                    }
+                    for result in node.results
+                ],
+            }
+
+
+def _parse_record(record: Any) -> Tuple[float, int, str, str, List[CheckResult]]:
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+    ts = record.get("t", 0.0)
+    seq = record.get("s", 0)
+    state = record.get("st", "")
+    transition = record.get("tr", "steady")
+    if isinstance(ts, bool) or not isinstance(ts, (int, float)) or not math.isfinite(ts):
+        raise ValueError("malformed timestamp")
+    if isinstance(seq, bool) or not isinstance(seq, int):
+        raise ValueError("malformed sequence")
+    if not isinstance(state, str) or not isinstance(transition, str):
+        raise ValueError("malformed state")
+    return float(ts), seq, state, transition, decode_results(record)
+
+
+def _decode(body: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _make_handler(aggregator: FleetAggregator) -> type:
+    class AggregatorHandler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=True).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = 0
+            if self.path != "/push" or length <= 0 or length > MAX_BODY_BYTES:
+                self._reply(400, {"ok": False})
+                return
+            payload = _decode(self.rfile.read(length))
+            if payload is None:
+                aggregator.rejected += 1
+                self._reply(400, {"ok": False, "error": "invalid json"})
+                return
+            self._reply(200, {"ok": True, "accepted": aggregator.ingest(payload)})
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path in {"/", "/fleet"}:
+                self._reply(200, aggregator.fleet_status())
+                return
+            if self.path.startswith("/nodes/"):
+                status = aggregator.node_status(self.path[len("/nodes/"):])
+                if status is not None:
+                    self._reply(200, status)
+                    return
+            self._reply(404, {"ok": False})
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            return
+
+    return AggregatorHandler
+
+
+def start_http_server(aggregator: FleetAggregator, host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _make_handler(aggregator))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="oc-aggregator-http", daemon=True)
+    thread.start()
+    return server
+
+
+def start_udp_listener(aggregator: FleetAggregator, host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sock.bind((host, port))
+
+    def serve() -> None:
+        while True:
+            try:
+                body, _addr = sock.recvfrom(65535)
+            except OSError:
+                return
+            try:
+                payload = _decode(body)
+                if payload is None:
+                    aggregator.rejected += 1
+                    continue
+                aggregator.ingest(payload)
+            except Exception:  # pragma: no cover - one bad datagram must never stop fleet ingestion
+                aggregator.rejected += 1
+
+    threading.Thread(target=serve, name="oc-aggregator-udp", daemon=True).start()
+    return sock
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenClaw healthd fleet aggregator")
+    parser.add_argument("--http", default="127.0.0.1:9470", help="HTTP listen address (default: 127.0.0.1:9470)")
+    parser.add_argument("--udp", default="127.0.0.1:9471", help="UDP listen address, empty to disable")
+    parser.add_argument("--coalesce", type=float, default=30.0, help="Fleet alert digest window in seconds")
+    parser.add_argument("--stale-after", type=float, default=120.0, help="Seconds before a silent node is stale")
+    parser.add_argument("--config", default="", help="healthd config.toml whose notify channels receive fleet alerts")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    notifier = None
+    if args.config:
+        notifier = build_notifier(load_config(args.config))
+    aggregator = FleetAggregator(args.stale_after, args.coalesce, notifier)
+    host, port = parse_target(args.http, 9470)
+    server = start_http_server(aggregator, host, port)
+    udp = None
+    if args.udp:
+        udp_host, udp_port = parse_target(args.udp, 9471)
+        udp = start_udp_listener(aggregator, udp_host, udp_port)
+    try:
+        while True:
+            aggregator.tick()
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.shutdown()
+        if udp is not None:
+            udp.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from oc_healthd.checks import CheckResult
+
+SYSTEM_LAYER = "system_probe"
+
+KIND_TITLES = {
+    "entered_unhealthy": "UNHEALTHY",
+    "recovered": "RECOVERED",
+    "entered_degraded": "DEGRADED",
+}
+# Lines of a single alert that a digest carries over under its group.
+DETAIL_PREFIXES = ("Auto-restart:",)
+MAX_DETAILS = 3
+
+
+def root_cause(results: Iterable[CheckResult]) -> Tuple[Optional[CheckResult], List[CheckResult]]:
+    failing = [item for item in results if not item.ok and not item.inconclusive]
+    if not failing:
+        return None, []
+    system = [item for item in failing if item.layer == SYSTEM_LAYER]
+    if system:
+        # Host networking is down: OpenClaw failures are symptoms, not causes.
+        return system[0], [item for item in failing if item.layer != SYSTEM_LAYER]
+    return failing[0], []
+
+
+@dataclass
+class _Group:
+    kind: str
+    cause: str
+    first_message: str
+    count: int = 0
+    sources: Set[str] = field(default_factory=set)
+    details: List[str] = field(default_factory=list)
+
+
+class AlertCoalescer:
+    def __init__(
+        self,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        passthrough_single: bool = True,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.passthrough_single = passthrough_single
+        self._groups: Dict[Tuple[str, str], _Group] = {}
+        self._opened_at: Optional[float] = None
+        self.suppressed = 0
+
+    def add(self, kind: str, cause: str, message: str, source: str = "") -> None:
+        if self._opened_at is None:
+            self._opened_at = self.clock()
+        key = (kind, cause)
+        group = self._groups.get(key)
+        if group is None:
+            group = _Group(kind=kind, cause=cause, first_message=message)
+            self._groups[key] = group
+        else:
+            self.suppressed += 1
+        group.count += 1
+        if source:
+            group.sources.add(source)
+        for line in message.splitlines():
+            if line.startswith(DETAIL_PREFIXES) and line not in group.details:
+                group.details.append(line)
+
+    def pending(self) -> int:
+        return sum(group.count for group in self._groups.values())
+
+    def seconds_until_due(self) -> Optional[float]:
+        if self._opened_at is None:
+            return None
+        return max(0.0, self._opened_at + self.window_seconds - self.clock())
+
+    def due(self) -> Optional[str]:
+        if self._opened_at is None:
+            return None
+        if self.clock() - self._opened_at < self.window_seconds:
+            return None
+        return self.flush()
+
+    def flush(self) -> Optional[str]:
+        if not self._groups:
+            self._opened_at = None
+            return None
+        groups = list(self._groups.values())
+        opened_at = self.clock() if self._opened_at is None else self._opened_at
+        self._groups = {}
+        self._opened_at = None
+        if self.passthrough_single and len(groups) == 1 and groups[0].count == 1:
+            return groups[0].first_message
+        return self._digest(groups, self.clock() - opened_at)
+
+    @staticmethod
+    def _digest(groups: List[_Group], elapsed: float) -> str:
+        total = sum(group.count for group in groups)
+        lines = [f"[OpenClaw Alert] DIGEST ({total} alerts in {int(elapsed)}s)"]
+        for group in groups:
+            title = KIND_TITLES.get(group.kind, group.kind)
+            line = f"- {title} x{group.count}"
+            if group.cause:
+                line = f"{line}: {group.cause}"
+            if group.sources:
+                shown = sorted(group.sources)
+                more = f" +{len(shown) - 5} more" if len(shown) > 5 else ""
+                line = f"{line} [{', '.join(shown[:5])}{more}]"
+            lines.append(line)
+            # Keep what the daemon already did about it, e.g. the auto-restart outcome.
+            lines.extend(f"  {detail}" for detail in group.details[:MAX_DETAILS])
+        return "\n".join(lines)
@@ -4,12 +4,29 @@ import json
 import shlex
 import socket
 import subprocess
+import sys
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
+# Slotted results drop the per-instance __dict__; dataclass(slots=...) needs Python 3.10+.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+_INTERN_LIMIT = 512
+_interned: Dict[str, str] = {}
+
+
+def intern_text(value: str) -> str:
+    # Bounded intern table: repeated layer names and failure reasons share one string.
+    cached = _interned.get(value)
+    if cached is not None:
+        return cached
+    if len(_interned) < _INTERN_LIMIT and len(value) <= 300:
+        _interned[value] = value
+    return value
+
+
+@dataclass(frozen=True, **_SLOTS)
 class CheckResult:
     layer: str
     ok: bool
@@ -17,6 +34,25 @@ class CheckResult:
     code: int
     latency_ms: int
     raw_excerpt: str
+    # Set when the check was deferred or starved by host load: no verdict, not a failure.
+    inconclusive: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "layer", intern_text(self.layer))
+        object.__setattr__(self, "reason", intern_text(self.reason))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "layer": self.layer,
+            "ok": self.ok,
+            "reason": self.reason,
+            "code": self.code,
+            "latency_ms": self.latency_ms,
+            "raw_excerpt": self.raw_excerpt,
+        }
+        if self.inconclusive:
+            data["inconclusive"] = True
+        return data
 
 
 Runner = Callable[[str, int], subprocess.CompletedProcess]
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-import configparser
+import json
 import os
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-try:
-    import tomllib  # type: ignore[attr-defined]
-except ModuleNotFoundError:  # pragma: no cover - runtime fallback for Python < 3.11
-    tomllib = None  # type: ignore[assignment]
+CACHE_VERSION = 2
+# Never written to the plaintext snapshot; configs that set them inline are parsed on every load.
+SECRET_FIELDS = (("telegram", "bot_token"), ("notify", "webhook_url"), ("roundtrip", "token"))
+# Filesystem timestamps are tick-granular: an edit this close to the snapshot could share its mtime.
+RACY_WINDOW_NS = 2_000_000_000
 
 
 @dataclass(frozen=True)
@@ -39,12 +41,124 @@ class TelegramConfig:
     chat_id: str = ""
 
 
+@dataclass(frozen=True)
+class NotifyConfig:
+    webhook_url: str = ""
+    webhook_timeout_seconds: int = 5
+    file_path: str = ""
+    syslog: bool = False
+    command: str = ""
+    command_timeout_seconds: int = 10
+
+
+@dataclass(frozen=True)
+class AlertsConfig:
+    coalesce_seconds: int = 0
+
+
+@dataclass(frozen=True)
+class HAConfig:
+    enabled: bool = False
+    lease_file: str = "logs/leader.lease"
+    lease_ttl_seconds: int = 90
+    node_id: str = ""
+    max_clock_skew_seconds: int = 2
+
+
+@dataclass(frozen=True)
+class PushConfig:
+    enabled: bool = False
+    transport: str = "udp"
+    target: str = "127.0.0.1:9471"
+    node_id: str = ""
+    batch_size: int = 50
+    flush_seconds: int = 5
+    queue_size: int = 1000
+    # False: this node only pushes; the aggregator sends the (deduplicated) fleet alerts.
+    local_alerts: bool = True
+
+
+@dataclass(frozen=True)
+class DiagnosticsConfig:
+    enabled: bool = False
+    output_dir: str = "logs/incidents"
+    budget_seconds: float = 5.0
+    gateway_pattern: str = "openclaw"
+    gateway_log: str = ""
+    log_tail_lines: int = 200
+    keep: int = 20
+
+
+@dataclass(frozen=True)
+class LatencyConfig:
+    enabled: bool = False
+    slo_ms: int = 0
+    layer_slo_ms: Tuple[Tuple[str, int], ...] = ()
+    window: int = 10
+    drift_factor: float = 2.0
+    ewma_alpha: float = 0.2
+    min_windows: int = 3
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    enabled: bool = False
+    max_concurrent: int = 2
+    load_elevated: float = 1.5
+    load_critical: float = 3.0
+    psi_elevated: float = 25.0
+    psi_critical: float = 60.0
+    timeout_factor: float = 2.0
+    max_timeout_seconds: int = 0
+    max_deferrals: int = 10
+    tiers: Tuple[Tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class StatusMapConfig:
+    enabled: bool = False
+    path: str = "logs/status.map"
+
+
+@dataclass(frozen=True)
+class RoundTripConfig:
+    enabled: bool = False
+    url: str = "http://127.0.0.1:18789/oc-healthd/echo"
+    timeout_seconds: int = 0
+    token: str = ""
+    expect_echo: bool = True
+
+
+@dataclass(frozen=True)
+class HistoryConfig:
+    enabled: bool = False
+    path: str = "logs/history.sqlite3"
+    raw_retention_days: float = 7.0
+    minute_retention_days: float = 90.0
+    hour_retention_days: float = 730.0
+    batch_size: int = 200
+    flush_seconds: float = 5.0
+    queue_size: int = 10000
+
+
 @dataclass(frozen=True)
 class PathsConfig:
     log_file: str = "logs/healthd.jsonl"
     state_file: str = "logs/state.json"
 
 
+@dataclass(frozen=True)
+class MetricsConfig:
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 9464
+
+
+@dataclass(frozen=True)
+class ControlConfig:
+    socket_path: str = "logs/healthd.sock"
+
+
 @dataclass(frozen=True)
 class AppConfig:
     monitor: MonitorConfig
@@ -52,6 +166,18 @@ class AppConfig:
     system: SystemConfig
     telegram: TelegramConfig
     paths: PathsConfig
+    metrics: MetricsConfig = MetricsConfig()
+    control: ControlConfig = ControlConfig()
+    notify: NotifyConfig = NotifyConfig()
+    alerts: AlertsConfig = AlertsConfig()
+    ha: HAConfig = HAConfig()
+    push: PushConfig = PushConfig()
+    diagnostics: DiagnosticsConfig = DiagnosticsConfig()
+    latency: LatencyConfig = LatencyConfig()
+    history: HistoryConfig = HistoryConfig()
+    roundtrip: RoundTripConfig = RoundTripConfig()
+    status_map: StatusMapConfig = StatusMapConfig()
+    admission: AdmissionConfig = AdmissionConfig()
 
 
 def _as_dict(value: Any) -> Dict[str, Any]:
@@ -60,6 +186,12 @@ def _as_dict(value: Any) -> Dict[str, Any]:
     return {}
 
 
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _strip_quotes(value: str) -> str:
     value = value.strip()
     if len(value) >= 2 and value[0] == value[-1] and value[0] in {'"', "'"}:
@@ -69,9 +201,16 @@ def _strip_quotes(value: str) -> str:
 
 def _load_raw_data(path: str) -> Dict[str, Any]:
     content_text = Path(path).read_text(encoding="utf-8")
+    # Parsers are imported on a cache miss only; the cached snapshot path never needs them.
+    try:
+        import tomllib  # type: ignore[import-not-found]
+    except ModuleNotFoundError:  # pragma: no cover - runtime fallback for Python < 3.11
+        tomllib = None  # type: ignore[assignment]
     if tomllib is not None:
         return tomllib.loads(content_text)
 
+    import configparser
+
     parser = configparser.ConfigParser()
     parser.read_string(content_text)
     data: Dict[str, Any] = {}
@@ -83,14 +222,71 @@ def _load_raw_data(path: str) -> Dict[str, Any]:
     return data
 
 
-def load_config(path: str) -> AppConfig:
+def cache_path_for(path: str) -> Path:
+    config_path = Path(path)
+    return config_path.with_name(f".{config_path.name}.cache.json")
+
+
+def load_config_cached(path: str) -> AppConfig:
+    stat = os.stat(path)
+    key = [CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+    cache_path = cache_path_for(path)
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached["key"] == key and stat.st_mtime_ns < int(cached["written_ns"]) - RACY_WINDOW_NS:
+            return _build_config(cached["data"])
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
     data = _load_raw_data(path)
+    # Only data that builds a valid AppConfig is cached; env overrides are applied on every load.
+    config = _build_config(data)
+    try:
+        if _has_inline_secrets(data):
+            # Keep secrets in the environment (TELEGRAM_BOT_TOKEN, ...) to get the cached fast path.
+            cache_path.unlink()
+        else:
+            _write_cache(cache_path, {"key": key, "written_ns": time.time_ns(), "data": data})
+    except (OSError, TypeError, ValueError):
+        pass
+    return config
+
+
+def _has_inline_secrets(data: Dict[str, Any]) -> bool:
+    return any(_as_dict(data.get(section)).get(field) for section, field in SECRET_FIELDS)
+
+
+def _write_cache(cache_path: Path, payload: Dict[str, Any]) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    # Secrets are never cached, but the snapshot still mirrors a private config file: keep it owner-only.
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=True)
+    os.replace(tmp_path, cache_path)
 
+
+def load_config(path: str) -> AppConfig:
+    return _build_config(_load_raw_data(path))
+
+
+def _build_config(data: Dict[str, Any]) -> AppConfig:
     monitor = _as_dict(data.get("monitor"))
     openclaw = _as_dict(data.get("openclaw"))
     system = _as_dict(data.get("system"))
     telegram = _as_dict(data.get("telegram"))
     paths = _as_dict(data.get("paths"))
+    metrics = _as_dict(data.get("metrics"))
+    control = _as_dict(data.get("control"))
+    notify = _as_dict(data.get("notify"))
+    alerts = _as_dict(data.get("alerts"))
+    ha = _as_dict(data.get("ha"))
+    push = _as_dict(data.get("push"))
+    diagnostics = _as_dict(data.get("diagnostics"))
+    latency = _as_dict(data.get("latency"))
+    history = _as_dict(data.get("history"))
+    roundtrip = _as_dict(data.get("roundtrip"))
+    status_map = _as_dict(data.get("status_map"))
+    admission = _as_dict(data.get("admission"))
 
     monitor_cfg = MonitorConfig(
         interval_seconds=int(monitor.get("interval_seconds", 30)),
@@ -111,10 +307,111 @@ def load_config(path: str) -> AppConfig:
         bot_token=os.getenv("TELEGRAM_BOT_TOKEN", str(telegram.get("bot_token", ""))),
         chat_id=os.getenv("TELEGRAM_CHAT_ID", str(telegram.get("chat_id", ""))),
     )
+    notify_cfg = NotifyConfig(
+        webhook_url=os.getenv("OC_HEALTHD_WEBHOOK_URL", str(notify.get("webhook_url", ""))),
+        webhook_timeout_seconds=int(notify.get("webhook_timeout_seconds", 5)),
+        file_path=str(notify.get("file_path", "")),
+        syslog=_as_bool(notify.get("syslog", False)),
+        command=str(notify.get("command", "")),
+        command_timeout_seconds=int(notify.get("command_timeout_seconds", 10)),
+    )
+    alerts_cfg = AlertsConfig(
+        coalesce_seconds=int(alerts.get("coalesce_seconds", 0)),
+    )
+    ha_cfg = HAConfig(
+        enabled=_as_bool(ha.get("enabled", False)),
+        lease_file=str(ha.get("lease_file", "logs/leader.lease")),
+        lease_ttl_seconds=int(ha.get("lease_ttl_seconds", 90)),
+        node_id=str(ha.get("node_id", "")),
+        max_clock_skew_seconds=int(ha.get("max_clock_skew_seconds", 2)),
+    )
+    push_cfg = PushConfig(
+        enabled=_as_bool(push.get("enabled", False)),
+        transport=str(push.get("transport", "udp")),
+        target=str(push.get("target", "127.0.0.1:9471")),
+        node_id=str(push.get("node_id", "")),
+        batch_size=int(push.get("batch_size", 50)),
+        flush_seconds=int(push.get("flush_seconds", 5)),
+        queue_size=int(push.get("queue_size", 1000)),
+        local_alerts=_as_bool(push.get("local_alerts", True)),
+    )
+    diagnostics_cfg = DiagnosticsConfig(
+        enabled=_as_bool(diagnostics.get("enabled", False)),
+        output_dir=str(diagnostics.get("output_dir", "logs/incidents")),
+        budget_seconds=float(diagnostics.get("budget_seconds", 5.0)),
+        gateway_pattern=str(diagnostics.get("gateway_pattern", "openclaw")),
+        gateway_log=str(diagnostics.get("gateway_log", "")),
+        log_tail_lines=int(diagnostics.get("log_tail_lines", 200)),
+        keep=int(diagnostics.get("keep", 20)),
+    )
+    latency_cfg = LatencyConfig(
+        enabled=_as_bool(latency.get("enabled", False)),
+        slo_ms=int(latency.get("slo_ms", 0)),
+        # Per-layer overrides are flat keys such as `openclaw_status_slo_ms` so the INI fallback can read them.
+        layer_slo_ms=tuple(
+            sorted(
+                (key[: -len("_slo_ms")], int(value))
+                for key, value in latency.items()
+                if key.endswith("_slo_ms") and key != "slo_ms"
+            )
+        ),
+        window=int(latency.get("window", 10)),
+        drift_factor=float(latency.get("drift_factor", 2.0)),
+        ewma_alpha=float(latency.get("ewma_alpha", 0.2)),
+        min_windows=int(latency.get("min_windows", 3)),
+    )
+    history_cfg = HistoryConfig(
+        enabled=_as_bool(history.get("enabled", False)),
+        path=str(history.get("path", "logs/history.sqlite3")),
+        raw_retention_days=float(history.get("raw_retention_days", 7.0)),
+        minute_retention_days=float(history.get("minute_retention_days", 90.0)),
+        hour_retention_days=float(history.get("hour_retention_days", 730.0)),
+        batch_size=int(history.get("batch_size", 200)),
+        flush_seconds=float(history.get("flush_seconds", 5.0)),
+        queue_size=int(history.get("queue_size", 10000)),
+    )
+    roundtrip_cfg = RoundTripConfig(
+        enabled=_as_bool(roundtrip.get("enabled", False)),
+        url=str(roundtrip.get("url", "http://127.0.0.1:18789/oc-healthd/echo")),
+        timeout_seconds=int(roundtrip.get("timeout_seconds", 0)),
+        token=os.getenv("OC_HEALTHD_ROUNDTRIP_TOKEN", str(roundtrip.get("token", ""))),
+        expect_echo=_as_bool(roundtrip.get("expect_echo", True)),
+    )
+    status_map_cfg = StatusMapConfig(
+        enabled=_as_bool(status_map.get("enabled", False)),
+        path=str(status_map.get("path", "logs/status.map")),
+    )
+    admission_cfg = AdmissionConfig(
+        enabled=_as_bool(admission.get("enabled", False)),
+        max_concurrent=int(admission.get("max_concurrent", 2)),
+        load_elevated=float(admission.get("load_elevated", 1.5)),
+        load_critical=float(admission.get("load_critical", 3.0)),
+        psi_elevated=float(admission.get("psi_elevated", 25.0)),
+        psi_critical=float(admission.get("psi_critical", 60.0)),
+        timeout_factor=float(admission.get("timeout_factor", 2.0)),
+        max_timeout_seconds=int(admission.get("max_timeout_seconds", 0)),
+        max_deferrals=int(admission.get("max_deferrals", 10)),
+        # Same flat-key convention as the latency SLOs: `openclaw_health_tier = "expensive"`.
+        tiers=tuple(
+            sorted(
+                (key[: -len("_tier")], str(value))
+                for key, value in admission.items()
+                if key.endswith("_tier")
+            )
+        ),
+    )
     paths_cfg = PathsConfig(
         log_file=str(paths.get("log_file", "logs/healthd.jsonl")),
         state_file=str(paths.get("state_file", "logs/state.json")),
     )
+    metrics_cfg = MetricsConfig(
+        enabled=_as_bool(metrics.get("enabled", False)),
+        host=str(metrics.get("host", "127.0.0.1")),
+        port=int(metrics.get("port", 9464)),
+    )
+    control_cfg = ControlConfig(
+        socket_path=str(control.get("socket_path", "logs/healthd.sock")),
+    )
 
     return AppConfig(
         monitor=monitor_cfg,
@@ -122,4 +419,16 @@ def load_config(path: str) -> AppConfig:
         system=system_cfg,
         telegram=telegram_cfg,
         paths=paths_cfg,
+        metrics=metrics_cfg,
+        control=control_cfg,
+        notify=notify_cfg,
+        alerts=alerts_cfg,
+        ha=ha_cfg,
+        push=push_cfg,
+        diagnostics=diagnostics_cfg,
+        latency=latency_cfg,
+        history=history_cfg,
+        roundtrip=roundtrip_cfg,
+        status_map=status_map_cfg,
+        admission=admission_cfg,
     )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from oc_healthd.daemon import HealthDaemon
+
+MAX_REQUEST_BYTES = 64 * 1024
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class ControlServer:
+    def __init__(
+        self,
+        daemon: HealthDaemon,
+        socket_path: str,
+        on_reload: Optional[Callable[[], Dict[str, Any]]] = None,
+        on_history: Optional[Handler] = None,
+        on_check: Optional[Callable[[], str]] = None,
+        on_stats: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> None:
+        self.daemon = daemon
+        self.on_check = on_check or daemon.run_cycle
+        self.on_stats = on_stats
+        self.socket_path = Path(socket_path)
+        self.commands: Dict[str, Handler] = {
+            "ping": lambda _request: {"pong": True},
+            "status": self._status,
+            "check": self._check,
+            "pause": self._pause,
+            "resume": self._resume,
+            "stats": self._stats,
+        }
+        if on_reload is not None:
+            self.commands["reload"] = lambda _request: {"reload": on_reload()}
+        if on_history is not None:
+            self.commands["history"] = lambda request: {"history": on_history(request)}
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = str(request.get("cmd", ""))
+        handler = self.commands.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"unknown command: {command}"}
+        try:
+            payload = handler(request)
+        except Exception as error:  # pragma: no cover - defensive path
+            return {"ok": False, "error": f"{command} failed: {error}"}
+        return {"ok": True, **payload}
+
+    def _status(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        return self.daemon.snapshot()
+
+    def _check(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        transition = self.on_check()
+        return {"transition": transition, **self.daemon.snapshot()}
+
+    def _pause(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        self.daemon.paused = True
+        return {"paused": True}
+
+    def _resume(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        self.daemon.paused = False
+        return {"paused": False}
+
+    def _stats(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        stats = {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.daemon.started_at, 3),
+            "cycles": self.daemon.cycles,
+            "paused": self.daemon.paused,
+            "last_spans_ms": dict(self.daemon.last_spans_ms),
+        }
+        if self.on_stats is not None:
+            stats.update(self.on_stats())
+        return stats
+
+    def start(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists() or self.socket_path.is_symlink():
+            if _is_live_socket(self.socket_path):
+                # Another daemon (e.g. the other HA node in the same directory) is serving here.
+                raise OSError(f"control socket already in use: {self.socket_path}")
+            self.socket_path.unlink()
+        # bind() creates the socket file with the process umask; restrict it so there is no window in which
+        # other local users can connect before the chmod.
+        previous_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(
+                str(self.socket_path), _make_handler(self)
+            )
+        finally:
+            os.umask(previous_umask)
+        server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever,
+            name="oc-healthd-control",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _is_live_socket(path: Path) -> bool:
+    try:
+        if not stat.S_ISSOCK(path.lstat().st_mode):
+            return False
+    except OSError:
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            # ECONNREFUSED: left behind by a daemon that died without unlinking it.
+            return False
+    return True
+
+
+def _make_handler(control: ControlServer) -> type:
+    class ControlHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                if len(line) > MAX_REQUEST_BYTES:
+                    response: Dict[str, Any] = {"ok": False, "error": "request too large"}
+                else:
+                    try:
+                        request = json.loads(line.decode("utf-8") or "{}")
+                    except ValueError:
+                        response = {"ok": False, "error": "invalid json"}
+                    else:
+                        if isinstance(request, dict):
+                            response = control.handle(request)
+                        else:
+                            response = {"ok": False, "error": "request must be an object"}
+                self.wfile.write(json.dumps(response, ensure_ascii=True).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    return ControlHandler
+
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+COMMANDS = ("status", "check", "pause", "resume", "stats", "reload", "history", "ping")
+
+
+def request(socket_path: str, command: str, timeout_seconds: float = 5.0, **fields: Any) -> Dict[str, Any]:
+    payload = json.dumps({"cmd": command, **fields}, ensure_ascii=True).encode("utf-8") + b"\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout_seconds)
+        client.connect(socket_path)
+        client.sendall(payload)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenClaw health daemon control client")
+    parser.add_argument(
+        "--socket",
+        default="logs/healthd.sock",
+        help="Path to the daemon control socket (default: logs/healthd.sock)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for a response (default: 60)",
+    )
+    parser.add_argument("--layer", default="openclaw_health", help="history: check layer to query")
+    parser.add_argument("--since", default="1h", help="history: look-back window such as 30m, 24h, 30d, 1y")
+    parser.add_argument("--resolution", choices=("auto", "raw", "1m", "1h"), default="auto")
+    parser.add_argument("--summary", action="store_true", help="history: only return the aggregate")
+    parser.add_argument("command", choices=COMMANDS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        fields: Dict[str, Any] = {}
+        if args.command == "history":
+            fields = {"layer": args.layer, "since": args.since, "resolution": args.resolution, "summary": args.summary}
+        response = request(args.socket, args.command, args.timeout, **fields)
+    except (OSError, ValueError) as error:
+        print(f"control socket unavailable: {args.socket}: {error}", file=sys.stderr)
+        return 2
+    print(json.dumps(response, indent=2, ensure_ascii=False))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict
-from datetime import datetime, timezone
+import threading
+import time
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Protocol
 
+from oc_healthd.alerts import AlertCoalescer, root_cause
 from oc_healthd.checks import CheckResult
+from oc_healthd.latency import LatencyMonitor
 from oc_healthd.state_machine import MonitorStateMachine
 from oc_healthd.state_store import StateStore
+from oc_healthd.timing import StageTimer
+
+if TYPE_CHECKING:
+    from oc_healthd.metrics import HealthMetrics
+
+# Layers whose failure points at the gateway itself, so an auto-restart can help.
+OPENCLAW_LAYERS = frozenset({"openclaw_health", "openclaw_status", "gateway_roundtrip"})
 
 
 class Notifier(Protocol):
@@ -21,6 +30,22 @@ class Restarter(Protocol):
         ...
 
 
+class Diagnostics(Protocol):
+    def capture(self, results: List[CheckResult]) -> Dict[str, Any]:
+        ...
+
+
+class CycleSink(Protocol):
+    def publish(
+        self,
+        results: List[CheckResult],
+        state: str,
+        transition: str,
+        counters: Dict[str, int],
+    ) -> None:
+        ...
+
+
 CheckRunner = Callable[[], CheckResult]
 
 
@@ -33,57 +58,276 @@ class HealthDaemon:
         state_store: StateStore,
         log_file: str,
         restarter: Optional[Restarter] = None,
+        metrics: Optional["HealthMetrics"] = None,
+        coalescer: Optional[AlertCoalescer] = None,
+        is_leader: Optional[Callable[[], bool]] = None,
+        sinks: Optional[Iterable[CycleSink]] = None,
+        diagnostics: Optional[Diagnostics] = None,
+        latency: Optional[LatencyMonitor] = None,
     ) -> None:
         self.notifier = notifier
         self.restarter = restarter
+        self.metrics = metrics
+        self.coalescer = coalescer
+        self.is_leader = is_leader
+        self.sinks: List[CycleSink] = list(sinks or [])
+        self.diagnostics = diagnostics
+        self.latency = latency
+        self.role = "standalone"
+        self.local_alerts = True
         self.state_store = state_store
         self.log_file = Path(log_file)
         self.checks = list(checks)
-        persisted = self.state_store.load()
-        self.machine = MonitorStateMachine(
-            threshold=threshold,
-            current_state=str(persisted.get("state", "HEALTHY")),
-            counters={
+        self.last_spans_ms: Dict[str, float] = {}
+        self.last_results: List[CheckResult] = []
+        self.last_transition = ""
+        self.last_cycle_at = ""
+        self.last_transition_at = ""
+        self.cycles = 0
+        self.paused = False
+        self._dispatched = False
+        self._dispatch_seq = 0
+        self.started_at = time.time()
+        self.lock = threading.RLock()
+        # Readers (control status/stats) only take this short lock, never the cycle lock held through probes.
+        self._published_lock = threading.Lock()
+        self._published: Dict[str, Any] = {}
+        self.machine = MonitorStateMachine(threshold=threshold)
+        self.reload_state()
+
+    def run_cycle(self) -> str:
+        with self.lock:
+            return self._run_cycle_locked()
+
+    def reload_state(self) -> None:
+        with self.lock:
+            persisted = self.state_store.load()
+            self.machine.current_state = str(persisted.get("state", "HEALTHY"))
+            self.machine.counters = {
                 str(key): int(value)
                 for key, value in dict(persisted.get("counters", {})).items()
-            },
-        )
+            }
+            if self.latency is not None:
+                self.latency.load(dict(persisted.get("latency", {})))
+            self._publish_snapshot()
 
-    def run_cycle(self) -> str:
-        results: List[CheckResult] = [check() for check in self.checks]
-        transition = self.machine.apply(results)
-        notified = False
+    def snapshot(self) -> Dict[str, Any]:
+        with self._published_lock:
+            published = self._published
+        return {
+            **published,
+            "counters": dict(published["counters"]),
+            "role": self.role,
+            "paused": self.paused,
+            "results": [result.to_dict() for result in published["results"]],
+        }
+
+    def _publish_snapshot(self) -> None:
+        # Built under the cycle lock and swapped in whole; never mutated after publication.
+        published = {
+            "state": self.machine.current_state,
+            "counters": dict(self.machine.counters),
+            "latency_state": self.latency.state if self.latency is not None else "",
+            "cycles": self.cycles,
+            "last_cycle_at": self.last_cycle_at,
+            "last_transition": self.last_transition,
+            "last_transition_at": self.last_transition_at,
+            "results": tuple(self.last_results),
+        }
+        with self._published_lock:
+            self._published = published
+
+    def log_event(self, event: str, **fields: Any) -> None:
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"ts": self._now(), "event": event, "state": self.machine.current_state, **fields}
+        with self.log_file.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload, ensure_ascii=True) + "\n")
+
+    def _run_cycle_locked(self) -> str:
+        timer = StageTimer()
+        results: List[CheckResult] = []
+        for check in self.checks:
+            check_started = time.monotonic_ns()
+            result = check()
+            timer.add(f"check.{result.layer}", time.monotonic_ns() - check_started)
+            results.append(result)
+        with timer.stage("apply"):
+            transition = self.machine.apply(results)
+        latency_transition = None
+        if self.latency is not None:
+            with timer.stage("latency"):
+                latency_transition = self.latency.observe(results)
+        deliveries: Dict[str, Dict[str, Any]] = {}
         restart_attempted = False
         restart_ok = False
         message = ""
+        incident: Dict[str, Any] = {}
+
+        fenced = self.is_leader is not None and not self.is_leader()
+        if fenced:
+            # Lost the lease mid-cycle: the new leader owns state and side effects.
+            transition = None
+            latency_transition = None
+        else:
+            persisted: Dict[str, Any] = {
+                "state": self.machine.current_state,
+                "counters": self.machine.counters,
+            }
+            if self.latency is not None:
+                persisted["latency"] = self.latency.to_dict()
+            with timer.stage("save"):
+                self.state_store.save(persisted)
 
         if transition == "entered_unhealthy":
-            restart_attempted, restart_ok, restart_note = self._maybe_restart(results)
+            if self.diagnostics is not None:
+                # Capture evidence before the restart wipes it; bounded by the collector's budget.
+                with timer.stage("diagnostics"):
+                    incident = self._capture_diagnostics(results)
+            with timer.stage("restart"):
+                restart_attempted, restart_ok, restart_note = self._maybe_restart(results)
             message = self._build_unhealthy_message(results)
             if restart_attempted:
                 status = "ok" if restart_ok else "failed"
                 message = f"{message}\nAuto-restart: {status} ({restart_note})"
-            notified = self.notifier.send(message)
+            if incident.get("path"):
+                message = f"{message}\nDiagnostics: {incident['path']}"
         elif transition == "recovered":
             message = self._build_recovered_message(results)
-            notified = self.notifier.send(message)
+        elif latency_transition == "entered_degraded" and self.machine.current_state == "HEALTHY":
+            # One-shot: DEGRADED alerts once per episode and stays quiet while UNHEALTHY owns the pager.
+            message = self._build_degraded_message()
+        alert_kind = transition or (latency_transition if message else None)
 
-        self.state_store.save(
-            {
-                "state": self.machine.current_state,
-                "counters": self.machine.counters,
-            }
-        )
-        self._append_log(
-            results=results,
-            transition=transition or "steady",
-            notified=notified,
-            message=message,
-            restart_attempted=restart_attempted,
-            restart_ok=restart_ok,
-        )
+        outgoing = message
+        if self.coalescer is not None and not fenced:
+            if alert_kind:
+                self.coalescer.add(alert_kind, self._alert_cause(alert_kind, results), message)
+            outgoing = self.coalescer.due() or ""
+        dispatch_id = ""
+        if outgoing:
+            dispatch_id = self._next_dispatch_id()
+            with timer.stage("notify"):
+                deliveries = self._notify(outgoing, dispatch_id)
+
+        with timer.stage("log"):
+            self._append_log(
+                results=results,
+                transition=transition or "steady",
+                deliveries=deliveries,
+                message=outgoing or message,
+                restart_attempted=restart_attempted,
+                restart_ok=restart_ok,
+                spans_ms=timer.as_ms(),
+                fenced=fenced,
+                diagnostics=incident,
+                latency_transition=latency_transition,
+                dispatch_id=dispatch_id,
+            )
+        if self.sinks:
+            with timer.stage("publish"):
+                self._publish(results, transition or "steady")
+        self.last_spans_ms = timer.as_ms()
+        self.last_results = results
+        self.last_cycle_at = self._now()
+        if transition:
+            self.last_transition = transition
+            self.last_transition_at = self.last_cycle_at
+        self.cycles += 1
+        self._publish_snapshot()
+        if self.metrics is not None:
+            self.metrics.observe_results(results, self.machine.counters)
+            self.metrics.observe_state(self.machine.current_state, transition)
+            if self.latency is not None:
+                self.metrics.observe_latency(self.latency, latency_transition)
+            if restart_attempted:
+                self.metrics.observe_restart(restart_ok)
+            self.metrics.observe_stages(timer.spans_ns)
+            self.metrics.observe_cycle(timer.total_ns() / 1_000_000_000)
         return transition or "steady"
 
+    def _publish(self, results: List[CheckResult], transition: str) -> None:
+        for sink in self.sinks:
+            try:
+                sink.publish(results, self.machine.current_state, transition, self.machine.counters)
+            except Exception:  # pragma: no cover - sinks must never break the cycle
+                continue
+
+    def flush_alerts(self, force: bool = True) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            if self.coalescer is None:
+                return {}
+            digest = self.coalescer.flush() if force else self.coalescer.due()
+            if not digest:
+                return {}
+            dispatch_id = self._next_dispatch_id()
+            deliveries = self._notify(digest, dispatch_id)
+            self.log_event("alert_flush", dispatch_id=dispatch_id, deliveries=deliveries, message_preview=digest[:180])
+            return deliveries
+
+    def alerts_due_in(self) -> Optional[float]:
+        coalescer = self.coalescer
+        return coalescer.seconds_until_due() if coalescer is not None else None
+
+    def _alert_cause(self, transition: str, results: List[CheckResult]) -> str:
+        if transition == "entered_degraded" and self.latency is not None:
+            return ", ".join(layer for layer, _reason in self.latency.degraded_layers())
+        if transition != "entered_unhealthy":
+            return ""
+        primary, _suppressed = root_cause(results)
+        if primary is None:
+            return ""
+        return f"{primary.layer} - {primary.reason}"
+
+    def _next_dispatch_id(self) -> str:
+        # Links the cycle (or alert_flush) record to the "delivery" events its channels log later.
+        self._dispatch_seq += 1
+        return f"{int(self.started_at)}-{self._dispatch_seq}"
+
+    def _notify(self, message: str, dispatch_id: str = "") -> Dict[str, Dict[str, Any]]:
+        if not self.local_alerts:
+            # Push mode with local_alerts = false: the fleet aggregator pages once for all nodes.
+            return {"aggregator": {"ok": True, "status": "routed", "latency_ms": 0}}
+        dispatch = getattr(self.notifier, "dispatch", None)
+        if callable(dispatch):
+            # Fire-and-forget: channel threads log and count their own outcomes; the cycle never waits.
+            self._dispatched = True
+            return dispatch(
+                message,
+                lambda channel, delivery: self._record_delivery(channel, delivery, dispatch_id),
+            )
+        started = time.monotonic()
+        ok = self.notifier.send(message)
+        deliveries = {
+            "default": {
+                "ok": ok,
+                "status": "sent" if ok else "failed",
+                "latency_ms": int((time.monotonic() - started) * 1000),
+            }
+        }
+        if self.metrics is not None:
+            for channel, delivery in deliveries.items():
+                self.metrics.observe_notification(channel, delivery["status"])
+        return deliveries
+
+    def _record_delivery(self, channel: str, delivery: Dict[str, Any], dispatch_id: str = "") -> None:
+        if self.metrics is not None:
+            self.metrics.observe_notification(channel, delivery["status"])
+        try:
+            self.log_event("delivery", dispatch_id=dispatch_id, channel=channel, **delivery)
+        except OSError:
+            pass
+
+    def drain_notifications(self) -> None:
+        drain = getattr(self.notifier, "drain", None) if self._dispatched else None
+        if callable(drain):
+            drain()
+
+    def _capture_diagnostics(self, results: List[CheckResult]) -> Dict[str, Any]:
+        try:
+            return self.diagnostics.capture(results)
+        except Exception as error:  # pragma: no cover - diagnostics must never block the restart
+            return {"error": str(error)}
+
     def _maybe_restart(self, results: List[CheckResult]) -> tuple[bool, bool, str]:
         if self.restarter is None:
             return False, False, "restarter disabled"
@@ -95,19 +339,24 @@ class HealthDaemon:
     @staticmethod
     def _has_openclaw_failure(results: List[CheckResult]) -> bool:
         for result in results:
-            if result.layer in {"openclaw_health", "openclaw_status"} and not result.ok:
+            if result.layer in OPENCLAW_LAYERS and not result.ok and not result.inconclusive:
                 return True
         return False
 
     def _build_unhealthy_message(self, results: List[CheckResult]) -> str:
-        failing = [item for item in results if not item.ok]
-        primary = failing[0] if failing else results[0]
-        return (
+        primary, suppressed = root_cause(results)
+        if primary is None:
+            primary = results[0]
+        message = (
             "[OpenClaw Alert] UNHEALTHY\n"
             f"Time: {self._now()}\n"
             f"Reason: {primary.layer} - {primary.reason}\n"
             f"Code: {primary.code}"
         )
+        if suppressed:
+            layers = ", ".join(item.layer for item in suppressed)
+            message = f"{message}\nSuppressed: {layers} (system layer down)"
+        return message
 
     def _build_recovered_message(self, results: List[CheckResult]) -> str:
         summary = ", ".join(f"{item.layer}=ok" for item in results)
@@ -117,30 +366,53 @@ class HealthDaemon:
             f"Checks: {summary}"
         )
 
+    def _build_degraded_message(self) -> str:
+        lines = [f"{layer} - {reason}" for layer, reason in self.latency.degraded_layers()]
+        return (
+            "[OpenClaw Alert] DEGRADED\n"
+            f"Time: {self._now()}\n"
+            "Latency: " + "; ".join(lines)
+        )
+
     def _append_log(
         self,
         results: List[CheckResult],
         transition: str,
-        notified: bool,
+        deliveries: Dict[str, Dict[str, Any]],
         message: str,
         restart_attempted: bool,
         restart_ok: bool,
+        spans_ms: Optional[Dict[str, float]] = None,
+        fenced: bool = False,
+        diagnostics: Optional[Dict[str, Any]] = None,
+        latency_transition: Optional[str] = None,
+        dispatch_id: str = "",
     ) -> None:
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "ts": self._now(),
             "state": self.machine.current_state,
             "transition": transition,
-            "notified": notified,
+            "deliveries": deliveries,
             "restart_attempted": restart_attempted,
             "restart_ok": restart_ok,
             "message_preview": message[:180],
             "counters": self.machine.counters,
-            "results": [asdict(result) for result in results],
+            "results": [result.to_dict() for result in results],
+            "spans_ms": spans_ms or {},
         }
+        if dispatch_id:
+            payload["dispatch_id"] = dispatch_id
+        if fenced:
+            payload["fenced"] = True
+        if diagnostics:
+            payload["diagnostics"] = diagnostics
+        if latency_transition:
+            payload["latency_transition"] = latency_transition
         with self.log_file.open("a", encoding="utf-8") as handle:
             handle.write(json.dumps(payload, ensure_ascii=True) + "\n")
 
     @staticmethod
     def _now() -> str:
-        return datetime.now(timezone.utc).astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+        # time.strftime avoids datetime.astimezone(), which retains a small object per distinct second.
+        return time.strftime("%Y-%m-%d %H:%M:%S %Z")
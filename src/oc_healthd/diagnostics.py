@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import subprocess
+import tarfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from oc_healthd.alerts import root_cause
+from oc_healthd.checks import CheckResult, run_command
+
+Runner = Callable[[str, float], Any]
+Collector = Callable[[float], str]
+
+MAX_ITEM_BYTES = 1024 * 1024
+LOG_TAIL_BYTES = 256 * 1024
+PROC_FILES = ("cmdline", "status", "stat", "io", "limits")
+
+
+def _read(path: Path, limit: int = MAX_ITEM_BYTES) -> str:
+    try:
+        with path.open("rb") as handle:
+            data = handle.read(limit)
+    except OSError as error:
+        return f"<unreadable: {error}>"
+    return data.replace(b"\0", b" ").decode("utf-8", errors="replace").strip()
+
+
+def _pid_dirs(proc_root: Path) -> Iterable[Path]:
+    try:
+        entries = list(proc_root.iterdir())
+    except OSError:
+        return []
+    return [entry for entry in entries if entry.name.isdigit()]
+
+
+def find_processes(pattern: str, proc_root: Path = Path("/proc")) -> List[int]:
+    if not pattern:
+        return []
+    own_pid = os.getpid()
+    matched: List[int] = []
+    parents: Dict[int, List[int]] = {}
+    for entry in _pid_dirs(proc_root):
+        pid = int(entry.name)
+        try:
+            stat = (entry / "stat").read_text(encoding="utf-8", errors="replace")
+            cmdline = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode("utf-8", errors="replace")
+        except OSError:
+            continue
+        # Field 4 of /proc/<pid>/stat is the parent pid; comm may contain spaces, so split after ')'.
+        fields = stat.rpartition(")")[2].split()
+        if len(fields) >= 2 and fields[1].isdigit():
+            parents.setdefault(int(fields[1]), []).append(pid)
+        if pid != own_pid and pattern in cmdline:
+            matched.append(pid)
+
+    tree: List[int] = []
+    pending = sorted(matched)
+    while pending:
+        pid = pending.pop(0)
+        if pid in tree:
+            continue
+        tree.append(pid)
+        pending.extend(sorted(parents.get(pid, [])))
+    return tree
+
+
+def tail_lines(path: str, lines: int) -> str:
+    try:
+        with open(path, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            handle.seek(max(0, size - LOG_TAIL_BYTES))
+            data = handle.read()
+    except OSError as error:
+        return f"<unreadable: {error}>"
+    text = data.decode("utf-8", errors="replace")
+    return "\n".join(text.splitlines()[-lines:])
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", value).strip("-") or "unknown"
+
+
+class DiagnosticsCollector:
+    def __init__(
+        self,
+        output_dir: str,
+        budget_seconds: float,
+        commands: Optional[Dict[str, str]] = None,
+        gateway_pattern: str = "",
+        gateway_log: str = "",
+        log_tail_lines: int = 200,
+        keep: int = 20,
+        runner: Runner = run_command,
+        proc_root: str = "/proc",
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.budget_seconds = budget_seconds
+        self.commands = dict(commands or {})
+        self.gateway_pattern = gateway_pattern
+        self.gateway_log = gateway_log
+        self.log_tail_lines = log_tail_lines
+        self.keep = keep
+        self.runner = runner
+        self.proc_root = Path(proc_root)
+
+    def collectors(self) -> Dict[str, Collector]:
+        items: Dict[str, Collector] = {}
+        for name, command in self.commands.items():
+            if command:
+                items[f"{name}.txt"] = self._command_collector(command)
+        if self.gateway_pattern:
+            items["processes.txt"] = lambda _remaining: self._processes()
+            items["fds.txt"] = lambda _remaining: self._fds()
+        if self.gateway_log:
+            items["gateway.log"] = lambda _remaining: tail_lines(self.gateway_log, self.log_tail_lines)
+        return items
+
+    def _command_collector(self, command: str) -> Collector:
+        def collect(remaining: float) -> str:
+            try:
+                completed = self.runner(command, remaining)
+            except subprocess.TimeoutExpired:
+                return f"$ {command}\n<timeout after {remaining:.1f}s>"
+            except (OSError, ValueError) as error:
+                return f"$ {command}\n<failed: {error}>"
+            return (
+                f"$ {command}\nexit={completed.returncode}\n"
+                f"--- stdout ---\n{completed.stdout or ''}\n"
+                f"--- stderr ---\n{completed.stderr or ''}"
+            )
+
+        return collect
+
+    def _processes(self) -> str:
+        pids = find_processes(self.gateway_pattern, self.proc_root)
+        if not pids:
+            return f"no process matching {self.gateway_pattern!r}"
+        sections = []
+        for pid in pids:
+            base = self.proc_root / str(pid)
+            parts = [f"=== pid {pid} ==="]
+            for name in PROC_FILES:
+                parts.append(f"--- {name} ---\n{_read(base / name, 64 * 1024)}")
+            sections.append("\n".join(parts))
+        return "\n\n".join(sections)
+
+    def _fds(self) -> str:
+        sections = []
+        for pid in find_processes(self.gateway_pattern, self.proc_root):
+            fd_dir = self.proc_root / str(pid) / "fd"
+            try:
+                fds = sorted(fd_dir.iterdir(), key=lambda entry: int(entry.name))
+            except (OSError, ValueError) as error:
+                sections.append(f"=== pid {pid} ===\n<unreadable: {error}>")
+                continue
+            lines = [f"=== pid {pid} ({len(fds)} fds) ==="]
+            for entry in fds:
+                try:
+                    lines.append(f"{entry.name} -> {os.readlink(entry)}")
+                except OSError:
+                    continue
+            sections.append("\n".join(lines))
+        for table in ("tcp", "tcp6", "unix"):
+            sections.append(f"=== /proc/net/{table} ===\n{_read(self.proc_root / 'net' / table)}")
+        return "\n\n".join(sections)
+
+    def capture(self, results: List[CheckResult]) -> Dict[str, Any]:
+        started = time.monotonic()
+        # Leave a slice of the budget for compressing and writing the archive.
+        deadline = started + self.budget_seconds * 0.8
+        primary, _suppressed = root_cause(results)
+        layer = primary.layer if primary is not None else "unknown"
+        incident = f"incident-{time.strftime('%Y%m%d-%H%M%S')}-{_safe_name(layer)}"
+
+        outputs: Dict[str, str] = {}
+        threads: List[Tuple[str, threading.Thread]] = []
+        for name, collector in self.collectors().items():
+            # Daemon threads: a collector that overruns the budget is abandoned, not awaited.
+            thread = threading.Thread(
+                target=_collect,
+                args=(collector, max(0.1, deadline - time.monotonic()), outputs, name),
+                name=f"oc-healthd-diag-{name}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append((name, thread))
+
+        timed_out: List[str] = []
+        for name, thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive() or name not in outputs:
+                timed_out.append(name)
+
+        items = {name: outputs[name] for name, _thread in threads if name not in timed_out}
+        items["results.json"] = json.dumps([item.to_dict() for item in results], indent=2)
+        items["summary.json"] = json.dumps(
+            {
+                "incident": incident,
+                "cause": layer,
+                "collected": sorted(items),
+                "timed_out": timed_out,
+                "collect_ms": int((time.monotonic() - started) * 1000),
+            },
+            indent=2,
+        )
+        path = self._write(incident, items)
+        self._prune()
+        return {
+            "incident": incident,
+            "path": str(path),
+            "collected": sorted(items),
+            "timed_out": timed_out,
+            "duration_ms": int((time.monotonic() - started) * 1000),
+        }
+
+    def _write(self, incident: str, items: Dict[str, str]) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{incident}.tar.gz"
+        tmp_path = self.output_dir / f".{incident}.{os.getpid()}.tmp"
+        now = time.time()
+        with tarfile.open(tmp_path, "w:gz", compresslevel=6) as archive:
+            for name, text in items.items():
+                data = text.encode("utf-8", errors="replace")[:MAX_ITEM_BYTES]
+                info = tarfile.TarInfo(f"{incident}/{name}")
+                info.size = len(data)
+                info.mtime = int(now)
+                archive.addfile(info, io.BytesIO(data))
+        os.replace(tmp_path, path)
+        return path
+
+    def _prune(self) -> None:
+        if self.keep <= 0:
+            return
+        archives = sorted(self.output_dir.glob("incident-*.tar.gz"))
+        for stale in archives[: max(0, len(archives) - self.keep)]:
+            try:
+                stale.unlink()
+            except OSError:
+                continue
+
+
+def _collect(collector: Collector, remaining: float, outputs: Dict[str, str], name: str) -> None:
+    try:
+        outputs[name] = collector(remaining)
+    except Exception as error:  # pragma: no cover - defensive path
+        outputs[name] = f"<collector error: {error}>"
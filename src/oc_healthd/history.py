@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from oc_healthd.checks import CheckResult
+
+DAY_SECONDS = 86400
+# (table, bucket width in ms); raw samples live in `samples`.
+ROLLUPS = (("rollup_1m", 60_000), ("rollup_1h", 3_600_000))
+RESOLUTIONS = ("auto", "raw", "1m", "1h")
+
+Sample = Tuple[int, str, int, int, int]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER NOT NULL,
+    layer TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_layer_ts ON samples (layer, ts);
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+"""
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    layer TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    latency_sum INTEGER NOT NULL,
+    latency_min INTEGER NOT NULL,
+    latency_max INTEGER NOT NULL,
+    PRIMARY KEY (layer, bucket)
+) WITHOUT ROWID;
+"""
+
+UPSERT = """
+INSERT INTO {table} (layer, bucket, count, failures, latency_sum, latency_min, latency_max)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (layer, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    failures = failures + excluded.failures,
+    latency_sum = latency_sum + excluded.latency_sum,
+    latency_min = min(latency_min, excluded.latency_min),
+    latency_max = max(latency_max, excluded.latency_max)
+"""
+
+
+def parse_duration(value: str) -> float:
+    units = {"s": 1, "m": 60, "h": 3600, "d": DAY_SECONDS, "w": 7 * DAY_SECONDS, "y": 365 * DAY_SECONDS}
+    text = str(value).strip().lower()
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def rollup_rows(samples: Iterable[Sample], width_ms: int) -> List[Tuple[str, int, int, int, int, int, int]]:
+    # Pre-aggregate a batch in Python so each (layer, bucket) costs one upsert, not one per sample.
+    groups: Dict[Tuple[str, int], List[int]] = {}
+    for ts, layer, ok, _code, latency_ms in samples:
+        key = (layer, ts - ts % width_ms)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [1, 0 if ok else 1, latency_ms, latency_ms, latency_ms]
+            continue
+        group[0] += 1
+        group[1] += 0 if ok else 1
+        group[2] += latency_ms
+        group[3] = min(group[3], latency_ms)
+        group[4] = max(group[4], latency_ms)
+    return [(layer, bucket, *values) for (layer, bucket), values in groups.items()]
+
+
+def connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        connection = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True, timeout=5.0)
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=5.0)
+        # WAL lets control-socket queries read while the writer thread commits.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        for table, _width in ROLLUPS:
+            connection.executescript(ROLLUP_SCHEMA.format(table=table))
+    return connection
+
+
+class HistoryReader:
+    def __init__(
+        self,
+        path: str,
+        raw_retention_days: float = 7,
+        minute_retention_days: float = 90,
+        hour_retention_days: float = 730,
+    ) -> None:
+        self.path = path
+        self.retention_ms = {
+            "samples": int(raw_retention_days * DAY_SECONDS * 1000),
+            "rollup_1m": int(minute_retention_days * DAY_SECONDS * 1000),
+            "rollup_1h": int(hour_retention_days * DAY_SECONDS * 1000),
+        }
+
+    def pick_resolution(self, start_ms: int, end_ms: int, now_ms: Optional[int] = None) -> str:
+        # Coarsest table that still gives a useful number of points and covers the start of the range.
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        span = end_ms - start_ms
+        if span <= 6 * 3_600_000 and start_ms >= now_ms - self.retention_ms["samples"]:
+            return "raw"
+        if span <= 7 * DAY_SECONDS * 1000 and start_ms >= now_ms - self.retention_ms["rollup_1m"]:
+            return "1m"
+        return "1h"
+
+    def query(self, layer: str, start_ms: int, end_ms: int, resolution: str = "auto") -> Dict[str, Any]:
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution: {resolution}")
+        if resolution == "auto":
+            resolution = self.pick_resolution(start_ms, end_ms)
+        start_ms = _align_start(start_ms, resolution)
+        with closing(connect(self.path, readonly=True)) as connection:
+            if resolution == "raw":
+                rows = connection.execute(
+                    "SELECT ts, ok, code, latency_ms FROM samples "
+                    "WHERE layer = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                    (layer, start_ms, end_ms),
+                ).fetchall()
+            else:
+                rows = connection.execute(
+                    f"SELECT bucket, count, failures, latency_sum, latency_min, latency_max "
+                    f"FROM {_table(resolution)} WHERE layer = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                    (layer, start_ms, end_ms),
+                ).fetchall()
+        if resolution == "raw":
+            points = [
+                {"ts": ts, "ok": bool(ok), "code": code, "latency_ms": latency}
+                for ts, ok, code, latency in rows
+            ]
+            summary = _summarize((1, 1 - ok, latency, latency, latency) for _ts, ok, _code, latency in rows)
+        else:
+            points = [
+                {
+                    "ts": bucket,
+                    "count": count,
+                    "failures": failures,
+                    "latency_avg": round(total / count, 3),
+                    "latency_min": low,
+                    "latency_max": high,
+                }
+                for bucket, count, failures, total, low, high in rows
+            ]
+            summary = _summarize(row[1:] for row in rows)
+        return {"layer": layer, "resolution": resolution, "start": start_ms, "end": end_ms, **summary, "points": points}
+
+    def aggregate(self, layer: str, start_ms: int, end_ms: int, resolution: str = "auto") -> Dict[str, Any]:
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution: {resolution}")
+        if resolution == "auto":
+            resolution = self.pick_resolution(start_ms, end_ms)
+        start_ms = _align_start(start_ms, resolution)
+        # Summed in SQLite over the (layer, bucket) primary key, so a year of 1h buckets is one range scan.
+        with closing(connect(self.path, readonly=True)) as connection:
+            if resolution == "raw":
+                row = connection.execute(
+                    "SELECT count(*), count(*) - coalesce(sum(ok), 0), coalesce(sum(latency_ms), 0), "
+                    "min(latency_ms), max(latency_ms) FROM samples WHERE layer = ? AND ts >= ? AND ts < ?",
+                    (layer, start_ms, end_ms),
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    f"SELECT coalesce(sum(count), 0), coalesce(sum(failures), 0), coalesce(sum(latency_sum), 0), "
+                    f"min(latency_min), max(latency_max) FROM {_table(resolution)} "
+                    "WHERE layer = ? AND bucket >= ? AND bucket < ?",
+                    (layer, start_ms, end_ms),
+                ).fetchone()
+        return {"layer": layer, "resolution": resolution, "start": start_ms, "end": end_ms, **_summarize([row])}
+
+
+class HistoryStore(HistoryReader):
+    def __init__(
+        self,
+        path: str,
+        raw_retention_days: float = 7,
+        minute_retention_days: float = 90,
+        hour_retention_days: float = 730,
+        batch_size: int = 200,
+        flush_seconds: float = 5.0,
+        queue_size: int = 10000,
+        prune_interval_seconds: float = 3600.0,
+    ) -> None:
+        super().__init__(path, raw_retention_days, minute_retention_days, hour_retention_days)
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        # publish() only appends here; SQLite work happens on the writer thread, never in the cycle.
+        self._queue: Deque[Sample] = deque(maxlen=max(1, queue_size))
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._writing = False
+        self._last_prune = float("-inf")
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+        # Create the schema up front so queries work before the first flush.
+        connect(path).close()
+        self._thread = threading.Thread(target=self._run, name="oc-healthd-history", daemon=True)
+        self._thread.start()
+
+    def publish(
+        self,
+        results: List[CheckResult],
+        state: str,
+        transition: str,
+        counters: Dict[str, int],
+    ) -> None:
+        ts = int(time.time() * 1000)
+        with self._cond:
+            for result in results:
+                if result.inconclusive:
+                    continue
+                if len(self._queue) == self._queue.maxlen:
+                    self.dropped += 1
+                self._queue.append((ts, result.layer, 1 if result.ok else 0, result.code, result.latency_ms))
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._queue or self._writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+                self._cond.notify_all()
+        return True
+
+    def close(self, flush_timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(flush_timeout)
+
+    def _run(self) -> None:
+        connection = connect(self.path)
+        try:
+            while True:
+                with self._cond:
+                    if not self._stopped and len(self._queue) < self.batch_size:
+                        self._cond.wait(self.flush_seconds)
+                    batch = list(self._queue)
+                    self._queue.clear()
+                    self._writing = bool(batch)
+                    stopped = self._stopped
+                try:
+                    if batch:
+                        self.write(connection, batch)
+                    if time.monotonic() - self._last_prune >= self.prune_interval_seconds:
+                        self._last_prune = time.monotonic()
+                        self.prune(connection)
+                except sqlite3.Error:
+                    self.failures += 1
+                finally:
+                    with self._cond:
+                        self._writing = False
+                        self._cond.notify_all()
+                if stopped:
+                    return
+        finally:
+            connection.close()
+
+    def write(self, connection: sqlite3.Connection, batch: List[Sample]) -> None:
+        # One transaction per batch: raw rows plus pre-aggregated upserts into every rollup table.
+        with connection:
+            connection.executemany(
+                "INSERT INTO samples (ts, layer, ok, code, latency_ms) VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            for table, width_ms in ROLLUPS:
+                connection.executemany(UPSERT.format(table=table), rollup_rows(batch, width_ms))
+        self.written += len(batch)
+
+    def prune(self, connection: sqlite3.Connection, now_ms: Optional[int] = None) -> None:
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        with connection:
+            connection.execute("DELETE FROM samples WHERE ts < ?", (now_ms - self.retention_ms["samples"],))
+            for table, _width in ROLLUPS:
+                connection.execute(f"DELETE FROM {table} WHERE bucket < ?", (now_ms - self.retention_ms[table],))
+
+
+def _table(resolution: str) -> str:
+    return "rollup_1m" if resolution == "1m" else "rollup_1h"
+
+
+def _align_start(start_ms: int, resolution: str) -> int:
+    # Rollup ranges are bucket-aligned: floor the start so the partial bucket containing it is included.
+    if resolution == "raw":
+        return start_ms
+    width = dict(ROLLUPS)[_table(resolution)]
+    return start_ms - start_ms % width
+
+
+def _summarize(rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    count = failures = total = 0
+    low: Optional[int] = None
+    high: Optional[int] = None
+    for row_count, row_failures, row_total, row_low, row_high in rows:
+        if not row_count:
+            continue
+        count += row_count
+        failures += row_failures
+        total += row_total
+        low = row_low if low is None else min(low, row_low)
+        high = row_high if high is None else max(high, row_high)
+    return {
+        "count": count,
+        "failures": failures,
+        "availability": round(1 - failures / count, 6) if count else None,
+        "latency_avg": round(total / count, 3) if count else None,
+        "latency_min": low,
+        "latency_max": high,
+    }
+
+
+def query_request(reader: HistoryReader, request: Dict[str, Any]) -> Dict[str, Any]:
+    now_ms = int(time.time() * 1000)
+    since_ms = int(parse_duration(str(request.get("since", "1h"))) * 1000)
+    start_ms = int(request.get("start", now_ms - since_ms))
+    # Ranges are half-open; make sure a sample written this millisecond is still included.
+    end_ms = int(request.get("end", now_ms + 1))
+    layer = str(request.get("layer", "openclaw_health"))
+    resolution = str(request.get("resolution", "auto"))
+    if request.get("summary"):
+        return reader.aggregate(layer, start_ms, end_ms, resolution)
+    return reader.query(layer, start_ms, end_ms, resolution)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query oc_healthd check history")
+    parser.add_argument("--db", default="logs/history.sqlite3", help="History database (default: logs/history.sqlite3)")
+    parser.add_argument("--layer", default="openclaw_health")
+    parser.add_argument("--since", default="1h", help="Look-back window such as 30m, 24h, 30d, 1y")
+    parser.add_argument("--resolution", choices=RESOLUTIONS, default="auto")
+    parser.add_argument("--summary", action="store_true", help="Only print the aggregate over the window")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    request = {"layer": args.layer, "since": args.since, "resolution": args.resolution, "summary": args.summary}
+    try:
+        response = query_request(HistoryReader(args.db), request)
+    except (sqlite3.Error, ValueError) as error:
+        print(f"history query failed: {args.db}: {error}", file=sys.stderr)
+        return 2
+    print(json.dumps(response, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
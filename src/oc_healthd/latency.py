@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from oc_healthd.checks import CheckResult
+
+
+# Constant-memory streaming quantile (Jain & Chlamtac P-square): five markers, no sample buffer.
+class P2Quantile:
+    __slots__ = ("p", "count", "heights", "positions", "desired")
+
+    def __init__(self, p: float) -> None:
+        self.p = p
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(float(value))
+            q.sort()
+            return
+
+        if value < q[0]:
+            q[0] = float(value)
+            cell = 0
+        elif value >= q[4]:
+            q[4] = float(value)
+            cell = 3
+        else:
+            cell = 0
+            while cell < 3 and value >= q[cell + 1]:
+                cell += 1
+        n = self.positions
+        for index in range(cell + 1, 5):
+            n[index] += 1
+        increments = (0.0, self.p / 2, self.p, (1 + self.p) / 2, 1.0)
+        for index in range(5):
+            self.desired[index] += increments[index]
+
+        for index in (1, 2, 3):
+            delta = self.desired[index] - n[index]
+            if (delta >= 1 and n[index + 1] - n[index] > 1) or (delta <= -1 and n[index - 1] - n[index] < -1):
+                step = 1 if delta > 0 else -1
+                candidate = self._parabolic(index, step)
+                if not q[index - 1] < candidate < q[index + 1]:
+                    candidate = q[index] + step * (q[index + step] - q[index]) / (n[index + step] - n[index])
+                q[index] = candidate
+                n[index] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            rank = max(1, math.ceil(self.p * len(self.heights)))
+            return self.heights[rank - 1]
+        return self.heights[2]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "p": self.p,
+            "count": self.count,
+            "heights": list(self.heights),
+            "positions": list(self.positions),
+            "desired": list(self.desired),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "P2Quantile":
+        estimator = cls(float(data.get("p", 0.95)))
+        estimator.count = int(data.get("count", 0))
+        estimator.heights = [float(item) for item in data.get("heights", [])]
+        if len(data.get("positions", [])) == 5 and len(data.get("desired", [])) == 5:
+            estimator.positions = [float(item) for item in data["positions"]]
+            estimator.desired = [float(item) for item in data["desired"]]
+        return estimator
+
+
+class LayerLatency:
+    __slots__ = ("window", "samples", "last_p95", "baseline", "windows", "degraded", "reason")
+
+    def __init__(self, quantile: float) -> None:
+        self.window = P2Quantile(quantile)
+        self.samples = 0
+        self.last_p95 = 0.0
+        self.baseline: Optional[float] = None
+        self.windows = 0
+        self.degraded = False
+        self.reason = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.window.to_dict(),
+            "samples": self.samples,
+            "last_p95": self.last_p95,
+            "baseline": self.baseline,
+            "windows": self.windows,
+            "degraded": self.degraded,
+            "reason": self.reason,
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self.window = P2Quantile.from_dict(dict(data.get("window", {"p": self.window.p})))
+        self.samples = int(data.get("samples", 0))
+        self.last_p95 = float(data.get("last_p95", 0.0))
+        baseline = data.get("baseline")
+        self.baseline = None if baseline is None else float(baseline)
+        self.windows = int(data.get("windows", 0))
+        self.degraded = bool(data.get("degraded", False))
+        self.reason = str(data.get("reason", ""))
+
+
+class LatencyMonitor:
+    def __init__(
+        self,
+        slo_ms: float = 0.0,
+        layer_slo_ms: Optional[Dict[str, float]] = None,
+        window: int = 10,
+        drift_factor: float = 2.0,
+        ewma_alpha: float = 0.2,
+        min_windows: int = 3,
+        quantile: float = 0.95,
+    ) -> None:
+        self.slo_ms = slo_ms
+        self.layer_slo_ms = dict(layer_slo_ms or {})
+        self.window = max(1, window)
+        self.drift_factor = drift_factor
+        self.ewma_alpha = ewma_alpha
+        self.min_windows = min_windows
+        self.quantile = quantile
+        self.layers: Dict[str, LayerLatency] = {}
+        self.state = "OK"
+
+    def observe(self, results: Iterable[CheckResult]) -> Optional[str]:
+        for result in results:
+            # Failures are the state machine's business; their latency is usually a timeout.
+            if not result.ok:
+                continue
+            layer = self.layers.get(result.layer)
+            if layer is None:
+                layer = LayerLatency(self.quantile)
+                self.layers[result.layer] = layer
+            layer.window.add(result.latency_ms)
+            layer.samples += 1
+            if layer.samples >= self.window:
+                self._close_window(result.layer, layer)
+
+        now_degraded = any(layer.degraded for layer in self.layers.values())
+        if self.state == "OK" and now_degraded:
+            self.state = "DEGRADED"
+            return "entered_degraded"
+        if self.state == "DEGRADED" and not now_degraded:
+            self.state = "OK"
+            return "degraded_cleared"
+        return None
+
+    def _close_window(self, name: str, layer: LayerLatency) -> None:
+        p95 = layer.window.value()
+        slo = self.layer_slo_ms.get(name, self.slo_ms)
+        warmed = layer.baseline is not None and layer.windows >= self.min_windows
+        if slo > 0 and p95 > slo:
+            layer.degraded = True
+            layer.reason = f"p95 {p95:.0f}ms > SLO {slo:.0f}ms"
+        elif warmed and p95 > self.drift_factor * layer.baseline:
+            layer.degraded = True
+            layer.reason = f"p95 {p95:.0f}ms > {self.drift_factor:g}x baseline {layer.baseline:.0f}ms"
+        else:
+            layer.degraded = False
+            layer.reason = ""
+            # The baseline only learns from healthy windows so a slow creep cannot become normal.
+            if layer.baseline is None:
+                layer.baseline = p95
+            else:
+                layer.baseline = self.ewma_alpha * p95 + (1 - self.ewma_alpha) * layer.baseline
+            layer.windows += 1
+        layer.last_p95 = p95
+        layer.window = P2Quantile(self.quantile)
+        layer.samples = 0
+
+    def degraded_layers(self) -> List[Tuple[str, str]]:
+        return [(name, layer.reason) for name, layer in self.layers.items() if layer.degraded]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "layers": {name: layer.to_dict() for name, layer in self.layers.items()},
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self.state = str(data.get("state", "OK"))
+        self.layers = {}
+        for name, payload in dict(data.get("layers", {})).items():
+            layer = LayerLatency(self.quantile)
+            layer.load(dict(payload))
+            self.layers[str(name)] = layer
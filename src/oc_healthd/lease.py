@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseElector:
+    def __init__(
+        self,
+        path: str,
+        node_id: str,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+        renew_interval_seconds: float = 0.0,
+        max_clock_skew_seconds: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.node_id = node_id
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.renew_interval_seconds = renew_interval_seconds
+        self.max_clock_skew_seconds = max_clock_skew_seconds
+        self.epoch = 0
+        self._valid_until = 0.0
+
+    @property
+    def margin_seconds(self) -> float:
+        # Stop believing we lead well before a standby may take over: a holder that stalls right after
+        # renewing, or whose clock runs behind the standby's, must not act past the written expiry.
+        return min(self.ttl_seconds / 2, max(self.renew_interval_seconds, self.max_clock_skew_seconds))
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def read(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, payload: Dict[str, Any]) -> None:
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def acquire_or_renew(self) -> bool:
+        started = time.monotonic()
+        with self._locked():
+            lease = self.read()
+            now = self.clock()
+            holder = str(lease.get("holder", ""))
+            expires_at = float(lease.get("expires_at", 0.0))
+            epoch = int(lease.get("epoch", 0))
+            if holder and holder != self.node_id and expires_at > now:
+                self._valid_until = 0.0
+                return False
+            if holder != self.node_id:
+                epoch += 1
+            self._write(
+                {
+                    "holder": self.node_id,
+                    "epoch": epoch,
+                    "renewed_at": now,
+                    "expires_at": now + self.ttl_seconds,
+                }
+            )
+        self.epoch = epoch
+        # Local validity uses the monotonic clock so wall-clock jumps cannot extend leadership, and counts
+        # from before the lease was read so time spent waiting on the lock is not granted twice.
+        self._valid_until = started + self.ttl_seconds - self.margin_seconds
+        return True
+
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def release(self) -> None:
+        with self._locked():
+            lease = self.read()
+            if lease.get("holder") == self.node_id:
+                lease["expires_at"] = 0.0
+                self._write(lease)
+        self._valid_until = 0.0
@@ -1,70 +1,44 @@
 from __future__ import annotations
 
 import argparse
-import time
-from typing import Callable, List
+import sys
+import tempfile
 
-from oc_healthd.checks import (
-    CheckResult,
-    check_openclaw_health,
-    check_openclaw_status,
-    check_system_probe,
-)
-from oc_healthd.config import AppConfig, load_config
-from oc_healthd.daemon import HealthDaemon
-from oc_healthd.notifier import TelegramNotifier
-from oc_healthd.restart import CommandRestarter
-from oc_healthd.state_store import StateStore
+from oc_healthd.runtime import Runtime, build_checks  # noqa: F401 - re-exported
 
 
-def build_checks(config: AppConfig) -> List[Callable[[], CheckResult]]:
-    return [
-        lambda: check_openclaw_health(
-            config.openclaw.health_cmd,
-            config.monitor.timeout_seconds,
-        ),
-        lambda: check_openclaw_status(
-            config.openclaw.status_cmd,
-            config.monitor.timeout_seconds,
-        ),
-        lambda: check_system_probe(
-            dns_host=config.system.dns_host,
-            tcp_host=config.system.tcp_host,
-            tcp_port=config.system.tcp_port,
-            timeout_seconds=config.monitor.timeout_seconds,
-        ),
-    ]
+def run(
+    config_path: str,
+    once: bool = False,
+    profile_cycles: int = 0,
+    profile_output: str = "logs/profile.txt",
+) -> int:
+    runtime = Runtime(config_path, metrics=not once)
+    daemon = runtime.daemon
+    if profile_cycles > 0:
+        from oc_healthd.metrics import HealthMetrics
+        from oc_healthd.profiling import dry_run_daemon, profile_cycles as run_profile
 
+        if daemon.metrics is None:
+            daemon.metrics = HealthMetrics()
+        with tempfile.TemporaryDirectory(prefix="oc-healthd-profile-") as scratch:
+            report = run_profile(dry_run_daemon(daemon, scratch), profile_cycles, profile_output)
+        print(report, end="")
+        return 0
 
-def run(config_path: str, once: bool = False) -> int:
-    config = load_config(config_path)
-    notifier = TelegramNotifier(
-        bot_token=config.telegram.bot_token,
-        chat_id=config.telegram.chat_id,
-        timeout_seconds=config.monitor.timeout_seconds,
-    )
-    restarter = CommandRestarter(
-        command=config.openclaw.restart_cmd,
-        timeout_seconds=config.monitor.timeout_seconds,
-    )
-    daemon = HealthDaemon(
-        threshold=config.monitor.failure_threshold,
-        checks=build_checks(config),
-        notifier=notifier,
-        restarter=restarter,
-        state_store=StateStore(config.paths.state_file),
-        log_file=config.paths.log_file,
-    )
     if once:
-        daemon.run_cycle()
+        # Same lease gate as the scheduler: with [ha] enabled a bare run_cycle() would always be fenced.
+        transition = runtime.run_check()
+        daemon.drain_notifications()
+        if runtime.elector is not None and daemon.role == "leader":
+            # Hand the lease back so a long-running daemon on another node can take over right away.
+            runtime.elector.release()
+        if transition == "skipped":
+            print("standby: another node holds the lease, cycle skipped", file=sys.stderr)
         return 0
 
-    try:
-        while True:
-            daemon.run_cycle()
-            time.sleep(config.monitor.interval_seconds)
-    except KeyboardInterrupt:
-        return 0
+    runtime.install_signal_handlers()
+    return runtime.serve_forever()
 
 
 def parse_args() -> argparse.Namespace:
@@ -79,12 +53,29 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run exactly one cycle and exit",
     )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run N cycles under cProfile/tracemalloc, write a report and exit",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="logs/profile.txt",
+        help="Path of the profile report (default: logs/profile.txt)",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    return run(config_path=args.config, once=bool(args.once))
+    return run(
+        config_path=args.config,
+        once=bool(args.once),
+        profile_cycles=int(args.profile),
+        profile_output=args.profile_output,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from oc_healthd.checks import CheckResult
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+    from oc_healthd.latency import LatencyMonitor
+
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+STAGE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STATES = ("HEALTHY", "UNHEALTHY")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    if not parts:
+        return ""
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(value) for value in labels)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:  # pragma: no cover - overridden
+        return []
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        # A single dict store is atomic under the GIL, so gauges skip the lock.
+        self._values[key] = float(value)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        items = sorted(dict(self._values).items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = SECONDS_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # Per label set, one flat double array: [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, array] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = array("d", bytes(8 * (len(self.buckets) + 2)))
+                self._series[key] = series
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return 0
+        return int(sum(series[:-1]))
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, series.tolist()) for key, series in self._series.items())
+        lines: List[str] = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += bucket_count
+                le = 'le="' + _format_number(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{_format_number(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_number(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = SECONDS_BUCKETS,
+    ) -> Histogram:
+        return self._register(  # type: ignore[return-value]
+            Histogram(name, help_text, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class HealthMetrics:
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.check_latency = r.histogram(
+            "oc_healthd_check_latency_ms",
+            "Check latency in milliseconds per layer.",
+            ("layer",),
+            LATENCY_MS_BUCKETS,
+        )
+        self.check_failures = r.counter(
+            "oc_healthd_check_failures_total",
+            "Failed check results per layer.",
+            ("layer",),
+        )
+        self.consecutive_failures = r.gauge(
+            "oc_healthd_consecutive_failures",
+            "Current consecutive failure counter per layer.",
+            ("layer",),
+        )
+        self.state = r.gauge(
+            "oc_healthd_state",
+            "Current monitor state (1 for the active state).",
+            ("state",),
+        )
+        self.transitions = r.counter(
+            "oc_healthd_transitions_total",
+            "State machine transitions.",
+            ("transition",),
+        )
+        self.cycle_duration = r.histogram(
+            "oc_healthd_cycle_duration_seconds",
+            "Wall time spent in one monitor cycle.",
+        )
+        self.stage_duration = r.histogram(
+            "oc_healthd_stage_duration_seconds",
+            "Wall time spent in each run_cycle stage.",
+            ("stage",),
+            STAGE_BUCKETS,
+        )
+        self.cycles = r.counter("oc_healthd_cycles_total", "Completed monitor cycles.")
+        self.schedule_lag = r.gauge(
+            "oc_healthd_schedule_lag_seconds",
+            "Delay between the scheduled and actual start of the last cycle.",
+        )
+        self.leader = r.gauge(
+            "oc_healthd_leader",
+            "1 when this instance holds the HA lease (or runs standalone).",
+        )
+        self.notifications = r.counter(
+            "oc_healthd_notifications_total",
+            "Notification attempts per channel by outcome.",
+            ("channel", "outcome"),
+        )
+        self.latency_p95 = r.gauge(
+            "oc_healthd_latency_p95_ms",
+            "Streaming p95 check latency of the last completed window per layer.",
+            ("layer",),
+        )
+        self.latency_baseline = r.gauge(
+            "oc_healthd_latency_baseline_ms",
+            "EWMA baseline of healthy-window p95 latency per layer.",
+            ("layer",),
+        )
+        self.degraded = r.gauge(
+            "oc_healthd_degraded",
+            "1 while any layer breaches its latency SLO or drifts above baseline.",
+        )
+        self.inconclusive = r.counter(
+            "oc_healthd_check_inconclusive_total",
+            "Check results deferred or timed out under host pressure, per layer.",
+            ("layer",),
+        )
+        self.restarts = r.counter(
+            "oc_healthd_restarts_total",
+            "Auto-restart attempts by outcome.",
+            ("outcome",),
+        )
+
+    def observe_results(self, results: Iterable[CheckResult], counters: Dict[str, int]) -> None:
+        for result in results:
+            if result.inconclusive:
+                self.inconclusive.inc(result.layer)
+                continue
+            self.check_latency.observe(result.latency_ms, result.layer)
+            if not result.ok:
+                self.check_failures.inc(result.layer)
+        for layer, count in counters.items():
+            self.consecutive_failures.set(count, layer)
+
+    def observe_state(self, current_state: str, transition: Optional[str]) -> None:
+        for state in STATES:
+            self.state.set(1 if state == current_state else 0, state)
+        if transition:
+            self.transitions.inc(transition)
+
+    def observe_latency(self, monitor: "LatencyMonitor", transition: Optional[str]) -> None:
+        for layer, stats in monitor.layers.items():
+            self.latency_p95.set(stats.last_p95, layer)
+            if stats.baseline is not None:
+                self.latency_baseline.set(stats.baseline, layer)
+        self.degraded.set(1 if monitor.state == "DEGRADED" else 0)
+        if transition:
+            self.transitions.inc(transition)
+
+    def observe_stages(self, spans_ns: Dict[str, int]) -> None:
+        for stage, elapsed_ns in spans_ns.items():
+            self.stage_duration.observe(elapsed_ns / 1_000_000_000, stage)
+
+    def observe_cycle(self, seconds: float) -> None:
+        self.cycles.inc()
+        self.cycle_duration.observe(seconds)
+
+    def observe_notification(self, channel: str, status: str) -> None:
+        outcome = status if status in {"sent", "failed", "timeout"} else "error"
+        self.notifications.inc(channel, outcome)
+
+    def observe_restart(self, ok: bool) -> None:
+        self.restarts.inc("ok" if ok else "failed")
+
+
+def _make_handler(registry: MetricsRegistry) -> type:
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] not in {"/metrics", "/"}:
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            return
+
+    return MetricsHandler
+
+
+def start_metrics_server(registry: MetricsRegistry, host: str, port: int) -> ThreadingHTTPServer:
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _make_handler(registry))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="oc-healthd-metrics", daemon=True)
+    thread.start()
+    return server
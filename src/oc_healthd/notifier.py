@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import json
+import os
+import shlex
+import subprocess
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from oc_healthd.daemon import Notifier
 
 
 class TelegramNotifier:
@@ -32,3 +43,184 @@ class TelegramNotifier:
         except (urllib.error.URLError, ValueError, OSError):
             return False
 
+
+class WebhookNotifier:
+    def __init__(self, url: str, timeout_seconds: float = 5) -> None:
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, message: str) -> bool:
+        if not self.url:
+            return False
+        body = json.dumps({"text": message}, ensure_ascii=True).encode("utf-8")
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+                return 200 <= response.status < 300
+        except (urllib.error.URLError, ValueError, OSError):
+            return False
+
+
+class FileNotifier:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def send(self, message: str) -> bool:
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "message": message,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=True) + "\n")
+        except OSError:
+            return False
+        return True
+
+
+class SyslogNotifier:
+    def __init__(self, ident: str = "oc_healthd") -> None:
+        self.ident = ident
+
+    def send(self, message: str) -> bool:
+        try:
+            import syslog
+        except ImportError:  # pragma: no cover - non-POSIX platforms
+            return False
+        syslog.openlog(self.ident, 0, syslog.LOG_DAEMON)
+        for line in message.splitlines() or [""]:
+            syslog.syslog(syslog.LOG_WARNING, line)
+        return True
+
+
+class CommandNotifier:
+    def __init__(self, command: str, timeout_seconds: float = 10) -> None:
+        self.command = command
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, message: str) -> bool:
+        if not self.command:
+            return False
+        try:
+            completed = subprocess.run(
+                shlex.split(self.command),
+                input=message,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout_seconds,
+                check=False,
+                env={**os.environ, "OC_HEALTHD_MESSAGE": message},
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+        return completed.returncode == 0
+
+
+DeliveryCallback = Callable[[str, Dict[str, Any]], None]
+# How long drain() waits for a result callback that is already running (it only logs and counts).
+CALLBACK_GRACE_SECONDS = 5.0
+
+
+class NotificationDispatcher:
+    def __init__(self, channels: Optional[Dict[str, Tuple[Notifier, float]]] = None) -> None:
+        self.channels: Dict[str, Tuple[Notifier, float]] = dict(channels or {})
+        self._lock = threading.Lock()
+        self._pending: List[_Delivery] = []
+
+    def add(self, name: str, notifier: Notifier, deadline_seconds: float) -> None:
+        self.channels[name] = (notifier, deadline_seconds)
+
+    def send(self, message: str) -> bool:
+        return any(item["ok"] for item in self.deliver(message).values())
+
+    def deliver(self, message: str) -> Dict[str, Dict[str, Any]]:
+        # Blocking variant for callers with no check cycle to protect (fleet aggregator, CLI).
+        deliveries: Dict[str, Dict[str, Any]] = {}
+        self.dispatch(message, deliveries.__setitem__)
+        self.drain()
+        return deliveries
+
+    def dispatch(self, message: str, on_result: Optional[DeliveryCallback] = None) -> Dict[str, Dict[str, Any]]:
+        # Fire-and-forget: returns at once; each channel reports through on_result when it finishes or
+        # blows its deadline. Daemon threads, so a hung channel is abandoned, never awaited.
+        started = time.monotonic()
+        deliveries = []
+        for name, (notifier, deadline) in self.channels.items():
+            delivery = _Delivery(name, started, deadline, on_result)
+            delivery.start(notifier, message)
+            deliveries.append(delivery)
+        with self._lock:
+            self._pending = [item for item in self._pending if not item.reported] + deliveries
+        # No verdict yet: the real per-channel outcome arrives later through on_result.
+        return {item.name: {"status": "dispatched"} for item in deliveries}
+
+    def drain(self) -> None:
+        # Wait for in-flight deliveries up to their deadlines, e.g. before a `--once` run exits.
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for delivery in pending:
+            delivery.thread.join(max(0.0, delivery.deadline_at - time.monotonic()))
+            if delivery.thread.is_alive():
+                delivery.expire()
+            # The timer thread may have claimed the report and still be inside on_result.
+            delivery.finished.wait(CALLBACK_GRACE_SECONDS)
+
+
+class _Delivery:
+    def __init__(self, name: str, started: float, deadline: float, on_result: Optional[DeliveryCallback]) -> None:
+        self.name = name
+        self.started = started
+        self.deadline_at = started + deadline
+        self.on_result = on_result
+        self.reported = False
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self.thread: threading.Thread
+        self.timer = threading.Timer(max(0.0, deadline), self.expire)
+        self.timer.daemon = True
+
+    def start(self, notifier: Notifier, message: str) -> None:
+        self.thread = threading.Thread(
+            target=self.run,
+            args=(notifier, message),
+            name=f"oc-healthd-notify-{self.name}",
+            daemon=True,
+        )
+        self.thread.start()
+        self.timer.start()
+
+    def run(self, notifier: Notifier, message: str) -> None:
+        try:
+            ok = bool(notifier.send(message))
+            status = "sent" if ok else "failed"
+        except Exception as error:  # pragma: no cover - defensive path
+            ok = False
+            status = f"error: {error}"
+        self._report(ok, status)
+
+    def expire(self) -> None:
+        self._report(False, "timeout")
+
+    def _report(self, ok: bool, status: str) -> None:
+        # First report wins: a channel that answers after its deadline stays a timeout.
+        with self._lock:
+            if self.reported:
+                return
+            self.reported = True
+        self.timer.cancel()
+        try:
+            if self.on_result is not None:
+                self.on_result(
+                    self.name,
+                    {"ok": ok, "status": status, "latency_ms": int((time.monotonic() - self.started) * 1000)},
+                )
+        except Exception:  # pragma: no cover - reporting must never kill the delivery thread
+            pass
+        finally:
+            self.finished.set()
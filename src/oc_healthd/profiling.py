@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from oc_healthd.daemon import HealthDaemon
+from oc_healthd.state_store import StateStore
+
+
+class _DryRunNotifier:
+    def send(self, _message: str) -> bool:
+        return True
+
+
+class _DryRunRestarter:
+    def restart(self) -> tuple[bool, str]:
+        return False, "dry run"
+
+
+def dry_run_daemon(daemon: HealthDaemon, scratch_dir: str) -> HealthDaemon:
+    # Same probes and cycle pipeline, but no alerts, no restarts, no incident captures, and state/log in a
+    # scratch directory: profiling on a production host must never touch the daemon that is already running.
+    scratch = Path(scratch_dir)
+    return HealthDaemon(
+        threshold=daemon.machine.threshold,
+        checks=daemon.checks,
+        notifier=_DryRunNotifier(),
+        restarter=_DryRunRestarter(),
+        state_store=StateStore(str(scratch / "state.json")),
+        log_file=str(scratch / "healthd.jsonl"),
+        metrics=daemon.metrics,
+        coalescer=daemon.coalescer,
+        latency=daemon.latency,
+    )
+
+
+def profile_cycles(
+    daemon: HealthDaemon,
+    cycles: int,
+    report_path: str,
+    top: int = 25,
+) -> str:
+    stage_totals: Dict[str, float] = {}
+    cycle_ms: List[float] = []
+    profiler = cProfile.Profile()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(max(1, cycles)):
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            daemon.run_cycle()
+        finally:
+            profiler.disable()
+        cycle_ms.append((time.perf_counter() - started) * 1000)
+        for stage, value in daemon.last_spans_ms.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + value
+    after = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(cycle_ms)
+    ordered = sorted(cycle_ms)
+    lines = [
+        "# oc_healthd profile report",
+        f"cycles: {count}",
+        f"cycle_ms: mean={sum(cycle_ms) / count:.3f} "
+        f"p50={ordered[count // 2]:.3f} max={ordered[-1]:.3f}",
+        "",
+        "## stages (mean ms per cycle)",
+    ]
+    for stage, total in sorted(stage_totals.items(), key=lambda item: -item[1]):
+        lines.append(f"{stage:<28} {total / count:10.3f}")
+
+    lines.extend(
+        [
+            "",
+            "## memory (tracemalloc)",
+            f"current_bytes: {current}",
+            f"peak_bytes: {peak}",
+            "top allocation growth:",
+        ]
+    )
+    for stat in after.compare_to(before, "lineno")[:10]:
+        lines.append(f"  {stat}")
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(top)
+    lines.extend(["", "## cProfile (cumulative)", stream.getvalue().rstrip()])
+
+    report = "\n".join(lines) + "\n"
+    target = Path(report_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(report, encoding="utf-8")
+    return report
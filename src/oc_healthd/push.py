@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from oc_healthd.checks import CheckResult
+
+WIRE_VERSION = 1
+MAX_DATAGRAM_BYTES = 60_000
+MAX_REASON_CHARS = 120
+
+
+def encode_record(
+    seq: int,
+    results: List[CheckResult],
+    state: str,
+    transition: str,
+    ts: Optional[float] = None,
+) -> Dict[str, Any]:
+    return {
+        "s": seq,
+        "t": round(time.time() if ts is None else ts, 3),
+        "st": state,
+        "tr": transition,
+        # A sixth element is only sent for inconclusive results, keeping older aggregators compatible.
+        "r": [
+            [r.layer, 1 if r.ok else 0, r.code, r.latency_ms, r.reason[:MAX_REASON_CHARS]]
+            + ([1] if r.inconclusive else [])
+            for r in results
+        ],
+    }
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_results(record: Dict[str, Any]) -> List[CheckResult]:
+    # Wire input is untrusted: raise ValueError on any malformed item instead of guessing.
+    items = record.get("r", [])
+    if not isinstance(items, list):
+        raise ValueError("results must be a list")
+    results = []
+    for item in items:
+        if not isinstance(item, list) or len(item) < 5:
+            raise ValueError("result must be a list of at least 5 items")
+        layer, ok, code, latency_ms, reason = item[:5]
+        if not isinstance(layer, str) or not isinstance(reason, str) or ok not in (0, 1):
+            raise ValueError("malformed result")
+        if not _is_int(code) or not _is_int(latency_ms):
+            raise ValueError("malformed result")
+        results.append(
+            CheckResult(
+                layer=layer,
+                ok=bool(ok),
+                reason=reason[:MAX_REASON_CHARS],
+                code=code,
+                latency_ms=latency_ms,
+                raw_excerpt="",
+                inconclusive=len(item) > 5 and bool(item[5]),
+            )
+        )
+    return results
+
+
+def encode_batch(node_id: str, records: List[Dict[str, Any]]) -> bytes:
+    payload = {"v": WIRE_VERSION, "n": node_id, "b": records}
+    return json.dumps(payload, ensure_ascii=True, separators=(",", ":")).encode("utf-8")
+
+
+def parse_target(target: str, default_port: int) -> Tuple[str, int]:
+    host, _, port = target.rpartition(":")
+    if not host:
+        return target, default_port
+    return host.strip("[]"), int(port)
+
+
+class ResultPusher:
+    def __init__(
+        self,
+        node_id: str,
+        target: str,
+        transport: str = "udp",
+        batch_size: int = 50,
+        flush_seconds: float = 5.0,
+        queue_size: int = 1000,
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        if transport not in {"udp", "http"}:
+            raise ValueError(f"unsupported push transport: {transport}")
+        self.node_id = node_id
+        self.target = target
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.timeout_seconds = timeout_seconds
+        # Bounded queue: when the aggregator falls behind we shed the oldest records.
+        self._queue: Deque[Dict[str, Any]] = deque(maxlen=max(1, queue_size))
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._stopped = False
+        self._backoff = 0.0
+        self.sent_batches = 0
+        self.sent_records = 0
+        self.dropped = 0
+        self.failures = 0
+        self._sock: Optional[socket.socket] = None
+        self._addr: Optional[Tuple[str, int]] = None
+        self._thread = threading.Thread(target=self._run, name="oc-healthd-push", daemon=True)
+        self._thread.start()
+
+    def publish(
+        self,
+        results: List[CheckResult],
+        state: str,
+        transition: str,
+        counters: Dict[str, int],
+    ) -> None:
+        with self._cond:
+            self._seq += 1
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(encode_record(self._seq, results, state, transition))
+            if len(self._queue) >= self.batch_size or transition != "steady":
+                self._cond.notify()
+
+    def close(self, flush_timeout: float = 2.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(flush_timeout)
+        if self._sock is not None:
+            self._sock.close()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                backlog = len(self._queue) >= self.batch_size
+                if not self._stopped and (self._backoff or not backlog):
+                    self._cond.wait(self.flush_seconds + self._backoff)
+                batch = self._take_batch()
+                stopped = self._stopped
+            sent = False
+            if batch:
+                sent = self._send(batch)
+                if sent:
+                    self._backoff = 0.0
+                else:
+                    self.failures += 1
+                    self._backoff = min(60.0, max(1.0, self._backoff * 2))
+                    if not stopped:
+                        self._requeue(batch)
+            if stopped and not sent:
+                return
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        with self._cond:
+            for record in reversed(batch):
+                if len(self._queue) == self._queue.maxlen:
+                    self.dropped += 1
+                    continue
+                self._queue.appendleft(record)
+
+    def _send(self, batch: List[Dict[str, Any]]) -> bool:
+        try:
+            if self.transport == "udp":
+                self._send_udp(batch)
+            else:
+                self._send_http(batch)
+        except (OSError, ValueError, urllib.error.URLError):
+            return False
+        self.sent_batches += 1
+        self.sent_records += len(batch)
+        return True
+
+    def _send_udp(self, batch: List[Dict[str, Any]]) -> None:
+        if self._sock is None:
+            self._addr = parse_target(self.target, 9471)
+            family = socket.AF_INET6 if ":" in self._addr[0] else socket.AF_INET
+            self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        body = encode_batch(self.node_id, batch)
+        if len(body) > MAX_DATAGRAM_BYTES and len(batch) > 1:
+            middle = len(batch) // 2
+            self._send_udp(batch[:middle])
+            self._send_udp(batch[middle:])
+            return
+        self._sock.sendto(body, self._addr)
+
+    def _send_http(self, batch: List[Dict[str, Any]]) -> None:
+        request = urllib.request.Request(
+            self.target,
+            data=encode_batch(self.node_id, batch),
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+            if not 200 <= response.status < 300:
+                raise OSError(f"aggregator returned {response.status}")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import socket
+import time
+from typing import Any, Callable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from oc_healthd.checks import CheckResult, _excerpt, _ms
+
+LAYER = "gateway_roundtrip"
+MAX_RESPONSE_BYTES = 64 * 1024
+PROBE_HEADER = "X-OC-Healthd-Probe"
+
+ConnectionFactory = Callable[[str, Optional[int], float], Any]
+
+
+def _http_connection(scheme: str) -> ConnectionFactory:
+    # http.client is only imported once the probe is actually enabled.
+    import http.client
+
+    if scheme == "https":
+        return lambda host, port, timeout: http.client.HTTPSConnection(host, port, timeout=timeout)
+    return lambda host, port, timeout: http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+class RoundTripProbe:
+    def __init__(
+        self,
+        url: str,
+        timeout_seconds: float,
+        token: str = "",
+        expect_echo: bool = True,
+        connection_factory: Optional[ConnectionFactory] = None,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"unsupported roundtrip url: {url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout_seconds = timeout_seconds
+        self.token = token
+        self.expect_echo = expect_echo
+        self._factory = connection_factory or _http_connection(parts.scheme)
+        self._conn: Any = None
+        self._seq = 0
+        self.connections_opened = 0
+
+    def __call__(self, timeout_seconds: Optional[float] = None) -> CheckResult:
+        import http.client
+
+        if timeout_seconds is not None and timeout_seconds != self.timeout_seconds:
+            self.timeout_seconds = timeout_seconds
+            if self._conn is not None:
+                self._conn.timeout = timeout_seconds
+                if self._conn.sock is not None:
+                    self._conn.sock.settimeout(timeout_seconds)
+
+        self._seq += 1
+        tag = f"oc-healthd-{os.getpid()}-{self._seq}-{secrets.token_hex(4)}"
+        body = json.dumps(
+            {"type": "oc-healthd.probe", "tag": tag, "sent_at": round(time.time(), 3)},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        started = time.monotonic()
+        try:
+            status, payload, reused = self._exchange(body, tag)
+        except socket.timeout:
+            self.close()
+            return self._result(False, "roundtrip timeout", 124, started, tag)
+        except (OSError, http.client.HTTPException) as error:
+            self.close()
+            return self._result(False, f"roundtrip failed: {str(error) or type(error).__name__}", 1, started, tag)
+
+        text = payload.decode("utf-8", errors="replace")
+        note = f"status={status} reused={int(reused)} tag={tag}"
+        if not 200 <= status < 300:
+            return self._result(False, f"roundtrip http {status}", status, started, f"{note} {_excerpt(text, 200)}")
+        if self.expect_echo and tag not in text:
+            return self._result(False, "roundtrip tag not echoed", 1, started, f"{note} {_excerpt(text, 200)}")
+        return self._result(True, "ok", 0, started, note)
+
+    def _exchange(self, body: bytes, tag: str) -> Tuple[int, bytes, bool]:
+        import http.client
+
+        headers = {"Content-Type": "application/json", PROBE_HEADER: tag}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in (0, 1):
+            reused = self._conn is not None
+            if self._conn is None:
+                self._conn = self._factory(self.host, self.port, self.timeout_seconds)
+                self.connections_opened += 1
+            conn = self._conn
+            try:
+                conn.request("POST", self.path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read(MAX_RESPONSE_BYTES)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                # The gateway may drop an idle keep-alive connection between cycles; that is not a failure.
+                # POST is not idempotent: if the gateway did process the first send, it sees this tag twice.
+                if reused and attempt == 0:
+                    continue
+                raise
+            if response.will_close or not response.isclosed():
+                # Server asked to close, or the body was larger than we read: the socket is not reusable.
+                self.close()
+            return response.status, payload, reused
+        raise OSError("roundtrip retry exhausted")  # pragma: no cover - loop always returns or raises
+
+    def _result(self, ok: bool, reason: str, code: int, started: float, excerpt: str) -> CheckResult:
+        return CheckResult(
+            layer=LAYER,
+            ok=ok,
+            reason=reason,
+            code=code,
+            latency_ms=_ms(started),
+            raw_excerpt=excerpt,
+        )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
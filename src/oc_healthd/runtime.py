@@ -0,0 +1,711 @@
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from oc_healthd.alerts import AlertCoalescer
+from oc_healthd.checks import (
+    CheckResult,
+    check_openclaw_health,
+    check_openclaw_status,
+    check_system_probe,
+)
+from oc_healthd.config import AppConfig, load_config_cached
+from oc_healthd.daemon import HealthDaemon
+from oc_healthd.latency import LatencyMonitor
+from oc_healthd.state_store import StateStore
+
+# Side-effect machinery (HTTP, sockets, subprocess hooks, tarfile) is imported inside the builders so
+# `--once` pays only for the probes; notifier/restarter/diagnostics are built on first use.
+if TYPE_CHECKING:
+    from oc_healthd.admission import AdmissionController
+    from oc_healthd.control import ControlServer
+    from oc_healthd.diagnostics import DiagnosticsCollector
+    from oc_healthd.history import HistoryStore
+    from oc_healthd.lease import LeaseElector
+    from oc_healthd.notifier import NotificationDispatcher
+    from oc_healthd.push import ResultPusher
+    from oc_healthd.restart import CommandRestarter
+    from oc_healthd.status_map import StatusMapWriter
+
+CheckRunner = Callable[[], CheckResult]
+
+CHECK_LAYERS = ("openclaw_health", "openclaw_status", "system_probe", "gateway_roundtrip")
+
+
+def _timed_check(layer: str, config: AppConfig) -> Tuple[Callable[[float], CheckResult], float, Any]:
+    # (run(timeout), base timeout, stateful target) so admission control can widen the timeout per call.
+    timeout = config.monitor.timeout_seconds
+    if layer == "openclaw_health":
+        return lambda seconds: check_openclaw_health(config.openclaw.health_cmd, seconds), timeout, None
+    if layer == "openclaw_status":
+        return lambda seconds: check_openclaw_status(config.openclaw.status_cmd, seconds), timeout, None
+    if layer == "system_probe":
+        return (
+            lambda seconds: check_system_probe(
+                dns_host=config.system.dns_host,
+                tcp_host=config.system.tcp_host,
+                tcp_port=config.system.tcp_port,
+                timeout_seconds=seconds,
+            ),
+            timeout,
+            None,
+        )
+    if layer == "gateway_roundtrip":
+        from oc_healthd.roundtrip import RoundTripProbe
+
+        # A probe object, not a lambda: it keeps its keep-alive connection between cycles.
+        roundtrip = config.roundtrip
+        probe = RoundTripProbe(
+            url=roundtrip.url,
+            timeout_seconds=roundtrip.timeout_seconds or timeout,
+            token=roundtrip.token,
+            expect_echo=roundtrip.expect_echo,
+        )
+        return probe, probe.timeout_seconds, probe
+    raise ValueError(f"unknown check layer: {layer}")
+
+
+def build_check(layer: str, config: AppConfig, admission: Optional[AdmissionController] = None) -> CheckRunner:
+    run, timeout, target = _timed_check(layer, config)
+    if admission is not None:
+        from oc_healthd.admission import AdmittedCheck
+
+        return AdmittedCheck(layer, run, timeout, admission, target)
+    if target is not None:
+        return target
+    return lambda: run(timeout)
+
+
+def enabled_layers(config: AppConfig) -> List[str]:
+    return [layer for layer in CHECK_LAYERS if layer != "gateway_roundtrip" or config.roundtrip.enabled]
+
+
+def build_checks(config: AppConfig, admission: Optional[AdmissionController] = None) -> List[CheckRunner]:
+    return [build_check(layer, config, admission) for layer in enabled_layers(config)]
+
+
+def _check_inputs(layer: str, config: AppConfig) -> tuple:
+    timeout = config.monitor.timeout_seconds
+    if layer == "openclaw_health":
+        return (config.openclaw.health_cmd, timeout)
+    if layer == "openclaw_status":
+        return (config.openclaw.status_cmd, timeout)
+    if layer == "gateway_roundtrip":
+        return (config.roundtrip, timeout)
+    return (config.system, timeout)
+
+
+def diff_config(old: AppConfig, new: AppConfig) -> Set[str]:
+    changed: Set[str] = set()
+    for layer in CHECK_LAYERS:
+        if _check_inputs(layer, old) != _check_inputs(layer, new):
+            changed.add(f"check.{layer}")
+    timeout_changed = old.monitor.timeout_seconds != new.monitor.timeout_seconds
+    if old.telegram != new.telegram or old.notify != new.notify or timeout_changed:
+        changed.add("notifier")
+    if old.openclaw.restart_cmd != new.openclaw.restart_cmd or timeout_changed:
+        changed.add("restarter")
+    if old.monitor.failure_threshold != new.monitor.failure_threshold:
+        changed.add("threshold")
+    if old.monitor.interval_seconds != new.monitor.interval_seconds:
+        changed.add("interval")
+    if old.paths != new.paths:
+        changed.add("paths")
+    if old.metrics != new.metrics:
+        changed.add("metrics")
+    if old.control != new.control:
+        changed.add("control")
+    if old.alerts != new.alerts:
+        changed.add("alerts")
+    if old.ha != new.ha:
+        changed.add("ha")
+    if old.push != new.push:
+        changed.add("push")
+    if old.diagnostics != new.diagnostics or (new.diagnostics.enabled and old.openclaw != new.openclaw):
+        changed.add("diagnostics")
+    if old.latency != new.latency:
+        changed.add("latency")
+    if old.history != new.history:
+        changed.add("history")
+    if old.status_map != new.status_map:
+        changed.add("status_map")
+    if old.admission != new.admission:
+        changed.add("admission")
+    return changed
+
+
+def build_coalescer(config: AppConfig) -> Optional[AlertCoalescer]:
+    if config.alerts.coalesce_seconds <= 0:
+        return None
+    return AlertCoalescer(config.alerts.coalesce_seconds)
+
+
+class Deferred:
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._target: Any = None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            self._target = self._factory()
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+
+def build_elector(config: AppConfig) -> Optional[LeaseElector]:
+    if not config.ha.enabled:
+        return None
+    from oc_healthd.lease import LeaseElector, default_node_id
+
+    return LeaseElector(
+        path=config.ha.lease_file,
+        node_id=config.ha.node_id or default_node_id(),
+        ttl_seconds=config.ha.lease_ttl_seconds,
+        renew_interval_seconds=config.monitor.interval_seconds,
+        max_clock_skew_seconds=config.ha.max_clock_skew_seconds,
+    )
+
+
+def build_pusher(config: AppConfig) -> Optional[ResultPusher]:
+    if not config.push.enabled:
+        return None
+    import socket
+
+    from oc_healthd.push import ResultPusher
+
+    return ResultPusher(
+        node_id=config.push.node_id or socket.gethostname(),
+        target=config.push.target,
+        transport=config.push.transport,
+        batch_size=config.push.batch_size,
+        flush_seconds=config.push.flush_seconds,
+        queue_size=config.push.queue_size,
+        timeout_seconds=config.monitor.timeout_seconds,
+    )
+
+
+def build_history(config: AppConfig) -> Optional[HistoryStore]:
+    history = config.history
+    if not history.enabled:
+        return None
+    from oc_healthd.history import HistoryStore
+
+    return HistoryStore(
+        path=history.path,
+        raw_retention_days=history.raw_retention_days,
+        minute_retention_days=history.minute_retention_days,
+        hour_retention_days=history.hour_retention_days,
+        batch_size=history.batch_size,
+        flush_seconds=history.flush_seconds,
+        queue_size=history.queue_size,
+    )
+
+
+def build_admission(config: AppConfig) -> Optional[AdmissionController]:
+    admission = config.admission
+    if not admission.enabled:
+        return None
+    from oc_healthd.admission import AdmissionController
+
+    return AdmissionController(
+        max_concurrent=admission.max_concurrent,
+        load_elevated=admission.load_elevated,
+        load_critical=admission.load_critical,
+        psi_elevated=admission.psi_elevated,
+        psi_critical=admission.psi_critical,
+        timeout_factor=admission.timeout_factor,
+        max_timeout_seconds=admission.max_timeout_seconds,
+        max_deferrals=admission.max_deferrals,
+        tiers=dict(admission.tiers),
+    )
+
+
+def build_diagnostics(
+    config: AppConfig,
+    admission: Optional[AdmissionController] = None,
+) -> Optional[DiagnosticsCollector]:
+    diagnostics = config.diagnostics
+    if not diagnostics.enabled:
+        return None
+    from oc_healthd.checks import run_command
+    from oc_healthd.diagnostics import DiagnosticsCollector
+
+    return DiagnosticsCollector(
+        output_dir=diagnostics.output_dir,
+        budget_seconds=diagnostics.budget_seconds,
+        commands={"health": config.openclaw.health_cmd, "status": config.openclaw.status_cmd},
+        gateway_pattern=diagnostics.gateway_pattern,
+        gateway_log=diagnostics.gateway_log,
+        log_tail_lines=diagnostics.log_tail_lines,
+        keep=diagnostics.keep,
+        # Incident captures spawn the same CLI as the checks, so they share the admission slots.
+        runner=admission.guard_runner(run_command) if admission is not None else run_command,
+    )
+
+
+def build_latency(config: AppConfig) -> Optional[LatencyMonitor]:
+    latency = config.latency
+    if not latency.enabled:
+        return None
+    return LatencyMonitor(
+        slo_ms=latency.slo_ms,
+        layer_slo_ms=dict(latency.layer_slo_ms),
+        window=latency.window,
+        drift_factor=latency.drift_factor,
+        ewma_alpha=latency.ewma_alpha,
+        min_windows=latency.min_windows,
+    )
+
+
+def build_notifier(config: AppConfig) -> NotificationDispatcher:
+    from oc_healthd.notifier import (
+        CommandNotifier,
+        FileNotifier,
+        NotificationDispatcher,
+        SyslogNotifier,
+        TelegramNotifier,
+        WebhookNotifier,
+    )
+
+    dispatcher = NotificationDispatcher()
+    timeout = config.monitor.timeout_seconds
+    notify = config.notify
+    if config.telegram.bot_token and config.telegram.chat_id:
+        dispatcher.add(
+            "telegram",
+            TelegramNotifier(
+                bot_token=config.telegram.bot_token,
+                chat_id=config.telegram.chat_id,
+                timeout_seconds=timeout,
+            ),
+            timeout,
+        )
+    if notify.webhook_url:
+        dispatcher.add(
+            "webhook",
+            WebhookNotifier(notify.webhook_url, notify.webhook_timeout_seconds),
+            notify.webhook_timeout_seconds,
+        )
+    if notify.file_path:
+        dispatcher.add("file", FileNotifier(notify.file_path), timeout)
+    if notify.syslog:
+        dispatcher.add("syslog", SyslogNotifier(), timeout)
+    if notify.command:
+        dispatcher.add(
+            "command",
+            CommandNotifier(notify.command, notify.command_timeout_seconds),
+            notify.command_timeout_seconds,
+        )
+    return dispatcher
+
+
+def build_restarter(config: AppConfig) -> CommandRestarter:
+    from oc_healthd.restart import CommandRestarter
+
+    return CommandRestarter(
+        command=config.openclaw.restart_cmd,
+        timeout_seconds=config.monitor.timeout_seconds,
+    )
+
+
+def _deferred_notifier(config: AppConfig) -> Deferred:
+    return Deferred(lambda: build_notifier(config))
+
+
+def _deferred_restarter(config: AppConfig) -> Deferred:
+    return Deferred(lambda: build_restarter(config))
+
+
+def _deferred_diagnostics(
+    config: AppConfig,
+    admission: Optional[AdmissionController] = None,
+) -> Optional[Deferred]:
+    if not config.diagnostics.enabled:
+        return None
+    return Deferred(lambda: build_diagnostics(config, admission))
+
+
+def _new_metrics() -> Any:
+    from oc_healthd.metrics import HealthMetrics
+
+    return HealthMetrics()
+
+
+class Runtime:
+    def __init__(self, config_path: str, config: Optional[AppConfig] = None, metrics: bool = True) -> None:
+        self.config_path = config_path
+        self.config = config or load_config_cached(config_path)
+        self.admission = build_admission(self.config)
+        self.check_runners: Dict[str, CheckRunner] = {
+            layer: build_check(layer, self.config, self.admission) for layer in enabled_layers(self.config)
+        }
+        wants_metrics = metrics and self.config.metrics.enabled
+        self.daemon = HealthDaemon(
+            threshold=self.config.monitor.failure_threshold,
+            checks=list(self.check_runners.values()),
+            notifier=_deferred_notifier(self.config),
+            restarter=_deferred_restarter(self.config),
+            state_store=StateStore(self.config.paths.state_file),
+            log_file=self.config.paths.log_file,
+            metrics=_new_metrics() if wants_metrics else None,
+            coalescer=build_coalescer(self.config),
+            diagnostics=_deferred_diagnostics(self.config, self.admission),
+            latency=build_latency(self.config),
+        )
+        self.pusher: Optional[ResultPusher] = None
+        self.history: Optional[HistoryStore] = None
+        self.status_map: Optional[StatusMapWriter] = None
+        self.elector: Optional[LeaseElector] = None
+        self._set_elector(build_elector(self.config))
+        self.metrics_server: Any = None
+        self.control: Optional[ControlServer] = None
+        self._wake = threading.Event()
+        self._elect_lock = threading.Lock()
+        self._next_run = time.monotonic()
+        self._last_started = self._next_run
+        self._reload_requested = False
+        self._stop_requested = False
+
+    def _set_elector(self, elector: Optional[LeaseElector]) -> None:
+        self.elector = elector
+        self.daemon.is_leader = elector.is_leader if elector is not None else None
+        self.daemon.role = "standalone" if elector is None else "standby"
+
+    def elect(self) -> bool:
+        # The scheduler and control `check` both come through here.
+        with self._elect_lock:
+            return self._elect_locked()
+
+    def _elect_locked(self) -> bool:
+        elector = self.elector
+        if elector is None:
+            leader = True
+        else:
+            was_leader = self.daemon.role == "leader"
+            leader = elector.acquire_or_renew()
+            if leader and not was_leader:
+                # Carry on from whatever the previous leader persisted.
+                self.daemon.reload_state()
+                self.daemon.role = "leader"
+                self._write_status_map()
+                self.daemon.log_event("leader_elected", node_id=elector.node_id, epoch=elector.epoch)
+            elif not leader and was_leader:
+                self.daemon.role = "standby"
+                self.daemon.log_event("leader_lost", node_id=elector.node_id)
+        if self.daemon.metrics is not None:
+            self.daemon.metrics.leader.set(1 if leader else 0)
+        return leader
+
+    def is_leader(self) -> bool:
+        elector = self.elector
+        return elector is None or elector.is_leader()
+
+    def run_check(self) -> str:
+        # Same gate as the scheduler: a standby never probes, restarts or alerts on request.
+        if not self.elect():
+            return "skipped"
+        return self.daemon.run_cycle()
+
+    def start_services(self) -> None:
+        self._start_metrics()
+        self._start_control()
+        self._start_pusher()
+        self._start_history()
+        self._start_status_map()
+
+    def stop_services(self) -> None:
+        self._stop_status_map()
+        self._stop_history()
+        self._stop_pusher()
+        self._stop_control()
+        self._stop_metrics()
+
+    def _start_pusher(self) -> None:
+        self.pusher = build_pusher(self.config)
+        if self.pusher is not None:
+            self.daemon.sinks.append(self.pusher)
+            self.daemon.local_alerts = self.config.push.local_alerts
+
+    def _stop_pusher(self) -> None:
+        if self.pusher is None:
+            return
+        if self.pusher in self.daemon.sinks:
+            self.daemon.sinks.remove(self.pusher)
+        self.pusher.close()
+        self.pusher = None
+        self.daemon.local_alerts = True
+
+    def _start_history(self) -> None:
+        self.history = build_history(self.config)
+        if self.history is not None:
+            self.daemon.sinks.append(self.history)
+
+    def _stop_history(self) -> None:
+        if self.history is None:
+            return
+        if self.history in self.daemon.sinks:
+            self.daemon.sinks.remove(self.history)
+        self.history.close()
+        self.history = None
+
+    def _start_status_map(self) -> None:
+        if not self.config.status_map.enabled:
+            return
+        from oc_healthd.status_map import StatusMapWriter
+
+        # Only the leader writes: HA nodes sharing a directory share the map.
+        writer = StatusMapWriter(self.config.status_map.path, is_leader=self.is_leader)
+        with self.daemon.lock:
+            self.status_map = writer
+            self._write_status_map()
+            self.daemon.sinks.append(writer)
+
+    def _write_status_map(self) -> None:
+        # Readers see the restored state right away instead of an empty map until the first cycle.
+        writer = self.status_map
+        daemon = self.daemon
+        if writer is None or daemon.role == "standby":
+            return
+        with daemon.lock:
+            writer.write(daemon.machine.current_state, daemon.machine.counters, daemon.last_results)
+
+    def _stop_status_map(self) -> None:
+        if self.status_map is None:
+            return
+        with self.daemon.lock:
+            if self.status_map in self.daemon.sinks:
+                self.daemon.sinks.remove(self.status_map)
+        self.status_map.close()
+        self.status_map = None
+
+    def query_history(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        history = self.history
+        if history is None:
+            raise ValueError("history is disabled")
+        from oc_healthd.history import query_request
+
+        return query_request(history, request)
+
+    def _start_metrics(self) -> None:
+        if self.daemon.metrics is None or not self.config.metrics.enabled:
+            return
+        from oc_healthd.metrics import start_metrics_server
+
+        self.metrics_server = start_metrics_server(
+            self.daemon.metrics.registry,
+            self.config.metrics.host,
+            self.config.metrics.port,
+        )
+
+    def _stop_metrics(self) -> None:
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+
+    def _start_control(self) -> None:
+        if not self.config.control.socket_path:
+            return
+        from oc_healthd.control import ControlServer
+
+        self.control = ControlServer(
+            self.daemon,
+            self.config.control.socket_path,
+            on_reload=self.reload,
+            on_history=self.query_history,
+            on_check=self.run_check,
+            on_stats=self.stats,
+        )
+        self.control.start()
+
+    def _stop_control(self) -> None:
+        if self.control is not None:
+            self.control.close()
+            self.control = None
+
+    def stats(self) -> Dict[str, Any]:
+        # Read self.admission on every call: a reload may replace or disable the controller.
+        admission = self.admission
+        return {"admission": admission.snapshot() if admission is not None else None}
+
+    def reload(self) -> Dict[str, Any]:
+        started = time.monotonic_ns()
+        try:
+            new_config = load_config_cached(self.config_path)
+        except Exception as error:
+            result: Dict[str, Any] = {
+                "ok": False,
+                "error": f"config load failed: {error}",
+                "changed": [],
+            }
+        else:
+            with self.daemon.lock:
+                old_config = self.config
+                counters = dict(self.daemon.machine.counters)
+                metrics = self.daemon.metrics
+                try:
+                    changed = self._apply_config(new_config)
+                except Exception as error:
+                    result = {
+                        "ok": False,
+                        "error": f"config apply failed: {error}",
+                        "changed": [],
+                    }
+                    note = self._rollback_config(old_config, counters, metrics)
+                    if note:
+                        result["rollback"] = note
+                else:
+                    result = {"ok": True, "changed": sorted(changed)}
+        result["duration_ms"] = round((time.monotonic_ns() - started) / 1_000_000, 3)
+        self.daemon.log_event("reload", **result)
+        return result
+
+    def _rollback_config(self, old: AppConfig, counters: Dict[str, int], metrics: Any) -> str:
+        # Re-applying the previous config rebuilds whatever the failed apply already swapped out.
+        note = ""
+        try:
+            self._apply_config(old)
+        except Exception as error:  # pragma: no cover - the old config applied cleanly before
+            note = f"rollback incomplete: {error}"
+        self.config = old
+        self.daemon.machine.counters = counters
+        if metrics is None and self.metrics_server is None:
+            self.daemon.metrics = None
+        return note
+
+    def _apply_config(self, new: AppConfig) -> Set[str]:
+        old = self.config
+        changed = diff_config(old, new)
+        self.config = new
+        daemon = self.daemon
+
+        reset_layers = {layer for layer in CHECK_LAYERS if f"check.{layer}" in changed}
+        rebuild = set(reset_layers)
+        if "admission" in changed:
+            self.admission = build_admission(new)
+            # Re-wrap every runner with the new controller; unchanged layers keep their counters.
+            rebuild.update(self.check_runners)
+        active = enabled_layers(new)
+        for layer in CHECK_LAYERS:
+            if layer in rebuild:
+                close = getattr(self.check_runners.pop(layer, None), "close", None)
+                if callable(close):
+                    close()
+                if layer in active:
+                    self.check_runners[layer] = build_check(layer, new, self.admission)
+        if rebuild:
+            self.check_runners = {
+                layer: self.check_runners[layer] for layer in CHECK_LAYERS if layer in self.check_runners
+            }
+            daemon.checks = list(self.check_runners.values())
+            for layer in reset_layers:
+                daemon.machine.counters.pop(layer, None)
+        if "notifier" in changed:
+            daemon.notifier = _deferred_notifier(new)
+        if "restarter" in changed:
+            daemon.restarter = _deferred_restarter(new)
+        if "threshold" in changed:
+            daemon.machine.threshold = new.monitor.failure_threshold
+        if "interval" in changed:
+            self._next_run = self._last_started + new.monitor.interval_seconds
+            if self.elector is not None:
+                self.elector.renew_interval_seconds = new.monitor.interval_seconds
+        if "paths" in changed:
+            daemon.log_file = Path(new.paths.log_file)
+            if old.paths.state_file != new.paths.state_file:
+                daemon.state_store = StateStore(new.paths.state_file)
+        if "metrics" in changed:
+            self._stop_metrics()
+            if new.metrics.enabled and daemon.metrics is None:
+                daemon.metrics = _new_metrics()
+            self._start_metrics()
+        if "control" in changed:
+            self._stop_control()
+            self._start_control()
+        if "alerts" in changed:
+            daemon.flush_alerts()
+            daemon.coalescer = build_coalescer(new)
+        if "diagnostics" in changed or "admission" in changed:
+            daemon.diagnostics = _deferred_diagnostics(new, self.admission)
+        if "latency" in changed:
+            latency = build_latency(new)
+            if latency is not None and daemon.latency is not None:
+                # Thresholds changed, history did not: keep the learned baselines.
+                latency.load(daemon.latency.to_dict())
+            daemon.latency = latency
+        if "push" in changed:
+            self._stop_pusher()
+            self._start_pusher()
+        if "history" in changed:
+            self._stop_history()
+            self._start_history()
+        if "status_map" in changed:
+            self._stop_status_map()
+            self._start_status_map()
+        if "ha" in changed:
+            if self.elector is not None:
+                self.elector.release()
+            self._set_elector(build_elector(new))
+        return changed
+
+    def request_reload(self) -> None:
+        self._reload_requested = True
+        self._wake.set()
+
+    def request_stop(self) -> None:
+        self._stop_requested = True
+        self._wake.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGHUP, lambda _signum, _frame: self.request_reload())
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: self.request_stop())
+
+    def serve_forever(self) -> int:
+        self.start_services()
+        self._next_run = time.monotonic()
+        try:
+            while not self._stop_requested:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    try:
+                        self.reload()
+                    except Exception:  # pragma: no cover - a failed reload must never stop monitoring
+                        pass
+                now = time.monotonic()
+                if now >= self._next_run:
+                    self._last_started = now
+                    if self.daemon.metrics is not None:
+                        self.daemon.metrics.schedule_lag.set(now - self._next_run)
+                    leader = self.elect()
+                    if leader and not self.daemon.paused:
+                        self.daemon.run_cycle()
+                    interval = float(self.config.monitor.interval_seconds)
+                    if not leader:
+                        # Standbys poll the lease faster so takeover stays within ~1.33x TTL.
+                        interval = min(interval, self.config.ha.lease_ttl_seconds / 3)
+                    self._next_run = max(self._next_run + interval, time.monotonic())
+                if self.daemon.role != "standby" and self.daemon.alerts_due_in() == 0.0:
+                    # The coalescing window closed between cycles: send now, not at the next cycle.
+                    self.daemon.flush_alerts(force=False)
+                timeout = self._next_run - time.monotonic()
+                due_in = self.daemon.alerts_due_in()
+                if due_in is not None:
+                    timeout = min(timeout, due_in)
+                self._wake.wait(max(0.0, timeout))
+                self._wake.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.daemon.role != "standby":
+                self.daemon.flush_alerts()
+            self.daemon.drain_notifications()
+            if self.elector is not None:
+                self.elector.release()
+            self.stop_services()
+        return 0
@@ -16,6 +16,9 @@ class MonitorStateMachine:
         layers_seen = set()
         for result in results:
             layers_seen.add(result.layer)
+            if result.inconclusive:
+                # No verdict: keep the layer's streak exactly where it was.
+                continue
             if result.ok:
                 self.counters[result.layer] = 0
             else:
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from oc_healthd.checks import CheckResult
+
+# Fixed little-endian layout so readers in any language can map the file:
+#   header  <8sIIQI4x    magic, layout version, layer slots, seqlock sequence (odd while a write is in progress),
+#                        crc32 of everything after the header
+#   body    <16s24sddQII state, last transition, last transition epoch, updated epoch, cycles, writer pid, layers
+#   layers  <32sIIB7x    name, consecutive failures, last latency ms, last ok (x MAX_LAYERS)
+MAGIC = b"OCHSTAT1"
+LAYOUT_VERSION = 2
+MAX_LAYERS = 8
+HEADER = struct.Struct("<8sIIQI4x")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 16
+CRC = struct.Struct("<I")
+CRC_OFFSET = 24
+BODY = struct.Struct("<16s24sddQII")
+LAYER = struct.Struct("<32sIIB7x")
+BODY_OFFSET = HEADER.size
+LAYERS_OFFSET = BODY_OFFSET + BODY.size
+SIZE = LAYERS_OFFSET + MAX_LAYERS * LAYER.size
+
+
+def _text(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    magic, version, slots, seq, _crc = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != LAYOUT_VERSION:
+        raise ValueError("not an oc_healthd status map")
+    state, transition, transition_at, updated_at, cycles, pid, count = BODY.unpack_from(data, BODY_OFFSET)
+    layers: List[Dict[str, Any]] = []
+    for index in range(min(count, slots, MAX_LAYERS)):
+        name, counter, latency_ms, ok = LAYER.unpack_from(data, LAYERS_OFFSET + index * LAYER.size)
+        layers.append({"layer": _text(name), "counter": counter, "latency_ms": latency_ms, "ok": bool(ok)})
+    return {
+        "seq": seq,
+        "state": _text(state),
+        "last_transition": _text(transition),
+        "last_transition_at": transition_at,
+        "updated_at": updated_at,
+        "cycles": cycles,
+        "pid": pid,
+        "layers": layers,
+    }
+
+
+class StatusMapWriter:
+    def __init__(self, path: str, is_leader: Optional[Callable[[], bool]] = None) -> None:
+        self.path = Path(path)
+        self.is_leader = is_leader
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != SIZE:
+                os.ftruncate(fd, SIZE)
+            self._mm: Optional[mmap.mmap] = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        magic, version, _slots, seq, _crc = HEADER.unpack_from(self._mm, 0)
+        # Continue an existing sequence so long-lived readers never see it go backwards; round up if a
+        # previous writer died mid-update.
+        self._seq = seq + (seq & 1) if magic == MAGIC and version == LAYOUT_VERSION else 0
+        self._buffer = bytearray(SIZE - BODY_OFFSET)
+        self.cycles = 0
+        self.last_transition = ""
+        self.last_transition_at = 0.0
+        if self._seq == 0:
+            self._mm[BODY_OFFSET:SIZE] = self._buffer
+            HEADER.pack_into(self._mm, 0, MAGIC, LAYOUT_VERSION, MAX_LAYERS, 0, zlib.crc32(self._buffer))
+
+    def write(
+        self,
+        state: str,
+        counters: Dict[str, int],
+        results: Sequence[CheckResult] = (),
+    ) -> None:
+        mm = self._mm
+        if mm is None:
+            return
+        # Another HA node may have written since this one last did: continue from the mapped sequence.
+        current = SEQ.unpack_from(mm, SEQ_OFFSET)[0]
+        self._seq = max(self._seq, current + (current & 1))
+        latest = {result.layer: result for result in results}
+        names = list(dict.fromkeys([*latest, *counters]))[:MAX_LAYERS]
+        buffer = self._buffer
+        BODY.pack_into(
+            buffer,
+            0,
+            state.encode("utf-8")[:16],
+            self.last_transition.encode("utf-8")[:24],
+            self.last_transition_at,
+            time.time(),
+            self.cycles,
+            os.getpid(),
+            len(names),
+        )
+        for index in range(MAX_LAYERS):
+            offset = BODY.size + index * LAYER.size
+            if index >= len(names):
+                LAYER.pack_into(buffer, offset, b"", 0, 0, 0)
+                continue
+            name = names[index]
+            result = latest.get(name)
+            LAYER.pack_into(
+                buffer,
+                offset,
+                name.encode("utf-8")[:32],
+                max(0, int(counters.get(name, 0))),
+                max(0, result.latency_ms) if result is not None else 0,
+                1 if result is not None and result.ok else 0,
+            )
+        # Seqlock: odd sequence, one memcpy of the body and its crc, even sequence. Readers retry on odd or
+        # changed seq, and on a crc mismatch: Python has no memory barriers, so on weakly ordered CPUs the
+        # sequence alone does not prove the body stores were visible to the reader.
+        self._seq += 1
+        SEQ.pack_into(mm, SEQ_OFFSET, self._seq)
+        mm[BODY_OFFSET:SIZE] = buffer
+        CRC.pack_into(mm, CRC_OFFSET, zlib.crc32(buffer))
+        self._seq += 1
+        SEQ.pack_into(mm, SEQ_OFFSET, self._seq)
+
+    def publish(
+        self,
+        results: List[CheckResult],
+        state: str,
+        transition: str,
+        counters: Dict[str, int],
+    ) -> None:
+        if self.is_leader is not None and not self.is_leader():
+            # A fenced standby must not overwrite the leader's snapshot in a shared map.
+            return
+        self.cycles += 1
+        if transition != "steady":
+            self.last_transition = transition
+            self.last_transition_at = time.time()
+        self.write(state, counters, results)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class StatusMapReader:
+    def __init__(self, path: str) -> None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            self._mm = mmap.mmap(fd, SIZE, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+    def read(self, timeout_seconds: float = 1.0) -> Dict[str, Any]:
+        mm = self._mm
+        deadline = 0.0
+        attempts = 0
+        while True:
+            before = SEQ.unpack_from(mm, SEQ_OFFSET)[0]
+            if not before & 1:
+                data = mm[:SIZE]
+                if (
+                    SEQ.unpack_from(mm, SEQ_OFFSET)[0] == before
+                    and CRC.unpack_from(data, CRC_OFFSET)[0] == zlib.crc32(data[BODY_OFFSET:])
+                ):
+                    return decode(data)
+            attempts += 1
+            if attempts < 64:
+                continue
+            # The writer was preempted mid-update (or died in one): stop spinning and let it run.
+            now = time.monotonic()
+            if not deadline:
+                deadline = now + timeout_seconds
+            elif now >= deadline:
+                raise TimeoutError("status map kept changing while reading")
+            time.sleep(0.0005)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "StatusMapReader":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def read_status(path: str) -> Dict[str, Any]:
+    with StatusMapReader(path) as reader:
+        return reader.read()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print the oc_healthd shared-memory status snapshot")
+    parser.add_argument("path", nargs="?", default="logs/status.map")
+    args = parser.parse_args(argv)
+    try:
+        snapshot = read_status(args.path)
+    except (OSError, ValueError) as error:
+        print(f"status map unavailable: {args.path}: {error}", file=sys.stderr)
+        return 2
+    print(json.dumps(snapshot, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.started_ns = time.monotonic_ns()
+        self.spans_ns: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic_ns() - started)
+
+    def add(self, name: str, elapsed_ns: int) -> None:
+        self.spans_ns[name] = self.spans_ns.get(name, 0) + elapsed_ns
+
+    def total_ns(self) -> int:
+        return time.monotonic_ns() - self.started_ns
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(value / 1_000_000, 3) for name, value in self.spans_ns.items()}
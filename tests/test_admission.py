@@ -0,0 +1,173 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.admission import (  # noqa: E402
+    INCONCLUSIVE_CODE,
+    AdmissionController,
+    AdmittedCheck,
+    LoadSample,
+    read_psi,
+)
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+def _sampler(load: float, psi: float = 0.0):
+    return lambda: LoadSample(load, {"cpu": psi}, 0.0)
+
+
+class RecordingRun:
+    def __init__(self, layer: str, ok: bool = True, code: int = 0) -> None:
+        self.layer = layer
+        self.ok = ok
+        self.code = code
+        self.timeouts = []
+
+    def __call__(self, timeout: float) -> CheckResult:
+        self.timeouts.append(timeout)
+        reason = "ok" if self.ok else "status command timeout"
+        return CheckResult(self.layer, self.ok, reason, self.code, 5, "")
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+class AdmissionTests(unittest.TestCase):
+    def test_read_psi_parses_some_avg10(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pressure = Path(tmpdir) / "pressure"
+            pressure.mkdir()
+            (pressure / "cpu").write_text(
+                "some avg10=42.50 avg60=10.00 avg300=1.00 total=123\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+            )
+            (pressure / "io").write_text("some avg10=3.25 avg60=0.00 avg300=0.00 total=9\n")
+            self.assertEqual(read_psi(Path(tmpdir)), {"cpu": 42.5, "io": 3.25})
+
+    def test_elevated_pressure_defers_expensive_tier_and_widens_timeouts(self) -> None:
+        controller = AdmissionController(sampler=_sampler(2.0), timeout_factor=2.0, max_timeout_seconds=15)
+        status = RecordingRun("openclaw_status")
+        health = RecordingRun("openclaw_health")
+
+        deferred = AdmittedCheck("openclaw_status", status, 10, controller)()
+        admitted = AdmittedCheck("openclaw_health", health, 10, controller)()
+
+        self.assertTrue(deferred.inconclusive)
+        self.assertEqual(deferred.code, INCONCLUSIVE_CODE)
+        self.assertIn("host elevated (load 2.00/cpu", deferred.reason)
+        self.assertEqual(status.timeouts, [])
+        self.assertTrue(admitted.ok)
+        self.assertEqual(health.timeouts, [15.0])
+
+    def test_critical_psi_runs_only_cheap_tier_but_never_starves_a_layer(self) -> None:
+        controller = AdmissionController(sampler=_sampler(0.1, psi=80.0), max_deferrals=2)
+        health = RecordingRun("openclaw_health")
+        probe = RecordingRun("system_probe")
+        check = AdmittedCheck("openclaw_health", health, 10, controller)
+
+        verdicts = [check().inconclusive for _ in range(4)]
+        AdmittedCheck("system_probe", probe, 10, controller)()
+
+        self.assertEqual(controller.level, "critical")
+        self.assertEqual(verdicts, [True, True, False, True])
+        self.assertEqual(len(probe.timeouts), 1)
+
+    def test_timeout_under_pressure_is_inconclusive_but_not_when_idle(self) -> None:
+        timing_out = RecordingRun("openclaw_health", ok=False, code=124)
+        loaded = AdmissionController(sampler=_sampler(2.0))
+        idle = AdmissionController(sampler=_sampler(0.2))
+
+        under_load = loaded.run("openclaw_health", timing_out, 10)
+        at_rest = idle.run("openclaw_health", timing_out, 10)
+
+        self.assertTrue(under_load.inconclusive)
+        self.assertIn("under host pressure", under_load.reason)
+        self.assertFalse(at_rest.inconclusive)
+        self.assertEqual(timing_out.timeouts, [20.0, 10])
+
+    def test_forced_run_after_deferrals_gives_a_real_timeout_verdict(self) -> None:
+        controller = AdmissionController(sampler=_sampler(2.0), max_deferrals=2)
+        hung = RecordingRun("openclaw_status", ok=False, code=124)
+        check = AdmittedCheck("openclaw_status", hung, 10, controller)
+
+        verdicts = [check().inconclusive for _ in range(3)]
+
+        self.assertEqual(verdicts, [True, True, False])
+        self.assertEqual(controller.snapshot()["shed"], {"deferred": 2})
+
+    def test_sustained_load_and_a_hung_gateway_still_reach_unhealthy(self) -> None:
+        controller = AdmissionController(sampler=_sampler(2.0), max_deferrals=2)
+        hung = RecordingRun("openclaw_health", ok=False, code=124)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            notifier = MemoryNotifier()
+            daemon = HealthDaemon(
+                threshold=2,
+                checks=[AdmittedCheck("openclaw_health", hung, 10, controller)],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+            )
+            transitions = [daemon.run_cycle() for _ in range(6)]
+
+        self.assertEqual(transitions, ["steady"] * 5 + ["entered_unhealthy"])
+        self.assertEqual(daemon.machine.current_state, "UNHEALTHY")
+        self.assertIn("under host pressure", notifier.messages[0])
+        self.assertEqual(controller.snapshot()["shed"], {"timeout": 4})
+
+    def test_global_slots_bound_concurrent_checks(self) -> None:
+        controller = AdmissionController(max_concurrent=1, queue_timeout_seconds=0.05, sampler=_sampler(0.0))
+        release = threading.Event()
+        entered = threading.Event()
+
+        def slow(_timeout: float) -> CheckResult:
+            entered.set()
+            release.wait(5)
+            return CheckResult("openclaw_health", True, "ok", 0, 1, "")
+
+        worker = threading.Thread(target=controller.run, args=("openclaw_health", slow, 10))
+        worker.start()
+        entered.wait(5)
+        queued = controller.run("openclaw_status", RecordingRun("openclaw_status"), 10)
+        release.set()
+        worker.join(5)
+
+        self.assertTrue(queued.inconclusive)
+        self.assertEqual(queued.reason, "deferred: no free check slot")
+        self.assertEqual(controller.snapshot()["shed"], {"queue_full": 1})
+
+    def test_inconclusive_cycles_never_reach_unhealthy(self) -> None:
+        controller = AdmissionController(sampler=_sampler(5.0), max_deferrals=0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            notifier = MemoryNotifier()
+            daemon = HealthDaemon(
+                threshold=2,
+                checks=[AdmittedCheck("openclaw_status", RecordingRun("openclaw_status", False, 1), 10, controller)],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+            )
+            transitions = [daemon.run_cycle() for _ in range(5)]
+            logged = (Path(tmpdir) / "healthd.jsonl").read_text()
+
+        self.assertEqual(transitions, ["steady"] * 5)
+        self.assertEqual(daemon.machine.counters, {"openclaw_status": 0})
+        self.assertEqual(notifier.messages, [])
+        self.assertIn('"inconclusive": true', logged)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import json
+import socket
+import sys
+import tempfile
+import time
+import unittest
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.aggregator import (  # noqa: E402
+    FleetAggregator,
+    start_http_server,
+    start_udp_listener,
+)
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.push import ResultPusher, encode_record  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+DNS_DOWN = [
+    CheckResult("openclaw_health", False, "timeout", 124, 10000, ""),
+    CheckResult("system_probe", False, "dns probe failed", 1, 3, ""),
+]
+HEALTHY = [CheckResult("openclaw_health", True, "ok", 0, 20, "")]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class AggregatorTests(unittest.TestCase):
+    def test_cross_node_outage_becomes_one_fleet_alert(self) -> None:
+        clock = FakeClock()
+        notifier = MemoryNotifier()
+        aggregator = FleetAggregator(stale_after_seconds=60, coalesce_seconds=0, notifier=notifier, clock=clock)
+        for index in range(200):
+            record = encode_record(1, DNS_DOWN, "UNHEALTHY", "entered_unhealthy", ts=clock.now)
+            aggregator.ingest({"n": f"node-{index:03d}", "b": [record]})
+        aggregator.ingest({"n": "node-ok", "b": [encode_record(1, HEALTHY, "HEALTHY", "steady", ts=clock.now)]})
+
+        digest = aggregator.tick()
+        status = aggregator.fleet_status()
+
+        self.assertEqual(len(notifier.messages), 1)
+        self.assertIn("[OpenClaw Fleet Alert] DIGEST (200 alerts", digest)
+        self.assertIn("UNHEALTHY x200: system_probe - dns probe failed", digest)
+        self.assertIn("+195 more", digest)
+        self.assertEqual(status["by_state"], {"UNHEALTHY": 200, "HEALTHY": 1})
+        self.assertEqual(list(status["causes"]), ["system_probe - dns probe failed"])
+        self.assertEqual(len(status["causes"]["system_probe - dns probe failed"]), 200)
+
+        clock.now += 61
+        aggregator.ingest({"n": "node-ok", "b": [encode_record(2, HEALTHY, "HEALTHY", "steady", ts=clock.now)]})
+        status = aggregator.fleet_status()
+        self.assertEqual(status["by_state"], {"STALE": 200, "HEALTHY": 1})
+
+    def test_inconclusive_results_never_become_the_fleet_cause(self) -> None:
+        aggregator = FleetAggregator()
+        results = [
+            CheckResult("openclaw_status", False, "deferred: host critical", 75, 0, "", inconclusive=True),
+            CheckResult("openclaw_health", False, "timeout", 124, 10000, ""),
+        ]
+        aggregator.ingest({"n": "a", "b": [encode_record(1, results, "UNHEALTHY", "entered_unhealthy", ts=1.0)]})
+
+        status = aggregator.node_status("a")
+        self.assertEqual(list(aggregator.fleet_status()["causes"]), ["openclaw_health - timeout"])
+        self.assertEqual([row["inconclusive"] for row in status["results"]], [True, False])
+
+    def test_out_of_order_records_are_ignored(self) -> None:
+        aggregator = FleetAggregator()
+        newer = encode_record(2, HEALTHY, "HEALTHY", "steady", ts=200.0)
+        older = encode_record(1, DNS_DOWN, "UNHEALTHY", "steady", ts=100.0)
+        aggregator.ingest({"n": "a", "b": [newer]})
+        self.assertEqual(aggregator.ingest({"n": "a", "b": [older]}), 0)
+        self.assertEqual(aggregator.node_status("a")["state"], "HEALTHY")
+        self.assertEqual(aggregator.out_of_order, 1)
+
+    def test_resent_record_is_counted_once(self) -> None:
+        clock = FakeClock()
+        aggregator = FleetAggregator(coalesce_seconds=0, clock=clock)
+        batch = {"n": "a", "b": [encode_record(7, DNS_DOWN, "UNHEALTHY", "entered_unhealthy", ts=clock.now)]}
+        self.assertEqual(aggregator.ingest(batch), 1)
+        self.assertEqual(aggregator.ingest(batch), 0)
+        same_second = encode_record(8, HEALTHY, "HEALTHY", "recovered", ts=clock.now)
+        self.assertEqual(aggregator.ingest({"n": "a", "b": [same_second]}), 1)
+
+        self.assertEqual(aggregator.duplicates, 1)
+        self.assertEqual(aggregator.nodes["a"].records, 2)
+        self.assertEqual(aggregator.coalescer.pending(), 2)
+
+    def test_malformed_records_are_rejected_without_stopping_the_listener(self) -> None:
+        aggregator = FleetAggregator()
+        udp = start_udp_listener(aggregator, "127.0.0.1", 0)
+        bad_batches = [
+            {"n": "x", "b": [{"t": "abc"}]},
+            {"n": "x", "b": [{"t": 1.0, "s": "7"}]},
+            {"n": "x", "b": [{"t": 1.0, "r": [["openclaw_health", 0]]}]},
+            {"n": "x", "b": [{"t": 1.0, "r": [[1, 0, "x", 5, None]]}]},
+            {"n": 5, "b": []},
+            [1, 2, 3],
+        ]
+        good = {"n": "y", "b": [encode_record(1, DNS_DOWN, "UNHEALTHY", "entered_unhealthy", ts=10.0)]}
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+                for batch in bad_batches + [good]:
+                    sender.sendto(json.dumps(batch).encode("utf-8"), udp.getsockname())
+                self.assertTrue(_wait_for(lambda: "y" in aggregator.nodes))
+        finally:
+            udp.close()
+
+        self.assertEqual(aggregator.rejected, 6)
+        self.assertEqual(aggregator.nodes["x"].records, 0)
+        self.assertEqual(aggregator.node_status("y")["state"], "UNHEALTHY")
+
+    def test_udp_and_http_push_end_to_end(self) -> None:
+        aggregator = FleetAggregator()
+        udp = start_udp_listener(aggregator, "127.0.0.1", 0)
+        server = start_http_server(aggregator, "127.0.0.1", 0)
+        udp_port = udp.getsockname()[1]
+        http_port = server.server_address[1]
+        udp_pusher = ResultPusher("udp-node", f"127.0.0.1:{udp_port}", "udp", batch_size=2, flush_seconds=0.05)
+        http_pusher = ResultPusher(
+            "http-node",
+            f"http://127.0.0.1:{http_port}/push",
+            "http",
+            batch_size=2,
+            flush_seconds=0.05,
+        )
+        try:
+            for pusher in (udp_pusher, http_pusher):
+                pusher.publish(HEALTHY, "HEALTHY", "steady", {})
+                pusher.publish(DNS_DOWN, "UNHEALTHY", "entered_unhealthy", {})
+            self.assertTrue(_wait_for(lambda: len(aggregator.nodes) == 2))
+            self.assertTrue(_wait_for(lambda: aggregator.nodes["udp-node"].records == 2))
+            with urllib.request.urlopen(f"http://127.0.0.1:{http_port}/fleet", timeout=5) as response:
+                fleet = json.loads(response.read().decode("utf-8"))
+        finally:
+            udp_pusher.close()
+            http_pusher.close()
+            server.shutdown()
+            server.server_close()
+            udp.close()
+
+        self.assertEqual(fleet["nodes"], 2)
+        self.assertEqual(fleet["unhealthy"], ["http-node", "udp-node"])
+
+    def test_push_mode_can_route_alerts_only_through_the_aggregator(self) -> None:
+        notifier = MemoryNotifier()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = HealthDaemon(
+                threshold=1,
+                checks=[lambda: DNS_DOWN[1]],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+            )
+            daemon.local_alerts = False
+            transition = daemon.run_cycle()
+            record = json.loads((Path(tmpdir) / "healthd.jsonl").read_text(encoding="utf-8"))
+
+        self.assertEqual(transition, "entered_unhealthy")
+        self.assertEqual(notifier.messages, [])
+        self.assertEqual(record["deliveries"]["aggregator"]["status"], "routed")
+
+    def test_pusher_sheds_oldest_records_when_queue_is_full(self) -> None:
+        pusher = ResultPusher(
+            "n",
+            "http://127.0.0.1:9/push",
+            "http",
+            batch_size=100,
+            flush_seconds=60,
+            queue_size=3,
+            timeout_seconds=0.2,
+        )
+        try:
+            for _ in range(5):
+                pusher.publish(HEALTHY, "HEALTHY", "steady", {})
+        finally:
+            pusher.close(flush_timeout=1.0)
+        self.assertEqual(pusher.dropped, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
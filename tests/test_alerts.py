@@ -0,0 +1,137 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.alerts import AlertCoalescer, root_cause  # noqa: E402
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+class AlertTests(unittest.TestCase):
+    def test_root_cause_prefers_system_layer(self) -> None:
+        results = [
+            CheckResult("openclaw_health", False, "timeout", 124, 1, ""),
+            CheckResult("system_probe", False, "dns probe failed", 1, 1, ""),
+        ]
+        primary, suppressed = root_cause(results)
+        self.assertEqual(primary.layer, "system_probe")
+        self.assertEqual([item.layer for item in suppressed], ["openclaw_health"])
+
+    def test_coalescer_groups_by_cause_within_window(self) -> None:
+        clock = FakeClock()
+        coalescer = AlertCoalescer(10, clock=clock)
+        for node in ("a", "b", "c"):
+            coalescer.add("entered_unhealthy", "system_probe - dns", f"msg {node}", source=node)
+        coalescer.add("entered_unhealthy", "openclaw_health - down", "other")
+        clock.now = 5
+        self.assertIsNone(coalescer.due())
+        clock.now = 10
+        digest = coalescer.due()
+
+        self.assertIn("DIGEST (4 alerts in 10s)", digest)
+        self.assertIn("UNHEALTHY x3: system_probe - dns [a, b, c]", digest)
+        self.assertIn("UNHEALTHY x1: openclaw_health - down", digest)
+        self.assertEqual(coalescer.pending(), 0)
+        self.assertIsNone(coalescer.due())
+
+    def test_digest_keeps_auto_restart_outcome(self) -> None:
+        clock = FakeClock()
+        coalescer = AlertCoalescer(10, clock=clock)
+        coalescer.add(
+            "entered_unhealthy",
+            "openclaw_health - down",
+            "[OpenClaw Alert] UNHEALTHY\nReason: openclaw_health - down\nAuto-restart: ok (restarted)",
+        )
+        coalescer.add("recovered", "", "[OpenClaw Alert] RECOVERED")
+        clock.now = 4
+        self.assertEqual(coalescer.seconds_until_due(), 6)
+        clock.now = 10
+        digest = coalescer.due()
+
+        self.assertIn("UNHEALTHY x1: openclaw_health - down\n  Auto-restart: ok (restarted)", digest)
+        self.assertIsNone(coalescer.seconds_until_due())
+
+    def test_single_alert_passes_through_unchanged(self) -> None:
+        coalescer = AlertCoalescer(0)
+        coalescer.add("recovered", "", "[OpenClaw Alert] RECOVERED")
+        self.assertEqual(coalescer.due(), "[OpenClaw Alert] RECOVERED")
+
+    def test_daemon_coalesces_flap_into_one_digest(self) -> None:
+        clock = FakeClock()
+        failing = CheckResult("system_probe", False, "dns down", 1, 1, "")
+        healthy = CheckResult("system_probe", True, "ok", 0, 1, "")
+        timeline = [failing, healthy, healthy]
+        cursor = {"idx": 0}
+
+        def check() -> CheckResult:
+            result = timeline[min(cursor["idx"], len(timeline) - 1)]
+            cursor["idx"] += 1
+            return result
+
+        notifier = MemoryNotifier()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = HealthDaemon(
+                threshold=1,
+                checks=[check],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                coalescer=AlertCoalescer(60, clock=clock),
+            )
+            self.assertEqual(daemon.run_cycle(), "entered_unhealthy")
+            clock.now = 30
+            self.assertEqual(daemon.run_cycle(), "recovered")
+            self.assertEqual(notifier.messages, [])
+            clock.now = 60
+            daemon.run_cycle()
+
+        self.assertEqual(len(notifier.messages), 1)
+        self.assertIn("UNHEALTHY x1: system_probe - dns down", notifier.messages[0])
+        self.assertIn("RECOVERED x1", notifier.messages[0])
+
+    def test_unhealthy_message_lists_suppressed_openclaw_layers(self) -> None:
+        results = [
+            CheckResult("openclaw_health", False, "timeout", 124, 1, ""),
+            CheckResult("system_probe", False, "tcp probe failed", 1, 1, ""),
+        ]
+        notifier = MemoryNotifier()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = HealthDaemon(
+                threshold=1,
+                checks=[lambda: results[0], lambda: results[1]],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+            )
+            daemon.run_cycle()
+
+        self.assertIn("Reason: system_probe - tcp probe failed", notifier.messages[0])
+        self.assertIn("Suppressed: openclaw_health (system layer down)", notifier.messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
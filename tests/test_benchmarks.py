@@ -0,0 +1,82 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BENCH_DIR = ROOT_DIR / "benchmarks"
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import bench  # noqa: E402
+import soak  # noqa: E402
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_in_process_scenarios_produce_comparable_json(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            options = bench.BenchOptions(cycles=10, spawns=2, workdir=workdir)
+            results = bench.run_suite(options, ["daemon_cycle", "log_writer", "detect_recover"])
+
+        scenarios = results["scenarios"]
+        self.assertEqual(scenarios["daemon_cycle"]["cycle_ms"]["count"], 10)
+        self.assertEqual(scenarios["detect_recover"]["cycles_to_detect"], 3)
+        self.assertEqual(scenarios["detect_recover"]["cycles_to_recover"], 1)
+        self.assertTrue(any("daemon_cycle.cycle_ms.p50" in line for line in bench.compare(results, results)))
+
+    def test_fake_openclaw_flaps_with_period(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            command = bench.fake_command(
+                "flap",
+                "--flap-period",
+                "2",
+                "--state-file",
+                str(Path(workdir) / "flap.count"),
+            )
+            codes = [bench.run_command(command, 10).returncode for _ in range(4)]
+
+        self.assertEqual(codes, [0, 0, 1, 1])
+
+    def test_import_of_main_skips_alerting_and_server_machinery(self) -> None:
+        modules = bench.import_profile("-c", "import oc_healthd.main")
+
+        self.assertIn("oc_healthd.runtime", modules)
+        self.assertEqual([name for name in bench.HEAVY_MODULES if name in modules], [])
+
+    def test_once_run_is_dominated_by_probes(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = bench.bench_cold_start(bench.BenchOptions(spawns=4, workdir=workdir))
+
+        self.assertEqual(result["heavy_imports"], [])
+        self.assertTrue(result["config_cache_hit"])
+        self.assertEqual(result["once_ms"]["count"], 3)
+        self.assertGreater(result["probe_ms"], 0)
+
+    def test_history_query_scenario_seeds_rollups(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = bench.bench_history_query(bench.BenchOptions(cycles=20, workdir=workdir), days=3)
+
+        self.assertEqual(result["seeded_samples"], 3 * 1440 * 3)
+        self.assertEqual(result["publish_us"]["count"], 20)
+        self.assertIn("365d", result["aggregate_ms"])
+
+    def test_status_read_compares_mmap_snapshot_with_state_json(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = bench.bench_status_read(bench.BenchOptions(workdir=workdir), reads=200)
+
+        self.assertEqual(result["status_map_us"]["count"], 200)
+        self.assertEqual(result["state_json_us"]["count"], 200)
+        self.assertGreater(result["publish_us"], 0)
+
+    def test_soak_reports_growth_and_representation(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            report = soak.soak(cycles=400, snapshot_every=100, workdir=workdir, warmup=100)
+
+        self.assertEqual(report["measured_cycles"], 300)
+        self.assertEqual(len(report["samples"]), 3)
+        compact = soak.compare_representations(count=500)
+        self.assertLess(compact["current_bytes_per_result"], compact["legacy_bytes_per_result"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 from oc_healthd.checks import (  # noqa: E402
+    CheckResult,
     check_openclaw_health,
     check_openclaw_status,
     check_system_probe,
@@ -56,6 +57,17 @@ class CheckTests(unittest.TestCase):
         self.assertFalse(result.ok)
         self.assertIn("dns", result.reason.lower())
 
+    def test_result_to_dict_and_interned_reason(self) -> None:
+        first = CheckResult("openclaw_health", False, "".join(["gateway ", "closed"]), 1, 5, "")
+        second = CheckResult("openclaw_health", False, "".join(["gateway ", "closed"]), 1, 6, "")
+        self.assertIs(first.reason, second.reason)
+        self.assertEqual(
+            first.to_dict(),
+            {"layer": "openclaw_health", "ok": False, "reason": "gateway closed", "code": 1, "latency_ms": 5, "raw_excerpt": ""},
+        )
+        if sys.version_info >= (3, 10):
+            self.assertFalse(hasattr(first, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,13 +4,14 @@ import tempfile
 import textwrap
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from oc_healthd.config import load_config
+from oc_healthd.config import cache_path_for, load_config, load_config_cached
 
 
 class ConfigTests(unittest.TestCase):
@@ -54,6 +55,48 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual(config.telegram.bot_token, "env-token")
         self.assertEqual(config.telegram.chat_id, "env-chat")
 
+    def test_cached_config_is_reused_until_mtime_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.toml"
+            config_path.write_text("[monitor]\nfailure_threshold = 4\n", encoding="utf-8")
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+            first = load_config_cached(str(config_path))
+            cache_path = cache_path_for(str(config_path))
+            self.assertTrue(cache_path.exists())
+            self.assertEqual(cache_path.stat().st_mode & 0o777, 0o600)
+
+            os.environ["TELEGRAM_CHAT_ID"] = "env-chat"
+            try:
+                with mock.patch("oc_healthd.config._load_raw_data", side_effect=AssertionError("parsed")):
+                    cached = load_config_cached(str(config_path))
+            finally:
+                os.environ.pop("TELEGRAM_CHAT_ID", None)
+            self.assertEqual(cached.monitor, first.monitor)
+            self.assertEqual(cached.telegram.chat_id, "env-chat")
+
+            config_path.write_text("[monitor]\nfailure_threshold = 7\n", encoding="utf-8")
+            reloaded = load_config_cached(str(config_path))
+
+        self.assertEqual(first.monitor.failure_threshold, 4)
+        self.assertEqual(reloaded.monitor.failure_threshold, 7)
+
+    def test_config_with_inline_secrets_is_never_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.toml"
+            config_path.write_text(
+                '[telegram]\nbot_token = "123:secret"\nchat_id = "42"\n', encoding="utf-8"
+            )
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+            cache_path = cache_path_for(str(config_path))
+            cache_path.write_text('{"data": {"telegram": {"bot_token": "123:secret"}}}', encoding="utf-8")
+            config = load_config_cached(str(config_path))
+            leftover = cache_path.exists()
+
+        self.assertEqual(config.telegram.bot_token, "123:secret")
+        self.assertFalse(leftover)
+
 
 if __name__ == "__main__":
     unittest.main()
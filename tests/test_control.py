@@ -0,0 +1,125 @@
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.control import ControlServer  # noqa: E402
+from oc_healthd.ctl import request  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+class MemoryNotifier:
+    def send(self, _message: str) -> bool:
+        return True
+
+
+class ControlTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        tmpdir = self._tmp.name
+        failing = CheckResult("openclaw_health", False, "down", 1, 7, "")
+        self.daemon = HealthDaemon(
+            threshold=2,
+            checks=[lambda: failing],
+            notifier=MemoryNotifier(),
+            state_store=StateStore(str(Path(tmpdir) / "state.json")),
+            log_file=str(Path(tmpdir) / "healthd.jsonl"),
+        )
+        # Keep the socket path short: AF_UNIX paths are limited to ~104 bytes on macOS.
+        self.socket_path = str(Path(tmpdir) / "c.sock")
+        self.server = ControlServer(self.daemon, self.socket_path, on_stats=lambda: {"admission": None})
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self._tmp.cleanup()
+
+    def test_check_runs_cycle_and_status_reports_results(self) -> None:
+        first = request(self.socket_path, "check")
+        second = request(self.socket_path, "check")
+        status = request(self.socket_path, "status")
+
+        self.assertTrue(first["ok"])
+        self.assertEqual(first["transition"], "steady")
+        self.assertEqual(second["transition"], "entered_unhealthy")
+        self.assertEqual(status["state"], "UNHEALTHY")
+        self.assertEqual(status["counters"], {"openclaw_health": 2})
+        self.assertEqual(status["results"][0]["latency_ms"], 7)
+        self.assertEqual(status["cycles"], 2)
+
+    def test_socket_is_private_to_the_owner(self) -> None:
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+        # bind() must not leak the restrictive umask into the rest of the process.
+        current = os.umask(0o022)
+        os.umask(current)
+        self.assertNotEqual(current, 0o177)
+
+    def test_live_socket_is_not_taken_over_but_a_stale_one_is(self) -> None:
+        second = ControlServer(self.daemon, self.socket_path)
+        with self.assertRaises(OSError):
+            second.start()
+        self.assertTrue(request(self.socket_path, "ping")["pong"])
+
+        stale_path = str(Path(self._tmp.name) / "s.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(stale_path)
+        replacement = ControlServer(self.daemon, stale_path)
+        replacement.start()
+        try:
+            self.assertTrue(request(stale_path, "ping")["pong"])
+        finally:
+            replacement.close()
+
+    def test_pause_resume_and_unknown_command(self) -> None:
+        self.assertTrue(request(self.socket_path, "pause")["paused"])
+        self.assertTrue(self.daemon.paused)
+        self.assertFalse(request(self.socket_path, "resume")["paused"])
+        stats = request(self.socket_path, "stats")
+        self.assertIn("uptime_s", stats)
+        self.assertIn("admission", stats)
+        unknown = request(self.socket_path, "explode")
+        self.assertFalse(unknown["ok"])
+        self.assertIn("unknown command", unknown["error"])
+
+    def test_status_does_not_wait_for_a_running_cycle(self) -> None:
+        request(self.socket_path, "check")
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hanging_probe() -> CheckResult:
+            entered.set()
+            release.wait(5)
+            return CheckResult("openclaw_health", True, "ok", 0, 3, "")
+
+        self.daemon.checks = [hanging_probe]
+        worker = threading.Thread(target=self.daemon.run_cycle)
+        worker.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            started = time.monotonic()
+            status = request(self.socket_path, "status")
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+            worker.join(5)
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(status["cycles"], 1)
+        self.assertEqual(status["results"][0]["latency_ms"], 7)
+        self.assertEqual(self.daemon.snapshot()["cycles"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.diagnostics import DiagnosticsCollector, find_processes, tail_lines  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+FAILING = CheckResult("openclaw_health", False, "gateway closed", 1, 5, "")
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+class OrderedRestarter:
+    def __init__(self, events: list) -> None:
+        self.events = events
+
+    def restart(self) -> tuple[bool, str]:
+        self.events.append("restart")
+        return True, "restart ok"
+
+
+class DiagnosticsTests(unittest.TestCase):
+    def test_capture_writes_archive_and_abandons_slow_collectors(self) -> None:
+        def runner(command: str, timeout: float) -> SimpleNamespace:
+            if command == "slow":
+                time.sleep(5)
+            return SimpleNamespace(returncode=0, stdout=f"full output of {command}", stderr="")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "gateway.log"
+            log_path.write_text("\n".join(f"line {index}" for index in range(50)) + "\n", encoding="utf-8")
+            collector = DiagnosticsCollector(
+                output_dir=str(Path(tmpdir) / "incidents"),
+                budget_seconds=0.5,
+                commands={"health": "fast", "status": "slow"},
+                gateway_log=str(log_path),
+                log_tail_lines=3,
+                runner=runner,
+            )
+            started = time.monotonic()
+            incident = collector.capture([FAILING])
+            elapsed = time.monotonic() - started
+
+            self.assertLess(elapsed, 1.0)
+            self.assertEqual(incident["timed_out"], ["status.txt"])
+            self.assertTrue(incident["path"].endswith("-openclaw_health.tar.gz"))
+            with tarfile.open(incident["path"], "r:gz") as archive:
+                members = {Path(name).name: name for name in archive.getnames()}
+                health = archive.extractfile(members["health.txt"]).read().decode("utf-8")
+                log_tail = archive.extractfile(members["gateway.log"]).read().decode("utf-8")
+            self.assertNotIn("status.txt", members)
+            self.assertIn("results.json", members)
+            self.assertIn("full output of fast", health)
+            self.assertEqual(log_tail, "line 47\nline 48\nline 49")
+
+    def test_command_timeout_is_recorded(self) -> None:
+        def runner(command: str, timeout: float) -> SimpleNamespace:
+            raise subprocess.TimeoutExpired(command, timeout)
+
+        collector = DiagnosticsCollector("unused", 1.0, commands={"health": "openclaw health"}, runner=runner)
+        self.assertIn("<timeout", collector.collectors()["health.txt"](0.2))
+
+    def test_find_processes_follows_children(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            proc = Path(tmpdir)
+            for pid, ppid, cmdline in ((10, 1, "node openclaw-gateway"), (11, 10, "worker"), (12, 1, "sshd")):
+                (proc / str(pid)).mkdir()
+                (proc / str(pid) / "stat").write_text(f"{pid} (x y) S {ppid} 0", encoding="utf-8")
+                (proc / str(pid) / "cmdline").write_bytes(cmdline.replace(" ", "\0").encode("utf-8"))
+
+            self.assertEqual(find_processes("openclaw", proc), [10, 11])
+
+    def test_tail_lines_missing_file(self) -> None:
+        self.assertIn("unreadable", tail_lines("/nonexistent/gateway.log", 5))
+
+    def test_daemon_captures_before_restart_and_links_archive(self) -> None:
+        events = []
+
+        class Recorder:
+            def capture(self, results: list) -> dict:
+                events.append("diagnostics")
+                return {"path": "/tmp/incident-x.tar.gz", "timed_out": []}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            notifier = MemoryNotifier()
+            daemon = HealthDaemon(
+                threshold=1,
+                checks=[lambda: FAILING],
+                notifier=notifier,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                restarter=OrderedRestarter(events),
+                diagnostics=Recorder(),
+            )
+            daemon.run_cycle()
+
+        self.assertEqual(events, ["diagnostics", "restart"])
+        self.assertIn("Diagnostics: /tmp/incident-x.tar.gz", notifier.messages[0])
+        self.assertIn("diagnostics", daemon.last_spans_ms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.control import ControlServer  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.history import HistoryStore, connect, parse_duration, query_request  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+HOUR_MS = 3_600_000
+
+
+class MemoryNotifier:
+    def send(self, message: str) -> bool:
+        return True
+
+
+class HistoryTests(unittest.TestCase):
+    def test_published_cycles_land_in_raw_and_rollups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HistoryStore(str(Path(tmpdir) / "history.sqlite3"), flush_seconds=60)
+            try:
+                for latency in (10, 20, 30):
+                    store.publish(
+                        [
+                            CheckResult("openclaw_health", latency != 20, "ok", 0, latency, ""),
+                            CheckResult("system_probe", True, "ok", 0, 1, ""),
+                        ],
+                        "HEALTHY",
+                        "steady",
+                        {},
+                    )
+                self.assertTrue(store.flush())
+                now_ms = int(time.time() * 1000) + 1
+                raw = store.query("openclaw_health", now_ms - HOUR_MS, now_ms, "raw")
+                minute = store.query("openclaw_health", now_ms - 2 * HOUR_MS, now_ms, "1m")
+                # A start inside the current hour still includes that hour's partial bucket.
+                hour = store.query("openclaw_health", now_ms - 60_000, now_ms, "1h")
+                summary = store.aggregate("openclaw_health", now_ms - 400 * 86_400_000, now_ms)
+            finally:
+                store.close()
+
+        self.assertEqual([point["latency_ms"] for point in raw["points"]], [10, 20, 30])
+        self.assertEqual(raw["failures"], 1)
+        self.assertEqual(sum(point["count"] for point in minute["points"]), 3)
+        self.assertEqual(hour["count"], 3)
+        self.assertEqual(hour["start"] % HOUR_MS, 0)
+        self.assertEqual(summary["resolution"], "1h")
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(summary["latency_avg"], 20.0)
+        self.assertEqual((summary["latency_min"], summary["latency_max"]), (10, 30))
+        self.assertAlmostEqual(summary["availability"], 2 / 3, places=5)
+
+    def test_prune_drops_raw_rows_but_keeps_rollups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "history.sqlite3")
+            store = HistoryStore(path, raw_retention_days=1, minute_retention_days=2, flush_seconds=60)
+            store.close()
+            now_ms = int(time.time() * 1000)
+            old = now_ms - 3 * 86_400_000
+            connection = connect(path)
+            store.write(connection, [(old, "openclaw_health", 1, 0, 40), (now_ms, "openclaw_health", 1, 0, 60)])
+            store.prune(connection, now_ms)
+            counts = [
+                connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                for table in ("samples", "rollup_1m", "rollup_1h")
+            ]
+            connection.close()
+            summary = store.aggregate("openclaw_health", old - HOUR_MS, now_ms + 1, "1h")
+
+        self.assertEqual(counts, [1, 1, 2])
+        self.assertEqual(summary["count"], 2)
+
+    def test_auto_resolution_follows_span_and_retention(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HistoryStore(str(Path(tmpdir) / "history.sqlite3"))
+            store.close()
+        now_ms = 10 * 365 * 86_400_000
+        self.assertEqual(store.pick_resolution(now_ms - HOUR_MS, now_ms, now_ms), "raw")
+        self.assertEqual(store.pick_resolution(now_ms - 24 * HOUR_MS, now_ms, now_ms), "1m")
+        self.assertEqual(store.pick_resolution(now_ms - 30 * 24 * HOUR_MS, now_ms, now_ms), "1h")
+        self.assertEqual(parse_duration("30d"), 30 * 86400)
+
+    def test_publish_does_not_wait_for_a_locked_database(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "history.sqlite3")
+            store = HistoryStore(path, batch_size=1, flush_seconds=60)
+            blocker = sqlite3.connect(path, isolation_level=None)
+            blocker.execute("BEGIN EXCLUSIVE")
+            try:
+                started = time.perf_counter()
+                for _ in range(50):
+                    store.publish([CheckResult("openclaw_health", True, "ok", 0, 5, "")], "HEALTHY", "steady", {})
+                elapsed = time.perf_counter() - started
+            finally:
+                blocker.execute("COMMIT")
+                blocker.close()
+            self.assertTrue(store.flush(timeout=10))
+            store.close()
+            now_ms = int(time.time() * 1000) + 1
+            summary = store.aggregate("openclaw_health", now_ms - HOUR_MS, now_ms)
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(summary["count"], 50)
+
+    def test_control_history_command_reads_daemon_sink(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HistoryStore(str(Path(tmpdir) / "history.sqlite3"), flush_seconds=60)
+            daemon = HealthDaemon(
+                threshold=3,
+                checks=[lambda: CheckResult("openclaw_health", True, "ok", 0, 7, "")],
+                notifier=MemoryNotifier(),
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                sinks=[store],
+            )
+            control = ControlServer(
+                daemon,
+                str(Path(tmpdir) / "healthd.sock"),
+                on_history=lambda request: query_request(store, request),
+            )
+            try:
+                daemon.run_cycle()
+                daemon.run_cycle()
+                store.flush()
+                response = control.handle({"cmd": "history", "since": "1h", "summary": True})
+            finally:
+                store.close()
+
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["history"]["count"], 2)
+        self.assertEqual(response["history"]["latency_avg"], 7.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
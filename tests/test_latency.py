@@ -0,0 +1,105 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.latency import LatencyMonitor, P2Quantile  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+def _ok(latency_ms: int, layer: str = "openclaw_health") -> CheckResult:
+    return CheckResult(layer, True, "ok", 0, latency_ms, "")
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+class LatencyTests(unittest.TestCase):
+    def test_p2_quantile_tracks_exact_p95(self) -> None:
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(3, 0.5) for _ in range(5000)]
+        estimator = P2Quantile(0.95)
+        for value in samples:
+            estimator.add(value)
+        exact = sorted(samples)[int(0.95 * len(samples)) - 1]
+
+        self.assertAlmostEqual(estimator.value(), exact, delta=exact * 0.05)
+        restored = P2Quantile.from_dict(estimator.to_dict())
+        self.assertEqual(restored.value(), estimator.value())
+
+    def test_slo_breach_enters_and_clears_degraded(self) -> None:
+        monitor = LatencyMonitor(slo_ms=500, window=5)
+        transitions = [monitor.observe([_ok(100)]) for _ in range(5)]
+        self.assertEqual(transitions, [None] * 5)
+
+        transitions = [monitor.observe([_ok(900)]) for _ in range(5)]
+        self.assertEqual(transitions[-1], "entered_degraded")
+        self.assertIn("SLO 500ms", monitor.degraded_layers()[0][1])
+
+        transitions = [monitor.observe([_ok(100)]) for _ in range(5)]
+        self.assertEqual(transitions[-1], "degraded_cleared")
+
+    def test_drift_above_baseline_after_warmup_and_baseline_frozen(self) -> None:
+        monitor = LatencyMonitor(window=5, drift_factor=2.0, min_windows=2)
+        for _ in range(10):
+            monitor.observe([_ok(100)])
+        baseline = monitor.layers["openclaw_health"].baseline
+
+        transitions = [monitor.observe([_ok(300)]) for _ in range(10)]
+        self.assertIn("entered_degraded", transitions)
+        self.assertEqual(monitor.layers["openclaw_health"].baseline, baseline)
+
+    def test_failed_results_do_not_feed_quantiles(self) -> None:
+        monitor = LatencyMonitor(slo_ms=500, window=2)
+        for _ in range(4):
+            monitor.observe([CheckResult("openclaw_health", False, "timeout", 124, 10000, "")])
+        self.assertEqual(monitor.layers, {})
+
+    def test_daemon_alerts_once_and_persists_baseline(self) -> None:
+        latencies = iter([100] * 5 + [900] * 10)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = StateStore(str(Path(tmpdir) / "state.json"))
+            notifier = MemoryNotifier()
+            daemon = HealthDaemon(
+                threshold=3,
+                checks=[lambda: _ok(next(latencies))],
+                notifier=notifier,
+                state_store=store,
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                latency=LatencyMonitor(slo_ms=500, window=5),
+            )
+            transitions = [daemon.run_cycle() for _ in range(15)]
+
+            self.assertEqual(transitions, ["steady"] * 15)
+            self.assertEqual(len(notifier.messages), 1)
+            self.assertIn("[OpenClaw Alert] DEGRADED", notifier.messages[0])
+            self.assertEqual(daemon.snapshot()["latency_state"], "DEGRADED")
+
+            restarted = HealthDaemon(
+                threshold=3,
+                checks=[],
+                notifier=MemoryNotifier(),
+                state_store=store,
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                latency=LatencyMonitor(slo_ms=500, window=5),
+            )
+        self.assertEqual(restarted.latency.state, "DEGRADED")
+        self.assertEqual(restarted.latency.layers["openclaw_health"].baseline, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.lease import LeaseElector  # noqa: E402
+from oc_healthd.runtime import Runtime  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MemoryNotifier:
+    def __init__(self) -> None:
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return True
+
+
+class MemoryRestarter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def restart(self) -> tuple:
+        self.calls += 1
+        return True, "restart ok"
+
+
+ELECTOR_SCRIPT = textwrap.dedent(
+    """
+    import json, sys, time
+    from oc_healthd.lease import LeaseElector
+
+    path, name, stall = sys.argv[1], sys.argv[2], float(sys.argv[3])
+    elector = LeaseElector(path, name, ttl_seconds=0.4, renew_interval_seconds=0.05, max_clock_skew_seconds=0.02)
+    held = []
+    deadline = time.monotonic() + 2.0
+    renewals = 0
+    while time.monotonic() < deadline:
+        if elector.acquire_or_renew():
+            held.append([time.monotonic(), elector._valid_until, elector.epoch])
+            renewals += 1
+            if stall and renewals % 5 == 0:
+                # A paused holder: stop renewing for longer than the TTL.
+                time.sleep(stall)
+        time.sleep(0.02)
+    print(json.dumps(held))
+    """
+)
+
+
+class LeaseTests(unittest.TestCase):
+    def test_standby_takes_over_after_expiry(self) -> None:
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "leader.lease")
+            a = LeaseElector(path, "a", 10, clock=clock)
+            b = LeaseElector(path, "b", 10, clock=clock)
+
+            self.assertTrue(a.acquire_or_renew())
+            self.assertFalse(b.acquire_or_renew())
+            clock.now += 9
+            self.assertTrue(a.acquire_or_renew())
+            clock.now += 9
+            self.assertFalse(b.acquire_or_renew())
+            clock.now += 11
+            self.assertTrue(b.acquire_or_renew())
+            self.assertFalse(a.acquire_or_renew())
+
+        self.assertEqual(a.epoch, 1)
+        self.assertEqual(b.epoch, 2)
+        self.assertFalse(a.is_leader())
+        self.assertTrue(b.is_leader())
+        self.assertEqual(b.margin_seconds, 1.0)
+        self.assertEqual(LeaseElector(path, "c", 90, renew_interval_seconds=30).margin_seconds, 30)
+        self.assertEqual(LeaseElector(path, "d", 10, renew_interval_seconds=30).margin_seconds, 5)
+
+    def test_two_electors_never_lead_at_the_same_time(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "leader.lease")
+            env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+            processes = [
+                subprocess.Popen(
+                    [sys.executable, "-c", ELECTOR_SCRIPT, path, name, stall],
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+                for name, stall in (("a", "0.6"), ("b", "0.6"))
+            ]
+            held = [json.loads(process.communicate(timeout=30)[0]) for process in processes]
+
+        a_terms, b_terms = held
+        self.assertTrue(a_terms and b_terms)
+        for a_start, a_until, _epoch in a_terms:
+            for b_start, b_until, _epoch in b_terms:
+                overlap = min(a_until, b_until) - max(a_start, b_start)
+                self.assertLessEqual(overlap, 0.0, (a_start, a_until, b_start, b_until))
+        epochs = sorted({term[2] for term in a_terms + b_terms})
+        self.assertGreater(len(epochs), 1)
+
+    def test_takeover_continues_from_shared_state_without_duplicates(self) -> None:
+        failing = CheckResult("openclaw_health", False, "down", 1, 1, "")
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.toml"
+            config_path.write_text(
+                textwrap.dedent(
+                    f"""
+                    [monitor]
+                    failure_threshold = 2
+
+                    [paths]
+                    log_file = "{tmpdir}/healthd.jsonl"
+                    state_file = "{tmpdir}/state.json"
+
+                    [control]
+                    socket_path = ""
+
+                    [ha]
+                    enabled = true
+                    lease_file = "{tmpdir}/leader.lease"
+                    lease_ttl_seconds = 10
+                    """
+                ),
+                encoding="utf-8",
+            )
+            nodes = []
+            for name in ("a", "b"):
+                runtime = Runtime(str(config_path))
+                runtime.elector.node_id = name
+                runtime.elector.clock = clock
+                runtime.daemon.checks = [lambda: failing]
+                runtime.daemon.notifier = MemoryNotifier()
+                runtime.daemon.restarter = MemoryRestarter()
+                nodes.append(runtime)
+            a, b = nodes
+
+            for _ in range(2):
+                self.assertTrue(a.elect())
+                self.assertFalse(b.elect())
+                a.daemon.run_cycle()
+            self.assertEqual(a.daemon.machine.current_state, "UNHEALTHY")
+            # healthctl check on the standby goes through the same gate: no probes, no side effects.
+            self.assertEqual(b.run_check(), "skipped")
+            self.assertEqual(b.daemon.cycles, 0)
+
+            # Node a dies; b takes over once the lease expires.
+            clock.now += 11
+            self.assertTrue(b.elect())
+            self.assertEqual(b.daemon.role, "leader")
+            self.assertEqual(b.daemon.machine.current_state, "UNHEALTHY")
+            b.daemon.run_cycle()
+
+        self.assertEqual(len(a.daemon.notifier.messages), 1)
+        self.assertEqual(a.daemon.restarter.calls, 1)
+        self.assertEqual(b.daemon.notifier.messages, [])
+        self.assertEqual(b.daemon.restarter.calls, 0)
+        self.assertEqual(b.daemon.machine.counters["openclaw_health"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
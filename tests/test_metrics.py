@@ -0,0 +1,83 @@
+import sys
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.metrics import (  # noqa: E402
+    HealthMetrics,
+    MetricsRegistry,
+    start_metrics_server,
+)
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+class MemoryNotifier:
+    def send(self, _message: str) -> bool:
+        return True
+
+
+class MetricsTests(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_ms", "Demo.", ("layer",), (10, 100))
+        histogram.observe(5, "a")
+        histogram.observe(50, "a")
+        histogram.observe(500, "a")
+        text = registry.render()
+
+        self.assertIn("# TYPE demo_ms histogram", text)
+        self.assertIn('demo_ms_bucket{layer="a",le="10"} 1', text)
+        self.assertIn('demo_ms_bucket{layer="a",le="100"} 2', text)
+        self.assertIn('demo_ms_bucket{layer="a",le="+Inf"} 3', text)
+        self.assertIn('demo_ms_sum{layer="a"} 555', text)
+        self.assertIn('demo_ms_count{layer="a"} 3', text)
+
+    def test_daemon_cycle_updates_metrics(self) -> None:
+        failing = CheckResult("openclaw_health", False, "down", 1, 42, "")
+        metrics = HealthMetrics()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = HealthDaemon(
+                threshold=2,
+                checks=[lambda: failing],
+                notifier=MemoryNotifier(),
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(Path(tmpdir) / "healthd.jsonl"),
+                metrics=metrics,
+            )
+            daemon.run_cycle()
+            daemon.run_cycle()
+
+        self.assertEqual(metrics.check_failures.value("openclaw_health"), 2)
+        self.assertEqual(metrics.consecutive_failures.value("openclaw_health"), 2)
+        self.assertEqual(metrics.state.value("UNHEALTHY"), 1)
+        self.assertEqual(metrics.notifications.value("default", "sent"), 1)
+        self.assertEqual(metrics.cycle_duration.count(), 2)
+        self.assertEqual(metrics.check_latency.count("openclaw_health"), 2)
+
+    def test_metrics_server_serves_text_format(self) -> None:
+        metrics = HealthMetrics()
+        metrics.observe_cycle(0.2)
+        server = start_metrics_server(metrics.registry, "127.0.0.1", 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertTrue(content_type.startswith("text/plain"))
+        self.assertIn("oc_healthd_cycles_total 1", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
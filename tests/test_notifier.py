@@ -0,0 +1,136 @@
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.notifier import (  # noqa: E402
+    CommandNotifier,
+    FileNotifier,
+    NotificationDispatcher,
+)
+from oc_healthd.state_store import StateStore  # noqa: E402
+
+
+class BlockingNotifier:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def send(self, _message: str) -> bool:
+        self.release.wait(5)
+        return True
+
+
+class StaticNotifier:
+    def __init__(self, ok: bool) -> None:
+        self.ok = ok
+        self.messages = []
+
+    def send(self, message: str) -> bool:
+        self.messages.append(message)
+        return self.ok
+
+
+class NotifierTests(unittest.TestCase):
+    def test_slow_channel_times_out_without_blocking_others(self) -> None:
+        slow = BlockingNotifier()
+        fast = StaticNotifier(True)
+        broken = StaticNotifier(False)
+        dispatcher = NotificationDispatcher(
+            {"slow": (slow, 0.2), "fast": (fast, 2.0), "broken": (broken, 2.0)}
+        )
+        started = time.monotonic()
+        try:
+            deliveries = dispatcher.deliver("hello")
+        finally:
+            slow.release.set()
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(deliveries["slow"]["status"], "timeout")
+        self.assertEqual(deliveries["fast"]["status"], "sent")
+        self.assertEqual(deliveries["broken"]["status"], "failed")
+        self.assertEqual(fast.messages, ["hello"])
+
+    def test_file_and_command_channels(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sink = Path(tmpdir) / "alerts.jsonl"
+            captured = Path(tmpdir) / "captured.txt"
+            dispatcher = NotificationDispatcher(
+                {
+                    "file": (FileNotifier(str(sink)), 2.0),
+                    "command": (
+                        CommandNotifier(f"sh -c 'cat > {captured}'", 5),
+                        5.0,
+                    ),
+                }
+            )
+            self.assertTrue(dispatcher.send("[OpenClaw Alert] UNHEALTHY"))
+            record = json.loads(sink.read_text(encoding="utf-8"))
+            hook_input = captured.read_text(encoding="utf-8")
+
+        self.assertEqual(record["message"], "[OpenClaw Alert] UNHEALTHY")
+        self.assertEqual(hook_input, "[OpenClaw Alert] UNHEALTHY")
+
+    def test_cycle_does_not_wait_for_channels_and_logs_outcomes_later(self) -> None:
+        failing = CheckResult("openclaw_health", False, "down", 1, 1, "")
+        slow = BlockingNotifier()
+        dispatcher = NotificationDispatcher(
+            {"ok": (StaticNotifier(True), 1.0), "bad": (StaticNotifier(False), 1.0), "slow": (slow, 0.3)}
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "healthd.jsonl"
+            daemon = HealthDaemon(
+                threshold=1,
+                checks=[lambda: failing],
+                notifier=dispatcher,
+                state_store=StateStore(str(Path(tmpdir) / "state.json")),
+                log_file=str(log_path),
+            )
+            started = time.monotonic()
+            daemon.run_cycle()
+            elapsed = time.monotonic() - started
+            daemon.drain_notifications()
+            slow.release.set()
+            lines = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+
+        record = next(line for line in lines if "transition" in line)
+        events = [line for line in lines if line.get("event") == "delivery"]
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual(record["transition"], "entered_unhealthy")
+        self.assertEqual(record["deliveries"]["slow"], {"status": "dispatched"})
+        outcomes = {line["channel"]: line["status"] for line in events}
+        self.assertEqual(outcomes, {"ok": "sent", "bad": "failed", "slow": "timeout"})
+        self.assertTrue(record["dispatch_id"])
+        self.assertEqual({line["dispatch_id"] for line in events}, {record["dispatch_id"]})
+
+    def test_drain_waits_for_a_deadline_callback_still_running(self) -> None:
+        slow = BlockingNotifier()
+        dispatcher = NotificationDispatcher({"slow": (slow, 0.05)})
+        outcomes = {}
+
+        def record(channel: str, delivery: dict) -> None:
+            time.sleep(0.3)
+            outcomes[channel] = delivery["status"]
+
+        try:
+            dispatcher.dispatch("hello", record)
+            time.sleep(0.1)
+            dispatcher.drain()
+        finally:
+            slow.release.set()
+
+        self.assertEqual(outcomes, {"slow": "timeout"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import dataclasses
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.config import AppConfig, MonitorConfig, OpenClawConfig, PathsConfig  # noqa: E402
+from oc_healthd.config import RoundTripConfig, SystemConfig, TelegramConfig  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.roundtrip import PROBE_HEADER, RoundTripProbe  # noqa: E402
+from oc_healthd.runtime import build_checks, enabled_layers  # noqa: E402
+
+
+class StandInGateway:
+    # Local stand-in for the gateway message path: echoes the probe body back over HTTP/1.1 keep-alive.
+    def __init__(self) -> None:
+        self.mode = "echo"
+        self.connections = 0
+        self.tags = []
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                gateway.connections += 1
+                super().setup()
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                gateway.tags.append(self.headers.get(PROBE_HEADER))
+                status, payload = 200, body
+                if gateway.mode == "slow":
+                    time.sleep(0.5)
+                elif gateway.mode == "swallow":
+                    payload = json.dumps({"queued": True}).encode("utf-8")
+                elif gateway.mode == "error":
+                    status, payload = 503, b"gateway overloaded"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                if gateway.mode == "drop_idle":
+                    # Advertise keep-alive, then close anyway, like an idle timeout between cycles.
+                    self.close_connection = True
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/oc-healthd/echo"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class RoundTripTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.gateway = StandInGateway()
+        self.addCleanup(self.gateway.close)
+
+    def test_round_trips_reuse_one_connection(self) -> None:
+        probe = RoundTripProbe(self.gateway.url, timeout_seconds=2)
+        results = [probe() for _ in range(3)]
+        probe.close()
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual({result.layer for result in results}, {"gateway_roundtrip"})
+        self.assertEqual(probe.connections_opened, 1)
+        self.assertEqual(self.gateway.connections, 1)
+        self.assertIn("reused=1", results[-1].raw_excerpt)
+        self.assertEqual(len(set(self.gateway.tags)), 3)
+
+    def test_timeout_is_a_failed_verdict_and_next_cycle_reconnects(self) -> None:
+        probe = RoundTripProbe(self.gateway.url, timeout_seconds=0.1)
+        self.gateway.mode = "slow"
+        slow = probe()
+        self.gateway.mode = "echo"
+        recovered = probe()
+        probe.close()
+
+        self.assertFalse(slow.ok)
+        self.assertEqual((slow.reason, slow.code), ("roundtrip timeout", 124))
+        self.assertTrue(recovered.ok)
+        self.assertEqual(probe.connections_opened, 2)
+
+    def test_http_error_and_missing_echo_fail(self) -> None:
+        probe = RoundTripProbe(self.gateway.url, timeout_seconds=2)
+        self.gateway.mode = "error"
+        error = probe()
+        self.gateway.mode = "swallow"
+        swallowed = probe()
+        probe.close()
+
+        self.assertEqual((error.ok, error.code, error.reason), (False, 503, "roundtrip http 503"))
+        self.assertEqual((swallowed.ok, swallowed.reason), (False, "roundtrip tag not echoed"))
+
+    def test_stale_keepalive_is_retried_on_a_fresh_connection(self) -> None:
+        probe = RoundTripProbe(self.gateway.url, timeout_seconds=2)
+        self.gateway.mode = "drop_idle"
+        first = probe()
+        time.sleep(0.05)
+        second = probe()
+        probe.close()
+
+        self.assertTrue(first.ok)
+        self.assertTrue(second.ok, second.reason)
+        self.assertEqual(probe.connections_opened, 2)
+
+    def test_runtime_adds_layer_only_when_enabled_and_failure_triggers_restart(self) -> None:
+        config = AppConfig(
+            monitor=MonitorConfig(),
+            openclaw=OpenClawConfig(),
+            system=SystemConfig(),
+            telegram=TelegramConfig(),
+            paths=PathsConfig(),
+            roundtrip=RoundTripConfig(enabled=True, url=self.gateway.url),
+        )
+        checks = build_checks(config)
+        result = checks[-1]()
+        checks[-1].close()
+
+        disabled = dataclasses.replace(config, roundtrip=RoundTripConfig())
+        self.assertNotIn("gateway_roundtrip", enabled_layers(disabled))
+        self.assertTrue(result.ok)
+        failed = CheckResult("gateway_roundtrip", False, "roundtrip timeout", 124, 10000, "")
+        self.assertTrue(HealthDaemon._has_openclaw_failure([failed]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,276 @@
+import contextlib
+import io
+import json
+import socket
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.config import load_config  # noqa: E402
+from oc_healthd.lease import LeaseElector  # noqa: E402
+from oc_healthd.main import run  # noqa: E402
+from oc_healthd.runtime import Runtime, diff_config  # noqa: E402
+from oc_healthd.status_map import StatusMapWriter, read_status  # noqa: E402
+
+
+def _write_config(
+    path: Path,
+    tmpdir: str,
+    health_cmd: str,
+    threshold: int = 3,
+    chat_id: str = "1",
+    extra: str = "",
+) -> None:
+    path.write_text(
+        textwrap.dedent(
+            f"""
+            [monitor]
+            failure_threshold = {threshold}
+            interval_seconds = 60
+
+            [openclaw]
+            health_cmd = "{health_cmd}"
+            status_cmd = "false"
+
+            [telegram]
+            chat_id = "{chat_id}"
+
+            [paths]
+            log_file = "{tmpdir}/healthd.jsonl"
+            state_file = "{tmpdir}/state.json"
+
+            [control]
+            socket_path = ""
+            """
+        ).strip()
+        + "\n"
+        + extra,
+        encoding="utf-8",
+    )
+
+
+class RuntimeTests(unittest.TestCase):
+    def test_diff_config_reports_only_affected_components(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            _write_config(path, tmpdir, "true")
+            old = load_config(str(path))
+            _write_config(path, tmpdir, "true", threshold=5, chat_id="2")
+            new = load_config(str(path))
+
+        self.assertEqual(diff_config(old, new), {"threshold", "notifier"})
+
+    def test_reload_rebuilds_changed_check_and_keeps_other_counters(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            _write_config(path, tmpdir, "false")
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:2]
+            runtime.check_runners.pop("system_probe")
+            runtime.daemon.run_cycle()
+            runtime.daemon.run_cycle()
+            self.assertEqual(runtime.daemon.machine.counters["openclaw_health"], 2)
+            self.assertEqual(runtime.daemon.machine.counters["openclaw_status"], 2)
+            old_notifier = runtime.daemon.notifier
+
+            _write_config(path, tmpdir, "true", threshold=4)
+            result = runtime.reload()
+            counters = dict(runtime.daemon.machine.counters)
+            runtime.daemon.run_cycle()
+            after_cycle = dict(runtime.daemon.machine.counters)
+            events = [
+                json.loads(line)
+                for line in (Path(tmpdir) / "healthd.jsonl").read_text().splitlines()
+                if '"event"' in line
+            ]
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["changed"], ["check.openclaw_health", "threshold"])
+        self.assertNotIn("openclaw_health", counters)
+        self.assertEqual(counters["openclaw_status"], 2)
+        self.assertIs(runtime.daemon.notifier, old_notifier)
+        self.assertEqual(runtime.daemon.machine.threshold, 4)
+        self.assertEqual(after_cycle, {"openclaw_health": 0, "openclaw_status": 3})
+        self.assertEqual(events[0]["event"], "reload")
+        self.assertIn("duration_ms", events[0])
+
+    def test_notifier_and_restarter_are_built_on_first_transition(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            _write_config(path, tmpdir, "false", threshold=2)
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:2]
+            runtime.daemon.restarter._factory = lambda: SimpleNamespace(restart=lambda: (False, "skipped"))
+            runtime.daemon.run_cycle()
+            before = (runtime.daemon.notifier._target, runtime.daemon.restarter._target)
+            transition = runtime.daemon.run_cycle()
+
+        self.assertEqual(before, (None, None))
+        self.assertEqual(transition, "entered_unhealthy")
+        self.assertIsNotNone(runtime.daemon.notifier._target)
+        self.assertIsNotNone(runtime.daemon.restarter._target)
+
+    def test_stats_report_admission_pressure_and_shed_checks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            extra = "\n[admission]\nenabled = true\nload_elevated = 0\nload_critical = 1000\npsi_critical = 1000\n"
+            _write_config(path, tmpdir, "true", extra=extra)
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:2]
+            runtime.daemon.run_cycle()
+            stats = runtime.stats()
+            _write_config(path, tmpdir, "true")
+            runtime.reload()
+            disabled = runtime.stats()
+
+        self.assertEqual(stats["admission"]["level"], "elevated")
+        self.assertEqual(stats["admission"]["deferrals"], {"openclaw_status": 1})
+        self.assertEqual(stats["admission"]["shed"], {"deferred": 1})
+        self.assertEqual(disabled, {"admission": None})
+
+    def test_reload_failure_keeps_running_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            _write_config(path, tmpdir, "true")
+            runtime = Runtime(str(path))
+            path.write_text("[monitor\nbroken", encoding="utf-8")
+            result = runtime.reload()
+
+        self.assertFalse(result["ok"])
+        self.assertIn("config load failed", result["error"])
+        self.assertEqual(runtime.config.openclaw.health_cmd, "true")
+
+    def test_failed_apply_rolls_back_to_running_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen(1)
+            path = Path(tmpdir) / "config.toml"
+            _write_config(path, tmpdir, "false")
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:2]
+            runtime.daemon.run_cycle()
+            extra = f"\n[metrics]\nenabled = true\nport = {busy.getsockname()[1]}\n"
+            _write_config(path, tmpdir, "true", threshold=5, extra=extra)
+            result = runtime.reload()
+
+        self.assertFalse(result["ok"])
+        self.assertIn("config apply failed", result["error"])
+        self.assertEqual(runtime.config.monitor.failure_threshold, 3)
+        self.assertEqual(runtime.daemon.machine.threshold, 3)
+        self.assertEqual(runtime.config.openclaw.health_cmd, "false")
+        self.assertEqual(runtime.daemon.machine.counters["openclaw_health"], 1)
+        self.assertIsNone(runtime.metrics_server)
+        self.assertIsNone(runtime.daemon.metrics)
+
+    def test_coalesced_alert_is_sent_when_window_closes_not_next_cycle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            alerts = Path(tmpdir) / "alerts.jsonl"
+            extra = f'\n[alerts]\ncoalesce_seconds = 1\n\n[notify]\nfile_path = "{alerts}"\n'
+            _write_config(path, tmpdir, "false", threshold=1, extra=extra)
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:1]
+            worker = threading.Thread(target=runtime.serve_forever)
+            worker.start()
+            try:
+                deadline = time.monotonic() + 5
+                while not alerts.exists() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                delivered = alerts.exists()
+            finally:
+                runtime.request_stop()
+                worker.join(10)
+
+        self.assertTrue(delivered)
+        self.assertEqual(runtime.daemon.cycles, 1)
+
+    def test_once_with_ha_acquires_the_lease_instead_of_running_fenced(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            alerts = Path(tmpdir) / "alerts.jsonl"
+            lease = Path(tmpdir) / "leader.lease"
+            extra = (
+                f'\n[ha]\nenabled = true\nlease_file = "{lease}"\nnode_id = "a"\n'
+                f'\n[notify]\nfile_path = "{alerts}"\n'
+                '\n[system]\ndns_host = "localhost"\ntcp_host = "127.0.0.1"\ntcp_port = 9\n'
+            )
+            _write_config(path, tmpdir, "false", threshold=1, extra=extra)
+            with contextlib.redirect_stderr(io.StringIO()):
+                code = run(str(path), once=True)
+            lines = (Path(tmpdir) / "healthd.jsonl").read_text(encoding="utf-8").splitlines()
+            record = next(json.loads(line) for line in lines if '"transition"' in line)
+            state = json.loads((Path(tmpdir) / "state.json").read_text(encoding="utf-8"))
+            alerted = alerts.exists()
+            released = json.loads(lease.read_text(encoding="utf-8"))
+
+        self.assertEqual(code, 0)
+        self.assertNotIn("fenced", record)
+        self.assertEqual(record["transition"], "entered_unhealthy")
+        self.assertEqual(state["state"], "UNHEALTHY")
+        self.assertTrue(alerted)
+        self.assertEqual(released["expires_at"], 0.0)
+
+    def test_standby_leaves_the_shared_status_map_to_the_leader(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            lease = Path(tmpdir) / "leader.lease"
+            status_map = Path(tmpdir) / "status.map"
+            extra = (
+                f'\n[ha]\nenabled = true\nlease_file = "{lease}"\nnode_id = "b"\n'
+                f'\n[status_map]\nenabled = true\npath = "{status_map}"\n'
+            )
+            _write_config(path, tmpdir, "true", extra=extra)
+            leader = LeaseElector(str(lease), "a", ttl_seconds=60)
+            self.assertTrue(leader.acquire_or_renew())
+            leader_map = StatusMapWriter(str(status_map))
+            leader_map.write("UNHEALTHY", {"openclaw_health": 3})
+
+            runtime = Runtime(str(path))
+            runtime.daemon.checks = runtime.daemon.checks[:1]
+            runtime._start_status_map()
+            self.assertEqual(runtime.elect(), False)
+            runtime.daemon.run_cycle()
+            while_standby = read_status(str(status_map))
+
+            leader.release()
+            leader_map.close()
+            self.assertTrue(runtime.elect())
+            runtime.daemon.run_cycle()
+            after_takeover = read_status(str(status_map))
+            runtime._stop_status_map()
+
+        self.assertEqual(while_standby["state"], "UNHEALTHY")
+        self.assertEqual(while_standby["seq"], 2)
+        self.assertEqual(after_takeover["state"], "HEALTHY")
+        self.assertEqual(after_takeover["seq"], 6)
+
+    def test_profile_runs_dry_without_touching_live_state_or_alerting(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.toml"
+            alerts = Path(tmpdir) / "alerts.jsonl"
+            report = Path(tmpdir) / "profile.txt"
+            extra = (
+                f'\n[notify]\nfile_path = "{alerts}"\n'
+                '\n[system]\ndns_host = "localhost"\ntcp_host = "127.0.0.1"\ntcp_port = 9\n'
+            )
+            _write_config(path, tmpdir, "false", threshold=1, extra=extra)
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = run(str(path), profile_cycles=2, profile_output=str(report))
+            written = sorted(item.name for item in Path(tmpdir).iterdir() if not item.name.startswith("."))
+
+        self.assertEqual(code, 0)
+        self.assertEqual(written, ["config.toml", "profile.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
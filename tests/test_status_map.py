@@ -0,0 +1,147 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.status_map import (  # noqa: E402
+    BODY_OFFSET,
+    SIZE,
+    StatusMapReader,
+    StatusMapWriter,
+    read_status,
+)
+
+WRITER_SCRIPT = textwrap.dedent(
+    """
+    import sys, time
+    from oc_healthd.checks import CheckResult
+    from oc_healthd.status_map import StatusMapWriter
+
+    writer = StatusMapWriter(sys.argv[1])
+    layers = ("openclaw_health", "openclaw_status", "system_probe")
+    deadline = time.monotonic() + float(sys.argv[2])
+    value = 0
+    while time.monotonic() < deadline:
+        value += 1
+        state = "HEALTHY" if value % 2 else "UNHEALTHY"
+        results = [CheckResult(layer, value % 2 == 1, "ok", 0, value, "") for layer in layers]
+        writer.write(state, {layer: value for layer in layers}, results)
+    print(value)
+    """
+)
+
+
+class StatusMapTests(unittest.TestCase):
+    def test_publish_is_visible_to_reader(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "status.map")
+            writer = StatusMapWriter(path)
+            writer.publish(
+                [
+                    CheckResult("openclaw_health", False, "timeout", 124, 10000, ""),
+                    CheckResult("system_probe", True, "ok", 0, 3, ""),
+                ],
+                "UNHEALTHY",
+                "entered_unhealthy",
+                {"openclaw_health": 3, "system_probe": 0},
+            )
+            snapshot = read_status(path)
+            writer.close()
+            size = os.path.getsize(path)
+
+        self.assertEqual(size, SIZE)
+        self.assertEqual(snapshot["state"], "UNHEALTHY")
+        self.assertEqual(snapshot["last_transition"], "entered_unhealthy")
+        self.assertGreater(snapshot["last_transition_at"], 0)
+        self.assertEqual(snapshot["cycles"], 1)
+        self.assertEqual(snapshot["seq"] % 2, 0)
+        self.assertEqual(
+            snapshot["layers"],
+            [
+                {"layer": "openclaw_health", "counter": 3, "latency_ms": 10000, "ok": False},
+                {"layer": "system_probe", "counter": 0, "latency_ms": 3, "ok": True},
+            ],
+        )
+
+    def test_reader_never_sees_a_torn_snapshot_from_another_process(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "status.map")
+            StatusMapWriter(path).close()
+            env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+            process = subprocess.Popen(
+                [sys.executable, "-c", WRITER_SCRIPT, path, "1.0"],
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            reads = 0
+            seen = set()
+            with StatusMapReader(path) as reader:
+                while process.poll() is None:
+                    snapshot = reader.read()
+                    values = {layer["counter"] for layer in snapshot["layers"]}
+                    values |= {layer["latency_ms"] for layer in snapshot["layers"]}
+                    self.assertLessEqual(len(values), 1, snapshot)
+                    if values:
+                        value = values.pop()
+                        expected = "HEALTHY" if value % 2 else "UNHEALTHY"
+                        self.assertEqual(snapshot["state"], expected)
+                        self.assertEqual({layer["ok"] for layer in snapshot["layers"]}, {value % 2 == 1})
+                        seen.add(value)
+                    reads += 1
+            process.communicate()
+
+        self.assertGreater(reads, 100)
+        self.assertGreater(len(seen), 10)
+
+    def test_reader_rejects_a_body_that_does_not_match_its_checksum(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "status.map")
+            writer = StatusMapWriter(path)
+            writer.write("HEALTHY", {"openclaw_health": 0})
+            # Body bytes changed under an even, unchanged sequence: what a reader on a weakly ordered CPU
+            # can observe when the body stores are not yet visible.
+            with open(path, "r+b") as handle:
+                handle.seek(BODY_OFFSET)
+                handle.write(b"UNHEALTHY")
+            with StatusMapReader(path) as reader:
+                with self.assertRaises(TimeoutError):
+                    reader.read(timeout_seconds=0.05)
+                writer.write("UNHEALTHY", {"openclaw_health": 1})
+                snapshot = reader.read()
+            writer.close()
+
+        self.assertEqual(snapshot["state"], "UNHEALTHY")
+        self.assertEqual(snapshot["layers"][0]["counter"], 1)
+
+    def test_restarted_writer_keeps_sequence_moving_forward(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "status.map")
+            first = StatusMapWriter(path)
+            first.write("HEALTHY", {"openclaw_health": 0})
+            first.write("HEALTHY", {"openclaw_health": 0})
+            before = read_status(path)["seq"]
+            first.close()
+            second = StatusMapWriter(path)
+            second.write("HEALTHY", {"openclaw_health": 1})
+            after = read_status(path)
+            second.close()
+
+        self.assertEqual(before, 4)
+        self.assertEqual(after["seq"], 6)
+        self.assertEqual(after["layers"][0]["counter"], 1)
+        self.assertLess(abs(after["updated_at"] - time.time()), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
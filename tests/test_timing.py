@@ -0,0 +1,72 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from oc_healthd.checks import CheckResult  # noqa: E402
+from oc_healthd.daemon import HealthDaemon  # noqa: E402
+from oc_healthd.metrics import HealthMetrics  # noqa: E402
+from oc_healthd.profiling import profile_cycles  # noqa: E402
+from oc_healthd.state_store import StateStore  # noqa: E402
+from oc_healthd.timing import StageTimer  # noqa: E402
+
+
+class MemoryNotifier:
+    def send(self, _message: str) -> bool:
+        return True
+
+
+def _daemon(tmpdir: str, metrics: HealthMetrics = None) -> HealthDaemon:
+    healthy = CheckResult("openclaw_health", True, "ok", 0, 1, "")
+    return HealthDaemon(
+        threshold=3,
+        checks=[lambda: healthy],
+        notifier=MemoryNotifier(),
+        state_store=StateStore(str(Path(tmpdir) / "state.json")),
+        log_file=str(Path(tmpdir) / "healthd.jsonl"),
+        metrics=metrics,
+    )
+
+
+class TimingTests(unittest.TestCase):
+    def test_stage_timer_accumulates_repeated_stages(self) -> None:
+        timer = StageTimer()
+        with timer.stage("a"):
+            pass
+        timer.add("a", 1_000_000)
+        self.assertGreaterEqual(timer.spans_ns["a"], 1_000_000)
+        self.assertGreaterEqual(timer.as_ms()["a"], 1.0)
+
+    def test_run_cycle_records_spans_in_log_and_metrics(self) -> None:
+        metrics = HealthMetrics()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = _daemon(tmpdir, metrics)
+            daemon.run_cycle()
+            record = json.loads((Path(tmpdir) / "healthd.jsonl").read_text().splitlines()[0])
+
+        self.assertIn("check.openclaw_health", record["spans_ms"])
+        self.assertIn("apply", record["spans_ms"])
+        self.assertIn("save", record["spans_ms"])
+        self.assertIn("log", daemon.last_spans_ms)
+        self.assertEqual(metrics.stage_duration.count("save"), 1)
+
+    def test_profile_cycles_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            daemon = _daemon(tmpdir)
+            report_path = Path(tmpdir) / "profile.txt"
+            report = profile_cycles(daemon, 3, str(report_path))
+            self.assertTrue(report_path.exists())
+
+        self.assertIn("cycles: 3", report)
+        self.assertIn("## stages", report)
+        self.assertIn("## cProfile", report)
+
+
+if __name__ == "__main__":
+    unittest.main()